@@ -0,0 +1,4 @@
+"""
+Benchmark'lar
+Ishga tushirish: python -m benchmarks.<modul_nomi>
+"""
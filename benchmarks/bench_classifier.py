@@ -0,0 +1,160 @@
+"""
+Klassik format: har bir qator uchun re.match(pattern_string) va bitta o'tishli classify_line
+
+Ishga tushirish: python -m benchmarks.bench_classifier [savollar] [takrorlar]
+"""
+import io
+import random
+import re
+import sys
+import time
+
+from bot.services.docx_parser import DocxParser, iter_docx_paragraphs
+from benchmarks.bench_parse_pool import make_large_docx
+
+
+class LegacyParser(DocxParser):
+    """Oldingi _match_question / _match_option (kompilyatsiyasiz regex, belgilar sikli)"""
+
+    QUESTION_PATTERNS = [
+        r'^\?+\s*(.+)$',
+        r'^(\d+)\s*[\.\)\-]\s*(.+)$',
+        r'^Savol\s*(\d+)\s*[\.\:\)]\s*(.+)$',
+        r'^S\s*(\d+)\s*[\.\:\)]\s*(.+)$',
+    ]
+    OPTION_PATTERNS = [
+        r'^([A-Za-z])\s*[\)\.\-]\s*(.+)$',
+        r'^(\d+)\s*[\)\.\-]\s*(.+)$',
+    ]
+    CORRECT_MARKERS = ['*', '+', '✓', '✔', '√']
+
+    def _parse_paragraphs(self, texts):
+        self._reset()
+        paragraphs = [text for text in (t.strip() for t in texts) if text]
+        return self._parse_classic_format(paragraphs)
+
+    def _parse_classic_format(self, paragraphs):
+        self._reset()
+        current_question = None
+        current_options = []
+        correct_index = -1
+        for para in paragraphs:
+            question_match = self._match_question(para)
+            if question_match:
+                if current_question and current_options:
+                    self._save_question(current_question, current_options, correct_index)
+                current_question = question_match
+                current_options = []
+                correct_index = -1
+                continue
+            option_match = self._match_option(para)
+            if option_match and current_question:
+                option_text, is_correct = option_match
+                current_options.append(option_text)
+                if is_correct:
+                    correct_index = len(current_options) - 1
+        if current_question and current_options:
+            self._save_question(current_question, current_options, correct_index)
+        return self._validate_and_return()
+
+    def _match_question(self, text):
+        if text.startswith('?'):
+            return None
+        for pattern in self.QUESTION_PATTERNS[1:]:
+            match = re.match(pattern, text, re.IGNORECASE)
+            if match:
+                if len(match.groups()) >= 2:
+                    return match.group(2).strip()
+                return match.group(1).strip()
+        return None
+
+    def _match_option(self, text):
+        if text.startswith('+') or text.startswith('='):
+            return None
+        is_correct = False
+        clean_text = text
+        for marker in self.CORRECT_MARKERS:
+            if text.startswith(marker):
+                is_correct = True
+                clean_text = text[1:].strip()
+                break
+        if not is_correct:
+            for marker in self.CORRECT_MARKERS:
+                if text.endswith(marker):
+                    is_correct = True
+                    clean_text = text[:-1].strip()
+                    break
+        for pattern in self.OPTION_PATTERNS:
+            match = re.match(pattern, clean_text, re.IGNORECASE)
+            if match:
+                option_text = match.group(2).strip()
+                for marker in self.CORRECT_MARKERS:
+                    if option_text.endswith(marker):
+                        is_correct = True
+                        option_text = option_text[:-1].strip()
+                return (option_text, is_correct)
+        return None
+
+
+def make_paragraphs(questions: int) -> list[str]:
+    """Turli uslubdagi savollar va variantlar (izohlar bilan)"""
+    random.seed(7)
+    styles = ["{i}. {t}", "{i}) {t}", "Savol {i}: {t}", "S{i}. {t}"]
+    paragraphs = ["Matematika fanidan test", "Tuzuvchi: o'qituvchi"]
+    for i in range(1, questions + 1):
+        paragraphs.append(random.choice(styles).format(i=i, t=f"Savol matni raqam {i}, tavsif bilan?"))
+        correct = random.randrange(4)
+        for j, letter in enumerate("ABCD"):
+            text = f"{letter}) Variant {letter} savol {i} uchun"
+            if j == correct:
+                text = random.choice(["*" + text, text + " *", text + "✓"])
+            paragraphs.append(text)
+        if i % 50 == 0:
+            paragraphs.append("Izoh: keyingi bo'lim")
+    return paragraphs
+
+
+def run(parser_cls, paragraphs: list[str], repeats: int) -> tuple[float, list]:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = parser_cls()._parse_classic_format(paragraphs)
+        best = min(best, time.perf_counter() - started)
+    return best, [(q.text, q.options, q.correct_index) for q in result.questions]
+
+
+def run_docx(parser_cls, data: bytes) -> float:
+    started = time.perf_counter()
+    result = parser_cls().parse(data)
+    assert result.success
+    return time.perf_counter() - started
+
+
+def main(questions: int, repeats: int) -> None:
+    paragraphs = make_paragraphs(questions)
+    print(f"{questions} ta savol, {len(paragraphs)} ta paragraf")
+
+    legacy_time, legacy_questions = run(LegacyParser, paragraphs, repeats)
+    new_time, new_questions = run(DocxParser, paragraphs, repeats)
+    assert legacy_questions == new_questions, "natijalar farq qiladi"
+
+    print("  Faqat tasniflash (_parse_classic_format):")
+    print(f"    re.match(str):  {legacy_time * 1000:7.1f} ms, {len(paragraphs) / legacy_time:10.0f} paragraf/s")
+    print(f"    classify_line:  {new_time * 1000:7.1f} ms, {len(paragraphs) / new_time:10.0f} paragraf/s")
+    print(f"    tezlanish: x{legacy_time / new_time:.1f}")
+
+    # To'liq parse: .docx o'qish + tasniflash
+    data = make_large_docx(questions * 560)  # ~560 bayt XML bitta savol uchun
+    paragraphs_in_docx = sum(1 for _ in iter_docx_paragraphs(io.BytesIO(data)))
+    legacy_docx = min(run_docx(LegacyParser, data) for _ in range(repeats))
+    new_docx = min(run_docx(DocxParser, data) for _ in range(repeats))
+    print(f"  To'liq parse ({len(data) / 1024 / 1024:.1f} MB, {paragraphs_in_docx} paragraf):")
+    print(f"    re.match(str):  {legacy_docx * 1000:7.1f} ms")
+    print(f"    classify_line:  {new_docx * 1000:7.1f} ms  (x{legacy_docx / new_docx:.2f})")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    )
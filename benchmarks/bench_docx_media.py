@@ -0,0 +1,82 @@
+"""
+Rasmli .docx: python-docx paketni to'liq ochishi va faqat kerakli qismlarni o'qish
+
+Bir xil matnli hujjatga turli hajmda rasm (word/media) qo'shiladi. Har bir usul
+alohida jarayonda ishlaydi; vaqt, eng yuqori xotira o'sishi va arxivdan ochilgan
+qismlar (zipfile.ZipFile.open chaqiruvlari) yoziladi.
+
+Ishga tushirish: python -m benchmarks.bench_docx_media [savollar] [rasm_kb]
+"""
+import multiprocessing as mp
+import sys
+import time
+import zipfile
+
+from bot.services.docx_parser import DocxParser
+from benchmarks.bench_docx_parser import _max_rss_kb, _reset_peak_rss, parse_document
+from benchmarks.corpus import CorpusSpec, make_corpus_docx
+
+REPEATS = 3
+
+
+def _measure(method: str, data: bytes, out) -> None:
+    opened: list[zipfile.ZipInfo] = []
+    original_open = zipfile.ZipFile.open
+
+    def recording_open(self, name, *args, **kwargs):
+        opened.append(name if isinstance(name, zipfile.ZipInfo) else self.getinfo(name))
+        return original_open(self, name, *args, **kwargs)
+
+    if method == "python-docx":
+        def run():
+            return parse_document(data)
+    else:
+        def run():
+            return DocxParser().parse(data)
+
+    run()  # Importlar va keshlarni isitish
+    baseline = _reset_peak_rss()
+    best = float("inf")
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - started)
+    peak_kb = _max_rss_kb() - baseline
+
+    zipfile.ZipFile.open = recording_open
+    run()
+    zipfile.ZipFile.open = original_open
+    out.send((best, peak_kb, len(opened), sum(info.file_size for info in opened),
+              len(result.questions), result.warnings))
+
+
+def measure(method: str, data: bytes) -> tuple:
+    ctx = mp.get_context("spawn")
+    receiver, sender = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_measure, args=(method, data, sender))
+    process.start()
+    result = receiver.recv()
+    process.join()
+    return result
+
+
+def main(questions: int, image_kb: int) -> None:
+    for images in (0, 20, 40, 80):
+        data = make_corpus_docx(CorpusSpec(questions=questions, images=images, image_kb=image_kb))
+        print(f"  {questions} savol, {images} rasm: fayl {len(data) / 1024 / 1024:.2f} MB")
+        results = {}
+        for method in ("python-docx", "oqim"):
+            elapsed, peak_kb, parts, unpacked, found, warnings = measure(method, data)
+            results[method] = found
+            print(f"    {method:12} {elapsed * 1000:7.1f} ms  xotira {peak_kb / 1024:6.1f} MB  "
+                  f"ochilgan qismlar {parts:3} ({unpacked / 1024 / 1024:5.1f} MB)")
+        assert results["python-docx"] == results["oqim"] == questions, results
+        if warnings:
+            print(f"    ogohlantirish: {warnings[0]}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 300,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 250
+    )
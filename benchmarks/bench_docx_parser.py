@@ -0,0 +1,114 @@
+"""
+DOCX parse: python-docx Document (DOM) va iterparse asosidagi oqimli o'qish
+
+Har bir usul alohida jarayonda ishga tushiriladi, shuning uchun eng yuqori
+xotira (RSS) bir-biriga ta'sir qilmaydi.
+
+Ishga tushirish: python -m benchmarks.bench_docx_parser [savollar] [takrorlar]
+"""
+import io
+import multiprocessing as mp
+import resource
+import sys
+import time
+
+from docx import Document
+
+from bot.services.docx_parser import DocxParser, ParseResult
+
+
+def parse_document(data: bytes) -> ParseResult:
+    """Avvalgi usul: python-docx Document'ining paragraflari bo'yicha parse"""
+    return DocxParser()._parse_paragraphs(p.text for p in Document(io.BytesIO(data)).paragraphs)
+
+
+def make_docx(questions: int) -> bytes:
+    """Klassik formatdagi test hujjati (bir nechta run, jadval va bo'sh qatorlar bilan)"""
+    doc = Document()
+    doc.add_heading("Test", level=1)
+    table = doc.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "Fan"
+    table.cell(0, 1).text = "Matematika"
+    for i in range(1, questions + 1):
+        p = doc.add_paragraph()
+        p.add_run(f"{i}. ").bold = True
+        p.add_run(f"Savol matni raqam {i}, bir oz uzunroq tavsif bilan?")
+        for j, letter in enumerate("ABCD"):
+            marker = "*" if j == i % 4 else ""
+            doc.add_paragraph(f"{marker}{letter}) Variant {letter} savol {i} uchun")
+        doc.add_paragraph("")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def _reset_peak_rss() -> int:
+    """Eng yuqori RSS hisoblagichini nolga tushirish (Linux), joriy RSS (KB)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return _max_rss_kb()
+
+
+def _max_rss_kb() -> int:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _measure(method: str, data: bytes, repeats: int, out) -> None:
+    parser = DocxParser()
+    parser.parse(data)  # Importlar va keshlarni isitish
+    baseline = _reset_peak_rss()
+    started = time.perf_counter()
+    for _ in range(repeats):
+        if method == "dom":
+            result = parse_document(data)
+        else:
+            result = parser.parse(data)
+    elapsed = (time.perf_counter() - started) / repeats
+    questions = [(q.text, q.options, q.correct_index) for q in result.questions]
+    out.send((elapsed, _max_rss_kb() - baseline, result.success, questions))
+
+
+def measure(method: str, data: bytes, repeats: int) -> tuple:
+    ctx = mp.get_context("spawn")
+    receiver, sender = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_measure, args=(method, data, repeats, sender))
+    process.start()
+    result = receiver.recv()
+    process.join()
+    return result
+
+
+def main(questions: int, repeats: int) -> None:
+    data = make_docx(questions)
+    print(f"{questions} ta savol, fayl hajmi {len(data) / 1024:.0f} KB, {repeats} marta")
+
+    dom_time, dom_rss, dom_ok, dom_questions = measure("dom", data, repeats)
+    stream_time, stream_rss, stream_ok, stream_questions = measure("stream", data, repeats)
+
+    assert dom_ok and stream_ok
+    assert dom_questions == stream_questions, "natijalar farq qiladi"
+
+    print(f"  python-docx DOM: {dom_time * 1000:8.1f} ms, xotira o'sishi {dom_rss / 1024:7.1f} MB")
+    print(f"  iterparse:       {stream_time * 1000:8.1f} ms, xotira o'sishi {stream_rss / 1024:7.1f} MB")
+    print(f"  tezlanish: x{dom_time / stream_time:.1f}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    )
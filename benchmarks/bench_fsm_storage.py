@@ -0,0 +1,89 @@
+"""
+SQLiteStorage va MemoryStorage'ni xotira va kechikish bo'yicha solishtirish
+
+Ishga tushirish: python -m benchmarks.bench_fsm_storage [foydalanuvchilar_soni]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from aiogram.fsm.storage.base import BaseStorage, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from bot.database import Database, SQLiteStorage
+
+BOT_ID = 1
+QUESTIONS = 100  # process_docx state'ga saqlaydigan savollar soni
+
+
+def uploaded_quiz_data(user_id: int) -> dict:
+    """DOCX yuklangandan keyingi state ma'lumotlari"""
+    return {
+        "quiz_id": f"q{user_id}",
+        "quiz_title": "",
+        "questions": [
+            {"id": str(i), "text": f"Savol {i} matni " * 4, "options": ["A", "B", "C", "D"],
+             "correct_index": 0, "original_options": ["A", "B", "C", "D"]}
+            for i in range(QUESTIONS)
+        ],
+        "creator_id": user_id,
+    }
+
+
+async def run(storage: BaseStorage, users: int) -> dict:
+    keys = [StorageKey(bot_id=BOT_ID, chat_id=user_id, user_id=user_id) for user_id in range(users)]
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    for key in keys:
+        await storage.update_data(key, uploaded_quiz_data(key.user_id))
+        await storage.set_state(key, "QuizStates:waiting_for_title")
+    write = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for key in keys:
+        await storage.get_state(key)
+        await storage.get_data(key)
+    read = time.perf_counter() - started
+
+    # Faqat oxirgi 10% foydalanuvchilar faol (odatiy holat)
+    started = time.perf_counter()
+    for _ in range(10):
+        for key in keys[-users // 10:]:
+            await storage.get_state(key)
+    hot = time.perf_counter() - started
+
+    await storage.close()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "write_us": write / users * 1e6,
+        "read_us": read / users * 1e6,
+        "hot_read_us": hot / users * 1e6,
+        "memory_mb": current / 1024 / 1024,
+        "peak_mb": peak / 1024 / 1024,
+    }
+
+
+async def main(users: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        await db.init()
+
+        results = {
+            "MemoryStorage": await run(MemoryStorage(), users),
+            "SQLiteStorage": await run(SQLiteStorage(db, cache_size=users // 10), users),
+        }
+
+    print(f"Foydalanuvchilar: {users}, har birida {QUESTIONS} savol")
+    print(f"{'':15} {'yozish':>10} {'o`qish':>10} {'issiq':>10} {'xotira':>10} {'cho`qqi':>10}")
+    for name, r in results.items():
+        print(f"{name:15} {r['write_us']:8.1f}us {r['read_us']:8.1f}us {r['hot_read_us']:8.1f}us "
+              f"{r['memory_mb']:8.1f}MB {r['peak_mb']:8.1f}MB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
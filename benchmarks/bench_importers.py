@@ -0,0 +1,114 @@
+"""
+Import tezligi: bitta savollar banki .docx, .txt, .csv, .json ({"questions": [...]} ham) va .jsonl ko'rinishida
+
+- Parse: har bir format uchun savol/s va MB/s (natijalar bir xilligi tekshiriladi)
+- Saqlash: save_quiz ketma-ket va save_quizzes (bitta tranzaksiya)
+
+Ishga tushirish: python -m benchmarks.bench_importers [savollar] [quizlar]
+"""
+import asyncio
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+from bot.database.db import Database
+from bot.models import Quiz
+from bot.services.importers import PARSERS, file_format
+from benchmarks.corpus import make_docx
+
+REPEATS = 3
+
+
+def make_bank(questions: int) -> list[tuple[str, list[str], int]]:
+    return [
+        (f"Savol matni raqam {i}, bir oz uzunroq tavsif bilan?",
+         [f"Variant {letter} savol {i} uchun" for letter in "ABCD"],
+         i % 4)
+        for i in range(1, questions + 1)
+    ]
+
+
+def question_mark_lines(bank) -> list[str]:
+    lines = []
+    for text, options, correct in bank:
+        lines.append(f"?{text}")
+        lines.extend(f"{'+' if j == correct else '='}{option}" for j, option in enumerate(options))
+    return lines
+
+
+def encode_csv(bank) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=";")
+    writer.writerow(["Savol", "A", "B", "C", "D", "Javob"])
+    for text, options, correct in bank:
+        writer.writerow([text, *options, "ABCD"[correct]])
+    return buffer.getvalue().encode()
+
+
+def encode_files(bank) -> dict[str, bytes]:
+    items = [{"question": text, "options": options, "correct": correct} for text, options, correct in bank]
+    lines = question_mark_lines(bank)
+    return {
+        "bank.docx": make_docx(lines),
+        "bank.txt": "\n".join(lines).encode(),
+        "bank.csv": encode_csv(bank),
+        "bank.json": json.dumps(items, ensure_ascii=False).encode(),
+        "questions.json": json.dumps({"questions": items}, ensure_ascii=False).encode(),
+        "bank.jsonl": "\n".join(json.dumps(item, ensure_ascii=False) for item in items).encode(),
+    }
+
+
+def bench_parse(bank) -> None:
+    expected = [(text, tuple(options), correct) for text, options, correct in bank]
+    print(f"  Parse ({len(bank)} savol, eng yaxshi {REPEATS} urinish):")
+    for file_name, data in encode_files(bank).items():
+        best = float("inf")
+        for _ in range(REPEATS):
+            started = time.perf_counter()
+            result = PARSERS[file_format(file_name)]().parse(data)
+            best = min(best, time.perf_counter() - started)
+        assert result.success, result.error_message
+        assert [(q.text, q.options, q.correct_index) for q in result.questions] == expected, file_name
+        print(f"    {file_name:14} {len(data) / 1024 / 1024:6.1f} MB  {best * 1000:7.1f} ms  "
+              f"{len(bank) / best:9.0f} savol/s  {len(data) / 1024 / 1024 / best:6.1f} MB/s")
+
+
+async def bench_save(quizzes: int, questions: int) -> None:
+    result = PARSERS[".csv"]().parse(encode_csv(make_bank(questions)))
+    with tempfile.TemporaryDirectory() as directory:
+        db = Database(os.path.join(directory, "bench.db"))
+        await db.init()
+
+        batch = [Quiz(title=f"Test {i}", questions=result.questions, creator_id=1) for i in range(quizzes)]
+        started = time.perf_counter()
+        for quiz in batch:
+            assert await db.save_quiz(quiz)
+        one_by_one = time.perf_counter() - started
+
+        batch = [Quiz(title=f"Test {i}", questions=result.questions, creator_id=2) for i in range(quizzes)]
+        started = time.perf_counter()
+        assert await db.save_quizzes(batch)
+        bulk = time.perf_counter() - started
+
+        assert len(await db.get_user_quizzes(2)) == quizzes
+
+    print(f"  Saqlash ({quizzes} quiz, har birida {questions} savol):")
+    print(f"    save_quiz ketma-ket:  {one_by_one * 1000:7.1f} ms  {quizzes / one_by_one:7.0f} quiz/s")
+    print(f"    save_quizzes:         {bulk * 1000:7.1f} ms  {quizzes / bulk:7.0f} quiz/s  "
+          f"(x{one_by_one / bulk:.1f})")
+
+
+def main(questions: int, quizzes: int) -> None:
+    bench_parse(make_bank(questions))
+    asyncio.run(bench_save(quizzes, 50))
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    )
@@ -0,0 +1,77 @@
+"""
+Reyting: har safar saralash va Fenwick daraxti asosidagi Leaderboard
+
+Ishga tushirish: python -m benchmarks.bench_leaderboard [ishtirokchilar] [savollar]
+"""
+import random
+import sys
+import time
+
+from bot.services.leaderboard import Leaderboard
+from bot.services.quiz_manager import ParticipantScore
+
+TOP_N = 5
+
+
+def sort_key(p: ParticipantScore) -> tuple:
+    return p.correct_count, -p.total_answered
+
+
+def main(participants: int, questions: int) -> None:
+    random.seed(1)
+    scores = {user_id: ParticipantScore(user_id, f"user{user_id}") for user_id in range(participants)}
+    board = Leaderboard(questions)
+    for user_id in scores:
+        board.update(user_id, 0, 0)
+
+    update_time = sort_time = top_time = 0.0
+    answers = 0
+
+    for _ in range(questions):
+        # Har bir savolga ishtirokchilarning ~80% javob beradi
+        for p in scores.values():
+            if random.random() < 0.8:
+                p.total_answered += 1
+                if random.random() < 0.6:
+                    p.correct_count += 1
+                started = time.perf_counter()
+                board.update(p.user_id, p.correct_count, p.total_answered)
+                update_time += time.perf_counter() - started
+                answers += 1
+
+        # Savollar orasidagi jonli top-N: eski usul - to'liq saralash
+        started = time.perf_counter()
+        expected = sorted(scores.values(), key=sort_key, reverse=True)[:TOP_N]
+        sort_time += time.perf_counter() - started
+
+        started = time.perf_counter()
+        top = board.top(TOP_N)
+        top_time += time.perf_counter() - started
+
+        assert [sort_key(scores[u]) for u in top] == [sort_key(p) for p in expected]
+
+    sample = random.sample(list(scores), min(1000, participants))
+    started = time.perf_counter()
+    for user_id in sample:
+        board.rank(user_id)
+    rank_time = (time.perf_counter() - started) / len(sample)
+
+    # rank() ni to'liq saralash bilan tekshirish
+    ordered = sorted(scores.values(), key=sort_key, reverse=True)
+    first_rank = {}
+    for position, p in enumerate(ordered, 1):
+        first_rank.setdefault(sort_key(p), position)
+    assert all(board.rank(u) == first_rank[sort_key(scores[u])] for u in sample)
+
+    print(f"Ishtirokchilar: {participants}, savollar: {questions}, javoblar: {answers}")
+    print(f"update():             {update_time / answers * 1e6:8.2f} us/javob")
+    print(f"top({TOP_N}) saralash:     {sort_time / questions * 1e3:8.2f} ms/savol")
+    print(f"top({TOP_N}) Leaderboard:  {top_time / questions * 1e3:8.3f} ms/savol")
+    print(f"rank():               {rank_time * 1e6:8.2f} us")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    )
@@ -0,0 +1,104 @@
+"""
+Model obyektlari xotirasi: oddiy (dict) va slotted/frozen klasslar
+
+Bazadan yuklangan bitta savol va guruhdagi bitta ishtirokchi necha bayt
+egallashini o'lchaydi. "Oldin" ko'rinishi - avvalgi dict asosidagi klasslar nusxasi.
+
+Ishga tushirish: python -m benchmarks.bench_model_memory [savollar] [ishtirokchilar]
+"""
+import json
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+
+from bot.models.quiz_model import Question
+from bot.services.quiz_manager import ParticipantScore
+
+
+@dataclass
+class LegacyQuestion:
+    """Avvalgi Question: dict asosida, original_options alohida nusxa"""
+    id: str
+    text: str
+    options: list[str]
+    correct_index: int
+    original_options: list[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.original_options:
+            self.original_options = self.options.copy()
+
+
+class LegacyParticipantScore:
+    """Avvalgi ParticipantScore: dict asosida"""
+
+    def __init__(self, user_id: int, username: str):
+        self.user_id = user_id
+        self.username = username
+        self.correct_count = 0
+        self.total_answered = 0
+
+
+def questions_json(count: int) -> str:
+    """db.save_quiz saqlaydigan ko'rinishdagi savollar"""
+    return json.dumps([
+        {
+            "id": f"{i:08x}",
+            "text": f"{i}-savol matni",
+            "options": [f"Variant {letter}" for letter in "ABCD"],
+            "correct_index": 0,
+            "original_options": [f"Variant {letter}" for letter in "ABCD"],
+        }
+        for i in range(count)
+    ])
+
+
+def bytes_per_item(build, count: int) -> float:
+    tracemalloc.start()
+    keep = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+    return current / count
+
+
+def load_questions(cls, data: str) -> list:
+    """db.get_quiz dagi kabi JSON'dan savollarni yuklash"""
+    return [
+        cls(
+            id=q["id"],
+            text=q["text"],
+            options=q["options"],
+            correct_index=q["correct_index"],
+            original_options=q.get("original_options", q["options"])
+        )
+        for q in json.loads(data)
+    ]
+
+
+def load_participants(cls, count: int) -> dict:
+    participants = {}
+    for user_id in range(count):
+        participant = cls(user_id, f"user{user_id}")
+        participant.correct_count = user_id % 20
+        participant.total_answered = 20
+        participants[user_id] = participant
+    return participants
+
+
+if __name__ == "__main__":
+    questions = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    participants = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    data = questions_json(questions)
+
+    rows = [
+        ("Savol", lambda: load_questions(LegacyQuestion, data), lambda: load_questions(Question, data), questions),
+        ("Ishtirokchi", lambda: load_participants(LegacyParticipantScore, participants),
+         lambda: load_participants(ParticipantScore, participants), participants),
+    ]
+
+    print(f"{'':12} {'oldin':>10} {'keyin':>10} {'tejash':>8}")
+    for label, before, after, count in rows:
+        b = bytes_per_item(before, count)
+        a = bytes_per_item(after, count)
+        print(f"{label:12} {b:8.0f} B {a:8.0f} B {(1 - a / b) * 100:6.1f}%")
@@ -0,0 +1,83 @@
+"""
+Katta DOCX yuklanganda event loop kechikishi: joriy jarayonda va ParsePool'da
+
+Parse paytida 10 ms lik "tick" vazifasi ishlaydi va har bir uyg'onish
+qancha kechikkani yoziladi - bu taymerlar va callback javoblari sezadigan
+to'xtalish.
+
+Ishga tushirish: python -m benchmarks.bench_parse_pool [hajm_mb]
+"""
+import asyncio
+import sys
+import time
+
+from bot.services.docx_parser import DocxParser
+from bot.services.parse_pool import ParsePool
+from benchmarks.corpus import make_docx, paragraph_xml
+
+TICK = 0.01
+
+
+def make_large_docx(target_bytes: int, unmarked: int = 0) -> bytes:
+    """Taxminan target_bytes hajmli (siqilmagan) .docx, dastlabki unmarked ta savolda to'g'ri javob yo'q"""
+    paragraphs = []
+    size = 0
+    i = 0
+    while size < target_bytes:
+        i += 1
+        block = [f"{i}. Savol matni raqam {i}, bir oz uzunroq tavsif bilan?"] + [
+            f"{'*' if j == i % 4 and i > unmarked else ''}{letter}) Variant {letter} savol {i} uchun"
+            for j, letter in enumerate("ABCD")
+        ]
+        paragraphs.extend(block)
+        size += sum(len(paragraph_xml(text)) for text in block)
+    return make_docx(paragraphs)
+
+
+async def ticker(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - started - TICK)
+
+
+async def measure(name: str, parse) -> None:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    task = asyncio.create_task(ticker(lags, stop))
+    await asyncio.sleep(0.05)
+
+    started = time.perf_counter()
+    result = await parse()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await task
+
+    lags.sort()
+    print(f"  {name}: parse {elapsed:.2f} s, {len(result.questions)} savol")
+    print(f"      loop kechikishi: max {lags[-1] * 1000:7.1f} ms, "
+          f"p99 {lags[int(len(lags) * 0.99)] * 1000:6.1f} ms, tick'lar {len(lags)}")
+
+
+async def main(size_mb: float) -> None:
+    data = make_large_docx(int(size_mb * 1024 * 1024))
+    print(f"Fayl hajmi: {len(data) / 1024 / 1024:.1f} MB")
+
+    async def inline():
+        return await DocxParser().parse_bytes(data)
+
+    pool = ParsePool(max_workers=1)
+    # Worker jarayonini oldindan ishga tushirish (birinchi fayl kutmasligi uchun)
+    await pool.parse(0, make_large_docx(1024))
+
+    async def pooled():
+        return await pool.parse(1, data)
+
+    await measure("joriy jarayonda", inline)
+    await measure("ParsePool       ", pooled)
+    print(f"  pool: {pool.stats()}")
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(float(sys.argv[1]) if len(sys.argv) > 1 else 10))
@@ -0,0 +1,53 @@
+"""
+Katta DOCX: progress xabarlari va xatoli faylda parse'ni erta to'xtatish
+
+- To'g'ri fayl: progress callback necha marta va qanday oraliqda chaqiriladi
+- Boshida xatolari bor fayl: oxirigacha o'qish (cheksiz error_budget) va
+  error_budget oshganda to'xtatish vaqtlari
+
+Ishga tushirish: python -m benchmarks.bench_parse_progress [hajm_mb] [error_budget]
+"""
+import sys
+import time
+
+from bot.services.docx_parser import DocxParser
+from benchmarks.bench_parse_pool import make_large_docx
+
+
+def timed(parser: DocxParser, data: bytes, progress=None) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = parser.parse(data, progress)
+    return time.perf_counter() - started, result
+
+
+def main(size_mb: float, error_budget: int) -> None:
+    target = int(size_mb * 1024 * 1024)
+    data = make_large_docx(target)
+    print(f"Fayl hajmi: {len(data) / 1024 / 1024:.1f} MB")
+
+    reports: list[tuple[float, float, int]] = []
+    started = time.perf_counter()
+    elapsed, result = timed(
+        DocxParser(), data,
+        lambda fraction, questions: reports.append((time.perf_counter() - started, fraction, questions))
+    )
+    assert result.success
+    print(f"  To'g'ri fayl: {elapsed * 1000:.0f} ms, {len(result.questions)} savol, "
+          f"{len(reports)} ta progress (har {DocxParser.PROGRESS_INTERVAL} s da ko'pi bilan bitta)")
+    for at, fraction, questions in reports:
+        print(f"      {at * 1000:6.0f} ms: {fraction * 100:5.1f}%, {questions} savol")
+
+    bad = make_large_docx(target, unmarked=error_budget * 2)
+    full, full_result = timed(DocxParser(error_budget=10 ** 9), bad)
+    early, early_result = timed(DocxParser(error_budget=error_budget), bad)
+    assert not full_result.success and not early_result.success
+    print(f"  Boshida {error_budget * 2} ta xatoli fayl (error_budget={error_budget}):")
+    print(f"      oxirigacha o'qish: {full * 1000:7.1f} ms")
+    print(f"      erta to'xtatish:   {early * 1000:7.1f} ms  (x{full / early:.0f})")
+
+
+if __name__ == "__main__":
+    main(
+        float(sys.argv[1]) if len(sys.argv) > 1 else 10,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    )
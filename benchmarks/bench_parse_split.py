@@ -0,0 +1,86 @@
+"""
+Katta .docx'ni bo'laklarga bo'lib parallel parse qilish: worker soniga qarab tezlanish
+
+Har bir worker soni uchun ParsePool(max_workers=N) hujjatni N bo'lakka bo'ladi
+(1 - bo'linmaydi). Natija bir jarayonli DocxParser bilan bir xilligi tekshiriladi.
+Tezlanish mashinadagi yadrolar soni bilan cheklanadi, shuning uchun "kritik yo'l"
+ham ko'rsatiladi: bo'laklar joriy jarayonda birma-bir o'qilib, eng sekin bo'lak
+va birlashtirish vaqti qo'shiladi - yadrolar yetarli bo'lgandagi vaqt.
+
+Ishga tushirish: python -m benchmarks.bench_parse_split [savollar] [eng_ko'p_worker]
+"""
+import asyncio
+import io
+import os
+import sys
+import time
+
+from bot.services.docx_parser import DocxParser, docx_part_size
+from bot.services.parse_pool import ParsePool
+from benchmarks.corpus import FORMAT_QUESTION_MARK, CorpusSpec, make_corpus_docx
+
+REPEATS = 3
+
+
+def snapshot(result) -> tuple:
+    return result.success, result.error_message, [(q.text, q.options, q.correct_index) for q in result.questions]
+
+
+async def bench(data: bytes, workers: int, expected: tuple) -> float:
+    # Hujjat aynan workers ta bo'lakka bo'linadi
+    chunk_size = docx_part_size(io.BytesIO(data)) // workers
+    pool = ParsePool(max_workers=workers, max_queue=0, chunk_size=chunk_size)
+    try:
+        # Worker jarayonlarini ishga tushirish
+        await asyncio.gather(*(pool.parse(-i, make_corpus_docx(CorpusSpec(questions=10))) for i in range(workers)))
+        best = float("inf")
+        for _ in range(REPEATS):
+            started = time.perf_counter()
+            result = await pool.parse(1, data)
+            best = min(best, time.perf_counter() - started)
+        assert snapshot(result) == expected, f"{workers} worker: natija farq qiladi"
+        assert pool.counters["split"] == (REPEATS if workers > 1 else 0), pool.counters
+        return best
+    finally:
+        await asyncio.to_thread(pool.shutdown)
+
+
+def critical_path(data: bytes, workers: int) -> float:
+    """Eng sekin bo'lak + birlashtirish (yadrolar soni workers dan kam bo'lmasa)"""
+    parser = DocxParser()
+    parts, slowest = [], 0.0
+    for index in range(workers):
+        started = time.perf_counter()
+        parts.append(parser.parse_chunk(data, index, workers))
+        slowest = max(slowest, time.perf_counter() - started)
+    started = time.perf_counter()
+    parser.merge_chunks(parts)
+    return slowest + time.perf_counter() - started
+
+
+async def main(questions: int, max_workers: int) -> None:
+    counts = sorted({1, 2, *(n for n in (4, 8, 16) if n <= max_workers), max_workers})
+    print(f"Yadrolar: {os.cpu_count()}")
+    for spec in (CorpusSpec(questions=questions), CorpusSpec(questions=questions, format=FORMAT_QUESTION_MARK)):
+        data = make_corpus_docx(spec)
+        started = time.perf_counter()
+        expected = snapshot(DocxParser().parse(data))
+        serial = time.perf_counter() - started
+        print(f"  {spec.format}: {questions} savol, {len(data) / 1024 / 1024:.1f} MB "
+              f"(XML {docx_part_size(io.BytesIO(data)) / 1024 / 1024:.0f} MB), "
+              f"joriy jarayonda {serial * 1000:.0f} ms")
+
+        base = None
+        for workers in counts:
+            elapsed = await bench(data, workers, expected)
+            critical = critical_path(data, workers)
+            base = base or elapsed
+            print(f"    {workers:2} worker: {elapsed * 1000:7.0f} ms  x{base / elapsed:.2f}   "
+                  f"kritik yo'l {critical * 1000:6.0f} ms  x{base / critical:.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else max(2, os.cpu_count() or 1)
+    ))
@@ -0,0 +1,73 @@
+"""
+Sessiya checkpoint narxini o'lchash
+
+Ishga tushirish: python -m benchmarks.bench_session_checkpoint [sessiyalar_soni]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from bot.database import db as db_module
+from bot.database.db import Database
+from bot.models.quiz_model import Question, Quiz, QuizSettings
+from bot.services.quiz_manager import QuizManager
+
+QUESTIONS = 50
+
+
+def make_quiz() -> Quiz:
+    questions = [
+        Question(id=str(i), text=f"Savol {i}", options=["A", "B", "C", "D"], correct_index=0)
+        for i in range(QUESTIONS)
+    ]
+    return Quiz(id="bench", title="Benchmark", questions=questions)
+
+
+def answer_all(manager: QuizManager, users: int) -> float:
+    """Barcha sessiyalarda barcha savollarga javob berish vaqti (soniya)"""
+    quiz = make_quiz()
+    sessions = [manager.create_session(user_id, quiz, QuizSettings()) for user_id in range(users)]
+
+    started = time.perf_counter()
+    for _ in range(QUESTIONS):
+        for session in sessions:
+            session.answer_question(0)
+    return time.perf_counter() - started
+
+
+async def main(users: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_module._db = Database(os.path.join(tmp, "bench.db"))
+        await db_module._db.init()
+        answers = users * QUESTIONS
+
+        # 1. Checkpoint'siz (on_change o'chirilgan)
+        manager = QuizManager()
+        manager.store.mark = lambda kind, owner_id: None
+        base = answer_all(manager, users)
+
+        # 2. Checkpoint bilan (faqat dirty belgilash, yozish fon vazifasida)
+        manager = QuizManager()
+        manager.store.checkpoint_interval = 3600  # Flush'ni alohida o'lchaymiz
+        with_mark = answer_all(manager, users)
+
+        # 3. Bitta flush: barcha sessiyalar snapshot'i bitta tranzaksiyada
+        for user_id in manager.active_sessions:
+            manager.store.mark("private", user_id)
+        started = time.perf_counter()
+        await manager.store.flush()
+        flush = time.perf_counter() - started
+        await manager.store.stop()
+
+        print(f"Sessiyalar: {users}, javoblar: {answers}")
+        print(f"answer_question (checkpoint'siz): {base / answers * 1e6:.2f} us/javob")
+        print(f"answer_question (checkpoint bilan): {with_mark / answers * 1e6:.2f} us/javob "
+              f"(+{(with_mark - base) / answers * 1e6:.2f} us)")
+        print(f"flush ({users} snapshot): {flush * 1000:.1f} ms "
+              f"({flush / users * 1e6:.1f} us/sessiya)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
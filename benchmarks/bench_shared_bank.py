@@ -0,0 +1,78 @@
+"""
+Umumiy savollar to'plami: ko'p sessiyalar xotirasi
+
+Har bir sessiya o'z quiz nusxasini saqlaganda (eski usul) va umumiy to'plam
+ustida faqat tartib massivlarini saqlaganda xotirani solishtirish.
+
+Ishga tushirish: python -m benchmarks.bench_shared_bank [sessiyalar] [savollar]
+"""
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import replace
+
+from bot.models.quiz_model import Question, Quiz, QuizSettings
+from bot.services.quiz_manager import QuizManager
+
+
+def make_quiz(questions: int) -> Quiz:
+    return Quiz(
+        id="bench",
+        title="Benchmark",
+        questions=[
+            Question(
+                id=str(i),
+                text=f"{i}-savol: " + "Savol matni uzunroq bo'lishi uchun takrorlanadi. " * 3,
+                options=[f"Variant {letter} - {i}" for letter in "ABCD"],
+                correct_index=0
+            )
+            for i in range(questions)
+        ]
+    )
+
+
+def per_session_copies(sessions: int, quiz: Quiz) -> list:
+    """Eski usul: har bir sessiya uchun savollar nusxasi, variantlar joyida aralashtiriladi"""
+    result = []
+    for _ in range(sessions):
+        questions = []
+        for q in quiz.questions:
+            options = list(q.options)
+            random.shuffle(options)
+            questions.append(
+                Question(q.id, q.text, options, options.index(q.correct_answer), list(q.original_options))
+            )
+        result.append(replace(quiz, questions=questions))
+    return result
+
+
+def shared_bank(sessions: int, quiz: Quiz) -> QuizManager:
+    """Yangi usul: bitta umumiy to'plam + har bir sessiyada tartib massivlari"""
+    manager = QuizManager(max_sessions=sessions)
+    manager.store.mark = lambda kind, owner_id: None
+    for user_id in range(sessions):
+        # Har bir foydalanuvchi quizni bazadan alohida yuklaydi - bir xil nusxa qayta ishlatiladi
+        manager.create_session(user_id, quiz, QuizSettings())
+    return manager
+
+
+def measure(label: str, build) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    keep = build()
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:28} {current / 1024 / 1024:9.1f} MB  {current / SESSIONS:10.0f} B/sessiya  {elapsed:6.2f} s")
+    del keep
+
+
+if __name__ == "__main__":
+    SESSIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    QUESTIONS = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    quiz = make_quiz(QUESTIONS)
+
+    print(f"Sessiyalar: {SESSIONS}, savollar: {QUESTIONS}")
+    measure("Har sessiyada nusxa", lambda: per_session_copies(SESSIONS, quiz))
+    measure("Umumiy to'plam + massivlar", lambda: shared_bank(SESSIONS, quiz))
@@ -0,0 +1,132 @@
+"""
+Matnlar pool'i: parse qilingan va bazadan yuklangan savollar banklari xotirasi
+
+Korpusda variantlarning bir qismi boshqa savollarda ham uchraydigan qisqa javoblar
+(sonlar, yillar, "Hech biri"; ba'zilari NBSP yoki ikki bo'shliq bilan). Har bir
+holat pool o'chirilgan (TEXT_POOL_SIZE=0) va yoqilgan holda o'lchanadi: natija
+xotirada ushlab turgan bayt (tracemalloc, pool'ning o'zi ham hisobda), turli str
+obyektlari soni va eng yaxshi vaqt.
+
+- Parse: bitta katta hujjat
+- Kesh: bazadan yuklangan bir nechta quiz (QuizManager._banks kabi bir vaqtda xotirada)
+
+Ishga tushirish: python -m benchmarks.bench_text_pool [savollar] [quizlar]
+"""
+import asyncio
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from bot.database.db import Database
+from bot.models import Quiz
+from bot.services.docx_parser import DocxParser
+from bot.services.quiz_manager import estimate_bank_bytes
+from bot.utils.text_pool import text_pool
+from benchmarks.corpus import FORMAT_QUESTION_MARK, CorpusSpec, make_corpus_docx
+
+REPEATS = 3
+REPEATED_OPTIONS = 0.3
+
+
+def shared_bytes(value) -> int:
+    """QuizManager.stats() dagi bank_bytes: bo'lishilgan matnlar bir marta"""
+    quizzes = value if isinstance(value, list) else [Quiz(questions=value.questions)]
+    seen = set()
+    return sum(estimate_bank_bytes(quiz, seen) for quiz in quizzes)
+
+
+def strings(questions) -> list[str]:
+    return [text for question in questions for text in (question.text, *question.options)]
+
+
+# Avvalgi holat: har bir matn alohida obyekt; faqat quiz ichida (umumiy pool 0); ikkalasi
+MODES = {"avval": "takrorlar birlashtirilmaydi", "quiz": "faqat quiz ichida", "pool": "quiz ichida + umumiy pool"}
+
+
+def measure(load, mode: str):
+    """(natija, ushlab turilgan bayt, eng yaxshi vaqt)"""
+    max_size = text_pool.max_size
+    text_pool.max_size = max_size if mode == "pool" else 0
+    if mode == "avval":
+        text_pool.intern = lambda text, seen: text
+    try:
+        best = float("inf")
+        for _ in range(REPEATS):
+            text_pool.clear()
+            started = time.perf_counter()
+            load()
+            best = min(best, time.perf_counter() - started)
+
+        text_pool.clear()
+        gc.collect()
+        tracemalloc.start()
+        value = load()
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return value, retained, best
+    finally:
+        text_pool.max_size = max_size
+        vars(text_pool).pop("intern", None)
+
+
+def report(name: str, load, questions_of) -> None:
+    print(f"  {name}:")
+    results = {}
+    for mode, title in MODES.items():
+        value, retained, elapsed = measure(load, mode)
+        questions = questions_of(value)
+        texts = strings(questions)
+        results[mode] = [(q.text, q.options) for q in questions]
+        print(f"    {title:27} {retained / 1024 / 1024:7.2f} MB  "
+              f"str obyektlari {len({id(text) for text in texts}):7} / {len(texts)}  "
+              f"bank_bytes {shared_bytes(value) / 1024 / 1024:6.2f} MB  {elapsed * 1000:7.1f} ms")
+    assert all(result == results["avval"] for result in results.values()), f"{name}: natija farq qiladi"
+    print(f"    turli matnlar: {len(set(texts))}, pool: {text_pool.stats()}")
+
+
+async def save_quizzes(db: Database, quizzes: int, questions: int) -> list[str]:
+    batch = []
+    for seed in range(1, quizzes + 1):
+        spec = CorpusSpec(questions=questions, format=FORMAT_QUESTION_MARK,
+                          repeated_options=REPEATED_OPTIONS, seed=seed)
+        result = DocxParser().parse(make_corpus_docx(spec))
+        batch.append(Quiz(title=f"Test {seed}", questions=result.questions, creator_id=1))
+    assert await db.save_quizzes(batch)
+    return [quiz.id for quiz in batch]
+
+
+async def load_quizzes(db: Database, ids: list[str]) -> list[Quiz]:
+    return [await db.get_quiz(quiz_id) for quiz_id in ids]
+
+
+def main(questions: int, quizzes: int) -> None:
+    spec = CorpusSpec(questions=questions, format=FORMAT_QUESTION_MARK, repeated_options=REPEATED_OPTIONS)
+    data = make_corpus_docx(spec)
+    print(f"Korpus: {questions} savol, variantlarning {REPEATED_OPTIONS:.0%} takrorlanuvchi qisqa javob")
+    report("Parse", lambda: DocxParser().parse(data), lambda result: result.questions)
+    result = DocxParser().parse(data)
+    assert not any("\u00a0" in text or "  " in text for text in strings(result.questions))
+
+    per_quiz = max(1, questions // quizzes)
+    with tempfile.TemporaryDirectory() as directory:
+        db = Database(os.path.join(directory, "bench.db"))
+        asyncio.run(db.init())
+        ids = asyncio.run(save_quizzes(db, quizzes, per_quiz))
+
+        def load():
+            return asyncio.run(load_quizzes(db, ids))
+
+        def all_questions(loaded):
+            return [question for quiz in loaded for question in quiz.questions]
+
+        report(f"Kesh ({quizzes} quiz, har birida {per_quiz} savol)", load, all_questions)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    )
@@ -0,0 +1,211 @@
+"""
+Update qabul qilish: polling va webhook rejimlarining kechikishi
+
+Lokal soxta Telegram API server ishga tushiriladi. U update'larni
+getUpdates orqali beradi yoki webhook manziliga POST qiladi, bot esa har
+bir xabarga sendMessage bilan javob qaytaradi. Kechikish - update
+yaratilgandan javob serverga yetib kelguncha bo'lgan vaqt.
+
+Ishga tushirish: python -m benchmarks.bench_webhook [update'lar] [soniyasiga] [tarmoq_ms]
+"""
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from collections import deque
+
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.types import Message
+from aiohttp import ClientSession, TCPConnector, web
+
+from bot.config import WebhookConfig
+from bot.webhook import create_webhook_app, register_webhook
+
+TOKEN = "123456:TEST-token-for-local-benchmark"
+API_PORT = 18081
+WEBHOOK_PORT = 18082
+CHATS = 50
+
+
+class FakeTelegram:
+    """getMe, getUpdates, sendMessage va setWebhook'ni taqlid qiluvchi server"""
+
+    def __init__(self, network_delay: float):
+        self.network_delay = network_delay
+        self.pending: deque[dict] = deque()
+        self.arrived = asyncio.Event()
+        self.webhook_url = ""
+        self.sent_at: dict[int, float] = {}  # update_id -> yaratilgan vaqt
+        self.latencies: list[float] = []
+        self.done = asyncio.Event()
+        self.expected = 0
+        self._client: ClientSession | None = None
+        self._push_tasks: set[asyncio.Task] = set()
+        self._message_id = 0
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self.handle)
+        return app
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"].lower()
+        data = await request.post()
+        await asyncio.sleep(self.network_delay)
+
+        if method == "getme":
+            result = {"id": 123456, "is_bot": True, "first_name": "Bench", "username": "bench_bot"}
+        elif method == "getupdates":
+            result = await self._get_updates(int(data.get("offset", 0)), float(data.get("timeout", 0)))
+        elif method == "sendmessage":
+            result = self._record_answer(int(data["chat_id"]), data["text"])
+        elif method == "setwebhook":
+            self.webhook_url = data["url"]
+            result = True
+        elif method == "deletewebhook":
+            self.webhook_url = ""
+            result = True
+        else:
+            return web.json_response({"ok": False, "error_code": 404, "description": "Not Found"})
+
+        await asyncio.sleep(self.network_delay)
+        return web.json_response({"ok": True, "result": result})
+
+    async def _get_updates(self, offset: int, timeout: float) -> list[dict]:
+        while self.pending and self.pending[0]["update_id"] < offset:
+            self.pending.popleft()
+        if not self.pending and timeout:
+            self.arrived.clear()
+            try:
+                await asyncio.wait_for(self.arrived.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return list(self.pending)[:100]
+
+    def _record_answer(self, chat_id: int, text: str) -> dict:
+        update_id = int(text)
+        self.latencies.append(time.perf_counter() - self.sent_at.pop(update_id))
+        if len(self.latencies) >= self.expected:
+            self.done.set()
+        self._message_id += 1
+        return {"message_id": self._message_id, "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"}, "text": text}
+
+    def push(self, update_id: int) -> None:
+        """Yangi update: webhook bo'lsa POST, aks holda getUpdates navbatiga"""
+        chat_id = 1000 + update_id % CHATS
+        update = {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id, "date": int(time.time()), "text": str(update_id),
+                "chat": {"id": chat_id, "type": "private"},
+                "from": {"id": chat_id, "is_bot": False, "first_name": "User"}
+            }
+        }
+        self.sent_at[update_id] = time.perf_counter()
+        if self.webhook_url:
+            task = asyncio.create_task(self._deliver(update))
+            self._push_tasks.add(task)
+            task.add_done_callback(self._push_tasks.discard)
+        else:
+            self.pending.append(update)
+            self.arrived.set()
+
+    async def _deliver(self, update: dict) -> None:
+        if self._client is None:
+            # Telegram webhook'ga bir vaqtda max_connections tagacha ulanadi
+            self._client = ClientSession(connector=TCPConnector(limit=100))
+        await asyncio.sleep(self.network_delay)
+        async with self._client.post(self.webhook_url, json=update) as response:
+            await response.read()
+
+    async def close(self) -> None:
+        if self._client:
+            await self._client.close()
+
+
+async def echo(message: Message) -> None:
+    await message.answer(message.text)
+
+
+async def run_mode(mode: str, updates: int, rate: float, network_delay: float) -> dict:
+    fake = FakeTelegram(network_delay)
+    fake.expected = updates
+    api_runner = web.AppRunner(fake.app())
+    await api_runner.setup()
+    await web.TCPSite(api_runner, "127.0.0.1", API_PORT).start()
+
+    session = AiohttpSession(api=TelegramAPIServer.from_base(f"http://127.0.0.1:{API_PORT}"))
+    bot = Bot(TOKEN, session=session)
+    dp = Dispatcher()
+    dp.message.register(echo)
+
+    hook_runner = None
+    handler = None
+    if mode == "webhook":
+        settings = WebhookConfig(url=f"http://127.0.0.1:{WEBHOOK_PORT}", host="127.0.0.1",
+                                 port=WEBHOOK_PORT, max_concurrency=100)
+        app, handler = create_webhook_app(dp, bot, settings)
+        hook_runner = web.AppRunner(app)
+        await hook_runner.setup()
+        await web.TCPSite(hook_runner, settings.host, settings.port).start()
+        await register_webhook(dp, bot, settings)
+        poller = None
+    else:
+        poller = asyncio.create_task(dp.start_polling(bot, handle_signals=False, polling_timeout=10))
+        await asyncio.sleep(0.2)
+
+    started = time.perf_counter()
+    for update_id in range(1, updates + 1):
+        fake.push(update_id)
+        # Bir tekis oqim: soniyasiga rate ta update
+        delay = started + update_id / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    await asyncio.wait_for(fake.done.wait(), timeout=60)
+    elapsed = time.perf_counter() - started
+    # Oxirgi javoblar bot tomoniga yetib borishi uchun
+    await asyncio.sleep(network_delay * 2 + 0.1)
+
+    if poller:
+        await dp.stop_polling()
+        await poller
+    if hook_runner:
+        await hook_runner.cleanup()
+    await fake.close()
+    await bot.session.close()
+    await api_runner.cleanup()
+
+    latencies = sorted(fake.latencies)
+    return {
+        "elapsed": elapsed,
+        "avg": statistics.mean(latencies) * 1000,
+        "p50": latencies[len(latencies) // 2] * 1000,
+        "p95": latencies[int(len(latencies) * 0.95)] * 1000,
+        "max": latencies[-1] * 1000,
+        "handler": handler.stats() if handler else None
+    }
+
+
+async def main(updates: int, rate: float, network_ms: float) -> None:
+    logging.basicConfig(level=logging.WARNING)
+    print(f"{updates} ta update, soniyasiga {rate:.0f} ta, tarmoq kechikishi {network_ms:.0f} ms")
+    for mode in ("polling", "webhook"):
+        result = await run_mode(mode, updates, rate, network_ms / 1000)
+        print(f"\n{mode}:")
+        print(f"  jami vaqt:  {result['elapsed']:.2f} s")
+        print(f"  kechikish:  o'rtacha {result['avg']:.1f} ms, p50 {result['p50']:.1f} ms, "
+              f"p95 {result['p95']:.1f} ms, max {result['max']:.1f} ms")
+        if result["handler"]:
+            print(f"  handler:    {result['handler']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 200,
+        float(sys.argv[3]) if len(sys.argv) > 3 else 20
+    ))
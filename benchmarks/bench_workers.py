@@ -0,0 +1,103 @@
+"""
+Ko'p jarayonli rejim: worker soniga qarab o'tkazuvchanlik
+
+Har bir update CPU talab qiladigan ish sifatida test matnini parse qiladi
+(DocxParser). Update'lar WorkerSupervisor orqali chat_id bo'yicha
+taqsimlanadi, o'tkazuvchanlik 1, 2, 4, ... worker bilan o'lchanadi.
+
+Ishga tushirish: python -m benchmarks.bench_workers [update'lar] [max_worker] [savollar]
+"""
+import asyncio
+import os
+import signal
+import sys
+import time
+
+from bot.services.docx_parser import DocxParser
+from bot.workers import WorkerSupervisor, take_batch
+
+CHATS = 1000
+
+
+def make_text(questions: int) -> str:
+    lines = []
+    for i in range(1, questions + 1):
+        lines.append(f"{i}. Savol matni raqam {i}?")
+        lines.extend(f"{'*' if j == 0 else ''}{letter}) Variant {letter} {i}" for j, letter in enumerate("ABCD"))
+    return "\n".join(lines)
+
+
+def bench_worker(index: int, count: int, updates, metrics) -> None:
+    """Handler o'rniga DocxParser ishlatadigan worker"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    while True:
+        for update in take_batch(updates):
+            if update is None:
+                return
+            started = time.perf_counter()
+            result = DocxParser()._parse_classic_format(update["message"]["text"].split("\n"))
+            metrics.record(index, result.success, time.perf_counter() - started)
+
+
+def make_update(update_id: int, text: str) -> dict:
+    chat_id = 1000 + update_id % CHATS
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id, "date": 0, "text": text,
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "User"}
+        }
+    }
+
+
+def done_count(supervisor: WorkerSupervisor) -> int:
+    return int(sum(supervisor.metrics.get(i)["processed"] + supervisor.metrics.get(i)["failed"]
+                   for i in range(supervisor.count)))
+
+
+async def run(workers: int, updates: int, text: str) -> float:
+    supervisor = WorkerSupervisor(workers, target=bench_worker)
+    supervisor.start()
+
+    # Isitish: har bir worker kamida bitta update ishlasin
+    warmup = 0
+    for chat_offset in range(workers):
+        supervisor.route(make_update(chat_offset, text))
+        warmup += 1
+    while done_count(supervisor) < warmup:
+        await asyncio.sleep(0.01)
+
+    started = time.perf_counter()
+    for update_id in range(workers, workers + updates):
+        supervisor.route(make_update(update_id, text))
+    while done_count(supervisor) < warmup + updates:
+        await asyncio.sleep(0.005)
+    elapsed = time.perf_counter() - started
+
+    stats = supervisor.stats()
+    await supervisor.stop()
+    print(f"  {workers} worker: {updates / elapsed:8.1f} update/s  ({elapsed:.2f} s), "
+          f"taqsimot: {[s['processed'] for s in stats]}")
+    return updates / elapsed
+
+
+async def main(updates: int, max_workers: int, questions: int) -> None:
+    text = make_text(questions)
+    print(f"{updates} ta update, har biri {questions} ta savol, CPU: {os.cpu_count()}")
+
+    baseline = None
+    workers = 1
+    while workers <= max_workers:
+        throughput = await run(workers, updates, text)
+        baseline = baseline or throughput
+        print(f"           tezlanish: x{throughput / baseline:.2f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else min(8, os.cpu_count() or 1),
+        int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    ))
@@ -0,0 +1,252 @@
+"""
+Sintetik .docx korpus generatori
+
+Ikkala format (klassik va ?/+/=), istalgan hajm, izoh paragraflari (shovqin),
+uzun variantlar va rasmlar bilan. Paragraflar Word kabi bir nechta run'ga
+bo'linadi (shrift, qalin matn), shuning uchun XML tuzilishi haqiqiy fayllarga yaqin.
+
+Ishga tushirish:
+    python -m benchmarks.corpus fayl.docx --questions 5000 --format question_mark
+    python -m benchmarks.corpus fayl.docx --size-mb 10 --noise 0.3 --long-options 0.2
+    python -m benchmarks.corpus fayl.docx --questions 200 --images 40 --image-kb 250
+"""
+import argparse
+import io
+import random
+import zipfile
+from dataclasses import dataclass, replace
+from typing import Iterable, Sequence
+from xml.sax.saxutils import escape
+
+FORMAT_CLASSIC = "classic"
+FORMAT_QUESTION_MARK = "question_mark"
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+    'relationships/officeDocument" Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+# Rasmlar: [Content_Types].xml dagi png turi va word/_rels/document.xml.rels
+_PNG_DEFAULT = '<Default Extension="png" ContentType="image/png"/>'
+_DOCUMENT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '{relationships}</Relationships>'
+)
+_IMAGE_REL = (
+    '<Relationship Id="rIdImage{index}" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+    'relationships/image" Target="media/image{index}.png"/>'
+)
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+_RUN_PROPERTIES = (
+    '<w:rPr><w:rFonts w:ascii="Times New Roman" w:hAnsi="Times New Roman"/>'
+    '<w:sz w:val="28"/><w:szCs w:val="28"/></w:rPr>'
+)
+_BOLD_RUN_PROPERTIES = (
+    '<w:rPr><w:rFonts w:ascii="Times New Roman" w:hAnsi="Times New Roman"/>'
+    '<w:b/><w:sz w:val="28"/><w:szCs w:val="28"/></w:rPr>'
+)
+
+_WORDS = (
+    "axborot tizim tarmoq kompyuter dastur algoritm ma'lumot xotira jarayon "
+    "protsessor fayl qurilma funksiya natija qiymat belgi jadval hisob o'lchov "
+    "birlik tezlik hajm manzil protokol server foydalanuvchi interfeys"
+).split()
+
+_NOISE = (
+    "Izoh: keyingi bo'lim",
+    "Mavzu bo'yicha qo'shimcha ma'lumot",
+    "Test tuzuvchi: fan o'qituvchisi",
+    "* * *",
+    "Quyidagi savollarga javob bering",
+)
+
+_COMMON_OPTIONS = ("Barcha javoblar to'g'ri", "Hech biri", "To'g'ri javob yo'q")
+
+# Ko'p testlarda aynan takrorlanadigan qisqa javoblar: sonlar, yillar, umumiy
+# iboralar. Ba'zilari Word'dagidek NBSP yoki ikki bo'shliq bilan yozilgan.
+_SHORT_ANSWERS = (
+    *(str(2 ** n) for n in range(1, 11)),
+    *(str(year) for year in range(1991, 2025, 3)),
+    "1 bayt", "8 bit", "1 Kbayt", "1024 bayt", "Protsessor", "Monitor", "Klaviatura",
+    "A va B", "B va C", "Faqat A", "Faqat B", "Hammasi", "Hech biri", "Hech\u00a0biri",
+    "Barcha javoblar to'g'ri", "Barcha  javoblar to'g'ri", "To'g'ri javob yo'q",
+)
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Korpus parametrlari"""
+    questions: int = 1000
+    format: str = FORMAT_CLASSIC
+    options: int = 4  # Har bir savoldagi variantlar
+    noise: float = 0.0  # Savoldan keyin izoh paragrafi qo'shilish ehtimoli
+    long_options: float = 0.0  # Variant uzun (300-600 belgi) bo'lish ehtimoli
+    repeated_options: float = 0.0  # Variant boshqa savollarda ham uchraydigan qisqa javob bo'lish ehtimoli
+    images: int = 0  # word/media dagi rasmlar soni
+    image_kb: int = 200  # Har bir rasm hajmi (siqilmaydigan ma'lumot, PNG/JPEG kabi)
+    seed: int = 1
+
+
+def make_paragraphs(spec: CorpusSpec) -> list[str]:
+    """Korpus paragraflari (bir xil spec - bir xil natija)"""
+    rng = random.Random(spec.seed)
+    paragraphs = ["Informatika fanidan test", ""]
+    for i in range(1, spec.questions + 1):
+        text = f"{_sentence(rng, 6, 14)}?"
+        correct = rng.randrange(spec.options)
+        options = []
+        for j in range(spec.options):
+            option = _option(rng, spec, i, j)
+            while option in options:  # Faqat takrorlanuvchi javoblarda
+                option = _option(rng, spec, i, j)
+            options.append(option)
+
+        if spec.format == FORMAT_QUESTION_MARK:
+            paragraphs.append(f"?{text}")
+            paragraphs.append(f"+{options[correct]}")
+            paragraphs.extend(f"={option}" for j, option in enumerate(options) if j != correct)
+        else:
+            paragraphs.append(f"{i}. {text}")
+            for j, option in enumerate(options):
+                line = f"{chr(65 + j)}) {option}"
+                paragraphs.append(f"*{line}" if j == correct else line)
+
+        if spec.noise and rng.random() < spec.noise:
+            paragraphs.append(rng.choice(_NOISE))
+        paragraphs.append("")
+    return paragraphs
+
+
+def make_corpus_docx(spec: CorpusSpec) -> bytes:
+    """Korpus .docx fayli (Word kabi DEFLATE bilan siqilgan)"""
+    rng = random.Random(spec.seed + 1)
+    images = [_PNG_SIGNATURE + rng.randbytes(spec.image_kb * 1024) for _ in range(spec.images)]
+    return make_docx((_word_paragraph(rng, text) for text in make_paragraphs(spec)),
+                     compression=zipfile.ZIP_DEFLATED, raw_xml=True, images=images)
+
+
+def spec_for_size(target_bytes: int, **params) -> CorpusSpec:
+    """Siqilgan hajmi taxminan target_bytes bo'ladigan spec"""
+    sample = CorpusSpec(questions=200, **params)
+    per_question = len(make_corpus_docx(sample)) / sample.questions
+    return replace(sample, questions=max(1, int(target_bytes / per_question)))
+
+
+def paragraph_xml(text: str) -> str:
+    """Bitta run'dan iborat (qalin) paragraf"""
+    return f'<w:p><w:r><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">{text}</w:t></w:r></w:p>'
+
+
+def make_docx(paragraphs: Iterable[str], compression: int = zipfile.ZIP_STORED,
+              raw_xml: bool = False, images: Sequence[bytes] = ()) -> bytes:
+    """
+    Paragraflardan .docx.
+
+    raw_xml=False - paragraflar matn (har biri paragraph_xml bilan o'raladi),
+    True - tayyor <w:p> XML bo'laklari. images - word/media/imageN.png
+    sifatida qo'shiladi va hujjat munosabatlarida (rels) ko'rsatiladi.
+    """
+    body = "".join(paragraphs) if raw_xml else "".join(map(paragraph_xml, paragraphs))
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{W_NS}"><w:body>{body}</w:body></w:document>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression) as archive:
+        if images:
+            archive.writestr("[Content_Types].xml", CONTENT_TYPES.replace("<Default ", _PNG_DEFAULT + "<Default ", 1))
+        else:
+            archive.writestr("[Content_Types].xml", CONTENT_TYPES)
+        archive.writestr("_rels/.rels", RELS)
+        archive.writestr("word/document.xml", document)
+        if images:
+            relationships = "".join(_IMAGE_REL.format(index=i) for i in range(1, len(images) + 1))
+            archive.writestr("word/_rels/document.xml.rels", _DOCUMENT_RELS.format(relationships=relationships))
+            for i, image in enumerate(images, start=1):
+                archive.writestr(f"word/media/image{i}.png", image)
+    return buffer.getvalue()
+
+
+def _sentence(rng: random.Random, low: int, high: int) -> str:
+    words = rng.choices(_WORDS, k=rng.randint(low, high))
+    return " ".join(words).capitalize()
+
+
+def _option(rng: random.Random, spec: CorpusSpec, question: int, index: int) -> str:
+    if spec.repeated_options and rng.random() < spec.repeated_options:
+        return rng.choice(_SHORT_ANSWERS)
+    if spec.long_options and rng.random() < spec.long_options:
+        text = _sentence(rng, 40, 80)
+    elif rng.random() < 0.1:
+        text = rng.choice(_COMMON_OPTIONS)
+    else:
+        text = _sentence(rng, 2, 6)
+    # Bitta savoldagi variantlar bir xil bo'lmasligi uchun
+    return f"{text} ({question}.{index + 1})"
+
+
+def _word_paragraph(rng: random.Random, text: str) -> str:
+    """Word uslubidagi paragraf: matn 1-3 run'ga bo'lingan, ba'zilari qalin"""
+    if not text:
+        return "<w:p/>"
+    parts = [text]
+    if len(text) > 20:
+        cuts = sorted(rng.sample(range(1, len(text)), k=min(2, rng.randint(0, 2))))
+        parts = [text[start:end] for start, end in zip([0, *cuts], [*cuts, len(text)])]
+    runs = "".join(
+        f'<w:r>{_BOLD_RUN_PROPERTIES if i == 0 and rng.random() < 0.3 else _RUN_PROPERTIES}'
+        f'<w:t xml:space="preserve">{escape(part)}</w:t></w:r>'
+        for i, part in enumerate(parts)
+    )
+    return f'<w:p><w:pPr><w:spacing w:after="0"/></w:pPr>{runs}</w:p>'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sintetik .docx test korpusi")
+    parser.add_argument("output")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--questions", type=int, default=1000)
+    size.add_argument("--size-mb", type=float)
+    parser.add_argument("--format", choices=[FORMAT_CLASSIC, FORMAT_QUESTION_MARK], default=FORMAT_CLASSIC)
+    parser.add_argument("--options", type=int, default=4)
+    parser.add_argument("--noise", type=float, default=0.0)
+    parser.add_argument("--long-options", type=float, default=0.0)
+    parser.add_argument("--repeated-options", type=float, default=0.0)
+    parser.add_argument("--images", type=int, default=0)
+    parser.add_argument("--image-kb", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    params = dict(format=args.format, options=args.options, noise=args.noise,
+                  long_options=args.long_options, repeated_options=args.repeated_options,
+                  images=args.images, image_kb=args.image_kb, seed=args.seed)
+    if args.size_mb:
+        spec = spec_for_size(int(args.size_mb * 1024 * 1024), **params)
+    else:
+        spec = CorpusSpec(questions=args.questions, **params)
+
+    data = make_corpus_docx(spec)
+    with open(args.output, "wb") as f:
+        f.write(data)
+    print(f"{args.output}: {spec.questions} savol, {len(data) / 1024 / 1024:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+DocxParser unumdorlik regressiyasi
+
+Har bir holat (benchmarks.corpus korpusi) alohida jarayonda parse qilinadi:
+eng yaxshi vaqt, eng yuqori xotira (RSS o'sishi) va savol/s yoziladi va
+benchmarks/baseline.json bilan solishtiriladi. Natija chegaradan yomonlashsa
+yoki savollar soni o'zgarsa, dastur 1 kodi bilan tugaydi.
+
+Vaqt mashinaga bog'liq: har bir holat jarayonida parse'dan oldin oddiy Python
+yuklamasining vaqti (kalibrovka) o'lchanadi va baseline bilan saqlanadi;
+mashina sekinroq bo'lsa, vaqt chegarasi kalibrovka nisbatiga ko'paytiriladi.
+
+Ishga tushirish:
+    python -m benchmarks.regression              # tekshirish
+    python -m benchmarks.regression --update     # baseline'ni yangilash
+    python -m benchmarks.regression --cases classic_20k --tolerance 0.3
+"""
+import argparse
+import gc
+import json
+import multiprocessing as mp
+import os
+import re
+import sys
+import time
+from dataclasses import asdict
+
+from bot.services.docx_parser import DocxParser
+from benchmarks.bench_docx_parser import _max_rss_kb, _reset_peak_rss
+from benchmarks.corpus import FORMAT_QUESTION_MARK, CorpusSpec, make_corpus_docx
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+CASES = {
+    "classic_1k": CorpusSpec(questions=1000),
+    "classic_20k": CorpusSpec(questions=20000),
+    "question_mark_20k": CorpusSpec(questions=20000, format=FORMAT_QUESTION_MARK),
+    "noisy_10k": CorpusSpec(questions=10000, noise=0.5),
+    "long_options_5k": CorpusSpec(questions=5000, format=FORMAT_QUESTION_MARK, long_options=0.5),
+}
+
+# Kichik xotira qiymatlari shovqinli - shuncha MB doim ruxsat etiladi
+MEMORY_SLACK_MB = 2.0
+
+
+def calibrate(repeats: int = 7) -> float:
+    """Mashina tezligi: matn va regex bilan ishlaydigan qat'iy yuklama (ms, eng yaxshisi)"""
+    pattern = re.compile(r'(\d+)\s*[.)]\s*(.+)$')
+    lines = [f"{i}) variant matni {i}" for i in range(100000)]
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        found = {}
+        for line in lines:
+            match = pattern.match(line)
+            found[match.group(1)] = match.group(2).strip().upper()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def _measure(data: bytes, repeats: int, out) -> None:
+    parser = DocxParser()
+    parser.parse(make_corpus_docx(CorpusSpec(questions=50)))  # Importlar va keshlarni isitish
+    calibration = calibrate()
+
+    # Xotira bitta toza parse bo'yicha (oldingi natija xotirada turmasligi uchun)
+    gc.collect()
+    baseline = _reset_peak_rss()
+    result = parser.parse(data)
+    peak_kb = _max_rss_kb() - baseline
+    summary = (result.success, len(result.questions), result.error_message)
+    del result
+
+    best = float("inf")
+    for _ in range(repeats):
+        gc.collect()
+        started = time.perf_counter()
+        parser.parse(data)
+        best = min(best, time.perf_counter() - started)
+    out.send((best, peak_kb, calibration, *summary))
+
+
+def run_case(spec: CorpusSpec, repeats: int) -> dict:
+    """Holatni alohida jarayonda o'lchash"""
+    data = make_corpus_docx(spec)
+    ctx = mp.get_context("spawn")
+    receiver, sender = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_measure, args=(data, repeats, sender))
+    process.start()
+    elapsed, peak_kb, calibration, success, questions, error = receiver.recv()
+    process.join()
+    if not success:
+        raise RuntimeError(f"parse xatosi: {error}")
+    return {
+        "size_mb": round(len(data) / 1024 / 1024, 2),
+        "questions": questions,
+        "parse_ms": round(elapsed * 1000, 1),
+        "peak_mb": round(peak_kb / 1024, 1),
+        "questions_per_s": round(questions / elapsed),
+        "calibration_ms": round(calibration, 1),
+    }
+
+
+def compare(name: str, current: dict, expected: dict, tolerance: float) -> list[str]:
+    """Baseline bilan solishtirish - regressiyalar ro'yxati"""
+    problems = []
+    # Mashina sekinlashgan bo'lsa chegara kengayadi, tezlashganda esa torayib
+    # qolmaydi (kalibrovkadagi tasodifiy sakrash soxta regressiya bermasin)
+    scale = max(1.0, current["calibration_ms"] / expected["calibration_ms"])
+    if current["questions"] != expected["questions"]:
+        problems.append(f"savollar soni {expected['questions']} -> {current['questions']}")
+    time_limit = expected["parse_ms"] * scale * (1 + tolerance)
+    if current["parse_ms"] > time_limit:
+        problems.append(f"vaqt {current['parse_ms']} ms > {time_limit:.1f} ms")
+    memory_limit = expected["peak_mb"] * (1 + tolerance) + MEMORY_SLACK_MB
+    if current["peak_mb"] > memory_limit:
+        problems.append(f"xotira {current['peak_mb']} MB > {memory_limit:.1f} MB")
+    return [f"{name}: {problem}" for problem in problems]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="DocxParser unumdorlik regressiyasi")
+    parser.add_argument("--update", action="store_true", help="baseline.json'ni qayta yozish")
+    parser.add_argument("--cases", help="vergul bilan ajratilgan holatlar (standart: hammasi)")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="ruxsat etilgan yomonlashuv ulushi")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    args = parser.parse_args()
+
+    names = args.cases.split(",") if args.cases else list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        parser.error(f"noma'lum holatlar: {', '.join(unknown)}")
+
+    stored = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+
+    results = {}
+    problems = []
+    print(f"  {'holat':20} {'MB':>6} {'savol':>7} {'ms':>9} {'xotira MB':>10} {'savol/s':>9} "
+          f"{'kalibr. ms':>11}   baseline ms")
+    for name in names:
+        current = run_case(CASES[name], args.repeats)
+        results[name] = current
+        expected = stored.get("cases", {}).get(name)
+        print(f"  {name:20} {current['size_mb']:6.2f} {current['questions']:7} {current['parse_ms']:9.1f} "
+              f"{current['peak_mb']:10.1f} {current['questions_per_s']:9} {current['calibration_ms']:11.1f}   "
+              f"{expected['parse_ms'] if expected else '-'}")
+        if expected and not args.update:
+            problems.extend(compare(name, current, expected, args.tolerance))
+
+    if args.update:
+        cases = {**stored.get("cases", {}), **results}
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "specs": {name: asdict(spec) for name, spec in CASES.items() if name in cases},
+                "cases": cases,
+            }, f, indent=2)
+            f.write("\n")
+        print(f"Baseline yangilandi: {args.baseline}")
+        return 0
+
+    if problems:
+        print("\nRegressiya:")
+        for problem in problems:
+            print(f"  {problem}")
+        return 1
+    if not stored:
+        print("\nBaseline yo'q - yaratish uchun --update bilan ishga tushiring")
+    else:
+        print("\nRegressiya yo'q")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
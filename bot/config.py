@@ -14,8 +14,28 @@ class BotConfig:
     """Bot asosiy sozlamalari"""
     token: str
     admin_ids: list[int]
+    drop_pending_updates: bool = False  # Restart paytida kelgan update'larni tashlab yuborish
+    mode: str = "polling"  # polling yoki webhook
     
 
+@dataclass
+class WebhookConfig:
+    """Webhook rejimi sozlamalari"""
+    url: str = ""  # Tashqi manzil (masalan https://example.com)
+    path: str = "/webhook"  # Update'lar qabul qilinadigan yo'l
+    host: str = "0.0.0.0"
+    port: int = 8080
+    secret_token: str = ""  # X-Telegram-Bot-Api-Secret-Token tekshiruvi
+    max_concurrency: int = 100  # Bir vaqtda qayta ishlanadigan update'lar soni
+
+
+@dataclass
+class WorkerConfig:
+    """Ko'p jarayonli rejim sozlamalari"""
+    count: int = 1  # Worker jarayonlar soni (1 - oddiy bitta jarayon)
+    metrics_interval: float = 60.0  # Worker statistikasini log qilish oralig'i (soniya)
+
+
 @dataclass
 class DatabaseConfig:
     """Database sozlamalari"""
@@ -42,12 +62,83 @@ class QuizConfig:
             }
 
 
+@dataclass
+class OutboundConfig:
+    """Telegram'ga chiquvchi so'rovlar sozlamalari"""
+    edit_flush_interval: float = 0.25  # Edit navbatini yuborish oralig'i (soniya)
+    edit_min_interval: float = 1.0  # Bitta xabarni edit qilish orasidagi minimal vaqt (soniya)
+    rate_limit: float = 25.0  # Soniyasiga maksimal so'rovlar soni
+    max_in_flight: int = 10  # Bir vaqtda yuborilayotgan so'rovlar soni
+    shed_threshold: int = 100  # Navbat shu darajaga yetganda kosmetik so'rovlar tashlanadi
+    cosmetic_max_wait: float = 3.0  # Kosmetik so'rov navbatda kutishi mumkin bo'lgan vaqt (soniya)
+    max_retries: int = 3  # Tarmoq xatosi yoki flood control'da qayta urinishlar soni
+    max_retry_after: float = 60.0  # Bundan uzoq RetryAfter kutilmaydi (soniya)
+
+
+@dataclass
+class CountdownConfig:
+    """Taymer yangilanish chastotasi sozlamalari"""
+    reduced_queue_depth: int = 30  # Navbat shu darajada - kamroq yangilash
+    minimal_queue_depth: int = 80  # Navbat shu darajada - faqat boshi va oxiri
+    private_step: int = 5  # Shaxsiy chatda har N soniyada yangilash
+    group_checkpoints: tuple = (20, 15, 10, 5)  # Guruhda yangilanadigan nuqtalar
+    final_seconds: int = 5  # Oxirgi N soniyada har soniyada yangilash
+    reduced_step: int = 10  # Yuklama oshganda yangilash oralig'i
+    reduced_final_seconds: int = 3  # Yuklama oshganda oxirgi N soniya
+
+
+@dataclass
+class SessionConfig:
+    """Quiz sessiyalari sozlamalari"""
+    checkpoint_interval: float = 0.5  # Sessiyalarni bazaga yozish oralig'i (soniya)
+    idle_timeout: int = 3600  # Shu vaqt harakatsiz qolgan sessiya o'chiriladi (soniya)
+    max_sessions: int = 10000  # Bir vaqtdagi shaxsiy sessiyalar chegarasi
+    max_group_sessions: int = 2000  # Bir vaqtdagi guruh sessiyalari chegarasi
+
+
+@dataclass
+class FSMConfig:
+    """FSM storage sozlamalari"""
+    cache_size: int = 1000  # Xotirada saqlanadigan state'lar soni (LRU)
+    state_ttl: int = 86400  # Tashlab ketilgan state'lar shu vaqtdan keyin o'chadi (soniya)
+    flush_interval: float = 1.0  # O'zgarishlarni bazaga yozish oralig'i (soniya)
+
+
+@dataclass
+class ParseConfig:
+    """Fayllarni parse qilish sozlamalari"""
+    workers: int = 2  # Parse jarayonlari soni
+    max_queue: int = 8  # Navbatda kutishi mumkin bo'lgan fayllar soni
+    per_user: int = 1  # Bitta foydalanuvchining bir vaqtdagi fayllari
+    max_file_size: int = 10 * 1024 * 1024  # Yuklanadigan fayl hajmi chegarasi (bayt)
+    max_part_size: int = 64 * 1024 * 1024  # Arxiv ichidagi hujjat XML'ining ochilgan hajmi (bayt)
+    error_budget: int = 20  # Shuncha xatoli savoldan keyin parse to'xtatiladi
+    max_archive_size: int = 20 * 1024 * 1024  # ZIP arxiv hajmi chegarasi (bayt)
+    max_archive_files: int = 200  # Bitta arxivdagi test fayllari chegarasi
+    chunk_size: int = 4 * 1024 * 1024  # Parallel parse'dagi bo'lak hajmi (hujjat XML'i, bayt; 0 - o'chirilgan)
+
+
+@dataclass
+class TextPoolConfig:
+    """Takrorlanuvchi matnlar (variantlar) pool'i sozlamalari"""
+    max_size: int = 50000  # Umumiy pool'dagi matnlar soni (to'lsa tozalanadi; 0 - faqat quiz ichida)
+    max_length: int = 128  # Bundan uzun matnlar umumiy pool'ga olinmaydi (belgi)
+
+
 @dataclass
 class Config:
     """Umumiy konfiguratsiya"""
     bot: BotConfig
+    webhook: WebhookConfig
+    workers: WorkerConfig
     database: DatabaseConfig
     quiz: QuizConfig
+    outbound: OutboundConfig
+    countdown: CountdownConfig
+    sessions: SessionConfig
+    fsm: FSMConfig
+    parsing: ParseConfig
+    text_pool: TextPoolConfig
 
 
 def load_config() -> Config:
@@ -55,12 +146,66 @@ def load_config() -> Config:
     return Config(
         bot=BotConfig(
             token=os.getenv("BOT_TOKEN", ""),
-            admin_ids=[int(id.strip()) for id in os.getenv("ADMIN_IDS", "").split(",") if id.strip()]
+            admin_ids=[int(id.strip()) for id in os.getenv("ADMIN_IDS", "").split(",") if id.strip()],
+            drop_pending_updates=os.getenv("DROP_PENDING_UPDATES", "0").lower() in ("1", "true", "yes"),
+            mode=os.getenv("BOT_MODE", "polling").lower()
+        ),
+        webhook=WebhookConfig(
+            url=os.getenv("WEBHOOK_URL", ""),
+            path=os.getenv("WEBHOOK_PATH", "/webhook"),
+            host=os.getenv("WEBHOOK_HOST", "0.0.0.0"),
+            port=int(os.getenv("WEBHOOK_PORT", "8080")),
+            secret_token=os.getenv("WEBHOOK_SECRET", ""),
+            max_concurrency=int(os.getenv("WEBHOOK_MAX_CONCURRENCY", "100"))
+        ),
+        workers=WorkerConfig(
+            count=max(1, int(os.getenv("BOT_WORKERS", "1"))),
+            metrics_interval=float(os.getenv("WORKER_METRICS_INTERVAL", "60"))
         ),
         database=DatabaseConfig(
             path=os.getenv("DATABASE_PATH", "data/quiz_bot.db")
         ),
-        quiz=QuizConfig()
+        quiz=QuizConfig(),
+        outbound=OutboundConfig(
+            edit_flush_interval=float(os.getenv("EDIT_FLUSH_INTERVAL", "0.25")),
+            edit_min_interval=float(os.getenv("EDIT_MIN_INTERVAL", "1.0")),
+            rate_limit=float(os.getenv("OUTBOUND_RATE_LIMIT", "25")),
+            max_in_flight=int(os.getenv("OUTBOUND_MAX_IN_FLIGHT", "10")),
+            shed_threshold=int(os.getenv("OUTBOUND_SHED_THRESHOLD", "100")),
+            cosmetic_max_wait=float(os.getenv("OUTBOUND_COSMETIC_MAX_WAIT", "3.0")),
+            max_retries=int(os.getenv("OUTBOUND_MAX_RETRIES", "3")),
+            max_retry_after=float(os.getenv("OUTBOUND_MAX_RETRY_AFTER", "60"))
+        ),
+        countdown=CountdownConfig(
+            reduced_queue_depth=int(os.getenv("COUNTDOWN_REDUCED_QUEUE_DEPTH", "30")),
+            minimal_queue_depth=int(os.getenv("COUNTDOWN_MINIMAL_QUEUE_DEPTH", "80"))
+        ),
+        sessions=SessionConfig(
+            checkpoint_interval=float(os.getenv("SESSION_CHECKPOINT_INTERVAL", "0.5")),
+            idle_timeout=int(os.getenv("SESSION_IDLE_TIMEOUT", "3600")),
+            max_sessions=int(os.getenv("SESSION_MAX", "10000")),
+            max_group_sessions=int(os.getenv("SESSION_MAX_GROUP", "2000"))
+        ),
+        fsm=FSMConfig(
+            cache_size=int(os.getenv("FSM_CACHE_SIZE", "1000")),
+            state_ttl=int(os.getenv("FSM_STATE_TTL", "86400")),
+            flush_interval=float(os.getenv("FSM_FLUSH_INTERVAL", "1.0"))
+        ),
+        parsing=ParseConfig(
+            workers=int(os.getenv("PARSE_WORKERS", "2")),
+            max_queue=int(os.getenv("PARSE_MAX_QUEUE", "8")),
+            per_user=int(os.getenv("PARSE_PER_USER", "1")),
+            max_file_size=int(os.getenv("PARSE_MAX_FILE_SIZE", str(10 * 1024 * 1024))),
+            max_part_size=int(os.getenv("PARSE_MAX_PART_SIZE", str(64 * 1024 * 1024))),
+            error_budget=int(os.getenv("PARSE_ERROR_BUDGET", "20")),
+            max_archive_size=int(os.getenv("PARSE_MAX_ARCHIVE_SIZE", str(20 * 1024 * 1024))),
+            max_archive_files=int(os.getenv("PARSE_MAX_ARCHIVE_FILES", "200")),
+            chunk_size=int(os.getenv("PARSE_CHUNK_SIZE", str(4 * 1024 * 1024)))
+        ),
+        text_pool=TextPoolConfig(
+            max_size=int(os.getenv("TEXT_POOL_SIZE", "50000")),
+            max_length=int(os.getenv("TEXT_POOL_MAX_LENGTH", "128"))
+        )
     )
 
 
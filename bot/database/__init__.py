@@ -1,3 +1,4 @@
 from .db import Database, get_db
+from .fsm_storage import SQLiteStorage
 
-__all__ = ["Database", "get_db"]
+__all__ = ["Database", "get_db", "SQLiteStorage"]
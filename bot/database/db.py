@@ -9,6 +9,7 @@ from datetime import datetime
 from typing import Optional
 from bot.models import Quiz, Question, QuizResult, UserStatistics
 from bot.config import config
+from bot.utils.text_pool import text_pool
 
 
 class Database:
@@ -25,6 +26,9 @@ class Database:
     async def init(self):
         """Database jadvallarini yaratish"""
         async with aiosqlite.connect(self.db_path) as db:
+            # WAL: bir nechta jarayon bir vaqtda o'qiy oladi, yozuvchi o'quvchilarni bloklamaydi
+            await db.execute("PRAGMA journal_mode=WAL")
+            
             # Quizlar jadvali
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS quizzes (
@@ -73,11 +77,33 @@ class Database:
                 )
             """)
             
+            # Faol quiz sessiyalari (restart'dan keyin tiklash uchun)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS quiz_sessions (
+                    kind TEXT NOT NULL,
+                    owner_id INTEGER NOT NULL,
+                    snapshot TEXT NOT NULL,
+                    updated_at TEXT,
+                    PRIMARY KEY (kind, owner_id)
+                )
+            """)
+            
+            # FSM state'lari (aiogram storage)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS fsm_states (
+                    key TEXT PRIMARY KEY,
+                    state TEXT,
+                    data TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            
             # Indekslar
             await db.execute("CREATE INDEX IF NOT EXISTS idx_quiz_creator ON quizzes(creator_id)")
             await db.execute("CREATE INDEX IF NOT EXISTS idx_quiz_share ON quizzes(share_code)")
             await db.execute("CREATE INDEX IF NOT EXISTS idx_results_user ON results(user_id)")
             await db.execute("CREATE INDEX IF NOT EXISTS idx_results_quiz ON results(quiz_id)")
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_fsm_updated ON fsm_states(updated_at)")
             
             await db.commit()
     
@@ -87,39 +113,58 @@ class Database:
         """Quizni saqlash"""
         try:
             async with aiosqlite.connect(self.db_path) as db:
-                questions_json = json.dumps([
-                    {
-                        "id": q.id,
-                        "text": q.text,
-                        "options": q.options,
-                        "correct_index": q.correct_index,
-                        "original_options": q.original_options
-                    }
-                    for q in quiz.questions
-                ])
-                
-                await db.execute("""
-                    INSERT OR REPLACE INTO quizzes 
-                    (id, title, creator_id, questions, time_per_question, 
-                     shuffle_options, share_code, created_at, is_active)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    quiz.id,
-                    quiz.title,
-                    quiz.creator_id,
-                    questions_json,
-                    quiz.time_per_question,
-                    1 if quiz.shuffle_options else 0,
-                    quiz.share_code,
-                    quiz.created_at.isoformat(),
-                    1 if quiz.is_active else 0
-                ))
+                await db.execute(self._QUIZ_UPSERT, self._quiz_row(quiz))
                 await db.commit()
                 return True
         except Exception as e:
             print(f"Quiz saqlashda xato: {e}")
             return False
     
+    async def save_quizzes(self, quizzes: list[Quiz]) -> bool:
+        """Bir nechta quizni bitta tranzaksiyada saqlash (import uchun)"""
+        if not quizzes:
+            return True
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                await db.executemany(self._QUIZ_UPSERT, [self._quiz_row(quiz) for quiz in quizzes])
+                await db.commit()
+                return True
+        except Exception as e:
+            print(f"Quizlarni saqlashda xato: {e}")
+            return False
+    
+    _QUIZ_UPSERT = """
+        INSERT OR REPLACE INTO quizzes 
+        (id, title, creator_id, questions, time_per_question, 
+         shuffle_options, share_code, created_at, is_active)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    @staticmethod
+    def _quiz_row(quiz: Quiz) -> tuple:
+        """Quiz -> quizzes jadvali qatori"""
+        questions_json = json.dumps([
+            {
+                "id": q.id,
+                "text": q.text,
+                "options": q.options,
+                "correct_index": q.correct_index,
+                "original_options": q.original_options
+            }
+            for q in quiz.questions
+        ])
+        return (
+            quiz.id,
+            quiz.title,
+            quiz.creator_id,
+            questions_json,
+            quiz.time_per_question,
+            1 if quiz.shuffle_options else 0,
+            quiz.share_code,
+            quiz.created_at.isoformat(),
+            1 if quiz.is_active else 0
+        )
+    
     async def get_quiz(self, quiz_id: str) -> Optional[Quiz]:
         """Quiz olish ID bo'yicha"""
         async with aiosqlite.connect(self.db_path) as db:
@@ -171,16 +216,26 @@ class Database:
     def _row_to_quiz(self, row) -> Quiz:
         """Database qatorini Quiz obyektiga aylantirish"""
         questions_data = json.loads(row["questions"])
-        questions = [
-            Question(
+        # JSON har bir variant uchun yangi str yaratadi - teng matnlar pool orqali
+        # bitta nusxaga keltiriladi (shu quiz ichida va keshdagi boshqa quizlar bilan)
+        seen = {}
+        questions = []
+        for q in questions_data:
+            options = text_pool.intern_all(q["options"], seen)
+            original = q.get("original_options")
+            if not original or original == q["options"]:
+                original = options
+            else:
+                # Boshqa tartibdagi o'sha variantlar - pool'dan qayta o'tkazilsa takror hisoblanadi
+                same = dict(zip(options, options))
+                original = [same.get(option, option) for option in original]
+            questions.append(Question(
                 id=q["id"],
-                text=q["text"],
-                options=q["options"],
+                text=text_pool.intern(q["text"], seen),
+                options=options,
                 correct_index=q["correct_index"],
-                original_options=q.get("original_options", q["options"])
-            )
-            for q in questions_data
-        ]
+                original_options=original
+            ))
         
         return Quiz(
             id=row["id"],
@@ -225,6 +280,78 @@ class Database:
             print(f"Natija saqlashda xato: {e}")
             return False
     
+    async def save_group_results(self, results: list[QuizResult]) -> bool:
+        """
+        Guruh testi natijalarini bitta tranzaksiyada saqlash.
+        Statistika o'qib-yozilmaydi - delta'lar UPSERT orqali qo'shiladi.
+        """
+        if not results:
+            return True
+        now = datetime.now().isoformat()
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                await db.executemany("""
+                    INSERT OR REPLACE INTO results
+                    (id, quiz_id, user_id, username, total_questions,
+                     correct_answers, wrong_answers, answers, started_at,
+                     finished_at, is_completed)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, [(
+                    result.id,
+                    result.quiz_id,
+                    result.user_id,
+                    result.username,
+                    result.total_questions,
+                    result.correct_answers,
+                    json.dumps(result.wrong_answers),
+                    json.dumps(result.answers),
+                    result.started_at.isoformat(),
+                    result.finished_at.isoformat() if result.finished_at else None,
+                    1 if result.is_completed else 0
+                ) for result in results])
+                
+                # Faqat tugallangan testlar statistikaga qo'shiladi (shaxsiy test bilan bir xil)
+                deltas = []
+                for result in results:
+                    completed = result.is_completed
+                    questions = result.total_questions if completed else 0
+                    correct = result.correct_answers if completed else 0
+                    deltas.append((
+                        result.user_id,
+                        result.username,
+                        1 if completed else 0,
+                        questions,
+                        correct,
+                        result.score_percent if completed else 0.0,
+                        round(correct / questions * 100, 1) if questions else 0.0,
+                        now
+                    ))
+                
+                await db.executemany("""
+                    INSERT INTO user_statistics
+                    (user_id, username, total_quizzes_taken, total_questions_answered,
+                     total_correct_answers, quizzes_created, best_score, average_score, last_activity)
+                    VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?)
+                    ON CONFLICT(user_id) DO UPDATE SET
+                        username = excluded.username,
+                        total_quizzes_taken = total_quizzes_taken + excluded.total_quizzes_taken,
+                        total_questions_answered = total_questions_answered + excluded.total_questions_answered,
+                        total_correct_answers = total_correct_answers + excluded.total_correct_answers,
+                        best_score = MAX(best_score, excluded.best_score),
+                        average_score = CASE
+                            WHEN total_questions_answered + excluded.total_questions_answered > 0
+                            THEN ROUND((total_correct_answers + excluded.total_correct_answers) * 100.0
+                                       / (total_questions_answered + excluded.total_questions_answered), 1)
+                            ELSE average_score
+                        END,
+                        last_activity = excluded.last_activity
+                """, deltas)
+                await db.commit()
+                return True
+        except Exception as e:
+            print(f"Guruh natijalarini saqlashda xato: {e}")
+            return False
+    
     async def get_user_results(self, user_id: int) -> list[QuizResult]:
         """Foydalanuvchi natijalarini olish"""
         results = []
@@ -267,12 +394,73 @@ class Database:
             is_completed=bool(row["is_completed"])
         )
     
+    # ==================== SESSION METHODS ====================
+    
+    async def save_session_snapshots(self, upserts: list[tuple[str, int, str]],
+                                     deletes: list[tuple[str, int]]) -> None:
+        """Sessiya snapshot'larini bitta tranzaksiyada yozish va o'chirish"""
+        now = datetime.now().isoformat()
+        async with aiosqlite.connect(self.db_path) as db:
+            if upserts:
+                await db.executemany("""
+                    INSERT OR REPLACE INTO quiz_sessions (kind, owner_id, snapshot, updated_at)
+                    VALUES (?, ?, ?, ?)
+                """, [(kind, owner_id, snapshot, now) for kind, owner_id, snapshot in upserts])
+            if deletes:
+                await db.executemany(
+                    "DELETE FROM quiz_sessions WHERE kind = ? AND owner_id = ?", deletes
+                )
+            await db.commit()
+    
+    async def get_session_snapshots(self) -> list[tuple[str, int, str]]:
+        """Saqlangan sessiya snapshot'larini olish"""
+        async with aiosqlite.connect(self.db_path) as db:
+            async with db.execute("SELECT kind, owner_id, snapshot FROM quiz_sessions") as cursor:
+                return [tuple(row) for row in await cursor.fetchall()]
+    
+    # ==================== FSM METHODS ====================
+    
+    async def get_fsm_record(self, key: str) -> Optional[tuple[Optional[str], str, float]]:
+        """FSM state'ini olish: (state, data_json, updated_at)"""
+        async with aiosqlite.connect(self.db_path) as db:
+            async with db.execute(
+                "SELECT state, data, updated_at FROM fsm_states WHERE key = ?", (key,)
+            ) as cursor:
+                row = await cursor.fetchone()
+                return tuple(row) if row else None
+    
+    async def save_fsm_records(self, upserts: list[tuple[str, Optional[str], str, float]],
+                               deletes: list[str], expire_before: Optional[float] = None) -> int:
+        """
+        FSM state'larini bitta tranzaksiyada yozish va o'chirish.
+        expire_before berilsa, undan eski state'lar ham o'chiriladi.
+        Qaytaradi: muddati o'tgani uchun o'chirilganlar soni
+        """
+        expired = 0
+        async with aiosqlite.connect(self.db_path) as db:
+            if upserts:
+                await db.executemany("""
+                    INSERT OR REPLACE INTO fsm_states (key, state, data, updated_at)
+                    VALUES (?, ?, ?, ?)
+                """, upserts)
+            if deletes:
+                await db.executemany(
+                    "DELETE FROM fsm_states WHERE key = ?", [(key,) for key in deletes]
+                )
+            if expire_before is not None:
+                cursor = await db.execute(
+                    "DELETE FROM fsm_states WHERE updated_at < ?", (expire_before,)
+                )
+                expired = cursor.rowcount
+            await db.commit()
+        return expired
+    
     # ==================== STATISTICS METHODS ====================
     
     async def update_user_statistics(self, user_id: int, username: str, 
                                       result: QuizResult = None,
-                                      quiz_created: bool = False) -> None:
-        """Foydalanuvchi statistikasini yangilash"""
+                                      quizzes_created: int = 0) -> None:
+        """Foydalanuvchi statistikasini yangilash (quizzes_created - yaratilgan testlar soni)"""
         async with aiosqlite.connect(self.db_path) as db:
             # Mavjud statistikani olish yoki yangi yaratish
             db.row_factory = aiosqlite.Row
@@ -314,8 +502,7 @@ class Database:
                         (stats.total_correct_answers / stats.total_questions_answered) * 100, 1
                     )
             
-            if quiz_created:
-                stats.quizzes_created += 1
+            stats.quizzes_created += quizzes_created
             
             # Saqlash
             await db.execute("""
@@ -0,0 +1,219 @@
+"""
+FSM Storage moduli
+aiogram state'larini SQLite'da saqlash (xotirada LRU kesh bilan)
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, StateType, StorageKey
+
+from .db import Database, get_db
+
+logger = logging.getLogger(__name__)
+
+
+class FSMRecord:
+    """Keshdagi bitta state yozuvi"""
+
+    __slots__ = ("state", "data", "updated_at")
+
+    def __init__(self, state: Optional[str] = None, data: Optional[Dict[str, Any]] = None,
+                 updated_at: float = 0.0):
+        self.state = state
+        self.data = data if data is not None else {}
+        self.updated_at = updated_at
+
+    @property
+    def is_empty(self) -> bool:
+        return self.state is None and not self.data
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    aiogram FSM storage: SQLite + xotiradagi LRU kesh.
+
+    - O'qish keshdan, kesh bo'lmasa bazadan (bir marta) olinadi
+    - Yozish darhol keshga tushadi, bazaga esa keyinroq (write-behind)
+      flush_interval oralig'ida bitta tranzaksiyada yoziladi
+    - state_ttl davomida o'zgarmagan state'lar tashlab ketilgan deb o'chiriladi
+    - Kesh hajmi cache_size bilan cheklanadi, eski yozuvlar bazada qoladi
+    """
+
+    def __init__(self, db: Optional[Database] = None, cache_size: int = 1000,
+                 state_ttl: float = 86400, flush_interval: float = 1.0):
+        self._db = db
+        self.cache_size = cache_size
+        self.state_ttl = state_ttl
+        self.flush_interval = flush_interval
+        self.key_builder = DefaultKeyBuilder(with_bot_id=True, with_destiny=True)
+
+        self._cache: OrderedDict[str, FSMRecord] = OrderedDict()
+        self._dirty: set[str] = set()
+        self._unsaved: set[str] = set()  # JSON'ga aylanmagan yozuvlar - faqat keshda, chiqarilmaydi
+        self._task: Optional[asyncio.Task] = None
+        self._last_cleanup = 0.0
+
+        # Hisoblagichlar
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0, "expired": 0,
+                      "flushes": 0, "written": 0, "deleted": 0, "unserializable": 0}
+
+    # ==================== BaseStorage API ====================
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        record = await self._get_record(key)
+        record.state = state.state if isinstance(state, State) else state
+        self._touch(key, record)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        return (await self._get_record(key)).state
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        record = await self._get_record(key)
+        record.data = data.copy()
+        self._touch(key, record)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        return (await self._get_record(key)).data.copy()
+
+    async def close(self) -> None:
+        """Flush siklini to'xtatish va qolgan o'zgarishlarni yozish"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    # ==================== PUBLIC API ====================
+
+    @property
+    def cached_count(self) -> int:
+        """Keshdagi yozuvlar soni"""
+        return len(self._cache)
+
+    async def flush(self) -> None:
+        """O'zgargan state'larni bazaga yozish"""
+        now = time.time()
+        cleanup = now - self._last_cleanup >= min(self.state_ttl, 3600)
+        if not self._dirty and not cleanup:
+            return
+
+        dirty, self._dirty = self._dirty, set()
+        upserts: list[tuple[str, Optional[str], str, float]] = []
+        deletes: list[str] = []
+
+        try:
+            for db_key in dirty:
+                record = self._cache.get(db_key)
+                if record is None or record.is_empty:
+                    self._unsaved.discard(db_key)
+                    deletes.append(db_key)
+                    continue
+                try:
+                    data = json.dumps(record.data, ensure_ascii=False)
+                except (TypeError, ValueError) as e:
+                    # Qayta urinish yordam bermaydi. Yozuv keshda qoladi (_evict uni chiqarmaydi),
+                    # aks holda keyingi o'qish bazadagi eski qiymatni qaytarardi
+                    self._unsaved.add(db_key)
+                    self.stats["unserializable"] += 1
+                    logger.error(f"FSM state'i JSON'ga aylanmadi, faqat keshda qoladi ({db_key}): {e}")
+                    continue
+                self._unsaved.discard(db_key)
+                upserts.append((db_key, record.state, data, record.updated_at))
+
+            db = await self._get_db()
+            expired = await db.save_fsm_records(
+                upserts, deletes, expire_before=now - self.state_ttl if cleanup else None
+            )
+        except Exception as e:
+            # Keyingi urinishda qayta yozish
+            self._dirty |= dirty
+            logger.warning(f"FSM state'larini saqlashda xato: {e}")
+            return
+
+        if cleanup:
+            self._last_cleanup = now
+            self.stats["expired"] += expired
+        self.stats["flushes"] += 1
+        self.stats["written"] += len(upserts)
+        self.stats["deleted"] += len(deletes)
+        self._evict()
+
+    # ==================== ICHKI METODLAR ====================
+
+    async def _get_db(self) -> Database:
+        if self._db is None:
+            self._db = await get_db()
+        return self._db
+
+    async def _get_record(self, key: StorageKey) -> FSMRecord:
+        db_key = self.key_builder.build(key)
+        record = self._cache.get(db_key)
+
+        if record is None:
+            self.stats["misses"] += 1
+            record = await self._load(db_key)
+            # Yuklash paytida boshqa so'rov yozgan bo'lishi mumkin - keshdagisi ustun
+            record = self._cache.setdefault(db_key, record)
+        else:
+            self.stats["hits"] += 1
+
+        self._cache.move_to_end(db_key)
+
+        # Tashlab ketilgan state
+        if not record.is_empty and time.time() - record.updated_at > self.state_ttl:
+            self.stats["expired"] += 1
+            record.state = None
+            record.data = {}
+            self._dirty.add(db_key)
+            self._ensure_running()
+
+        self._evict()
+        return record
+
+    async def _load(self, db_key: str) -> FSMRecord:
+        db = await self._get_db()
+        row = await db.get_fsm_record(db_key)
+        if row is None:
+            return FSMRecord()
+        state, data, updated_at = row
+        try:
+            return FSMRecord(state, json.loads(data), updated_at)
+        except ValueError:
+            self._dirty.add(db_key)  # Buzilgan yozuv o'chiriladi
+            return FSMRecord()
+
+    def _touch(self, key: StorageKey, record: FSMRecord) -> None:
+        db_key = self.key_builder.build(key)
+        record.updated_at = time.time()
+        self._cache[db_key] = record
+        self._cache.move_to_end(db_key)
+        self._dirty.add(db_key)
+        self._ensure_running()
+
+    def _evict(self) -> None:
+        """Kesh hajmini cheklash (faqat bazaga yozilgan yozuvlar chiqariladi)"""
+        if len(self._cache) <= self.cache_size:
+            return
+        for db_key in list(self._cache):
+            if len(self._cache) <= self.cache_size:
+                break
+            if db_key not in self._dirty and db_key not in self._unsaved:
+                del self._cache[db_key]
+                self.stats["evicted"] += 1
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while self._dirty:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
@@ -3,18 +3,40 @@ Group handler
 Guruhda test o'tkazish
 """
 import asyncio
+import logging
+import math
+import time
 from aiogram import Router, F, Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
 from aiogram.types import Message, CallbackQuery, ChatMemberUpdated
 from aiogram.filters import ChatMemberUpdatedFilter, IS_MEMBER, IS_NOT_MEMBER, Command
-from aiogram.exceptions import TelegramRetryAfter
 
 from bot.keyboards import QuizKeyboard, SettingsKeyboard
 from bot.services.quiz_manager import quiz_manager
+from bot.services.edit_coalescer import edit_coalescer
+from bot.services.countdown_policy import countdown_policy
 from bot.services import StatisticsService
 from bot.database import get_db
+from bot.utils import make_message, format_option_histogram, spawn
 
 router = Router(name="group")
 
+LIVE_TOP_SIZE = 5  # Savollar orasida ko'rsatiladigan yetakchilar soni
+LEADERBOARD_LIMIT = 100  # Yakuniy natijalarda ko'rsatiladiganlar (xabar chegarasi bilan)
+
+
+async def is_chat_admin(bot: Bot, chat_id: int, user_id: int) -> bool:
+    """
+    Foydalanuvchi guruh admini ekanligi. Tarmoq xatolari RetryMiddleware'da qayta
+    uriniladi; Telegram rad etsa (bot guruhda emas va h.k.) - admin emas deb olinadi.
+    """
+    try:
+        member = await bot.get_chat_member(chat_id, user_id)
+    except (TelegramBadRequest, TelegramForbiddenError) as e:
+        logging.warning(f"Guruh {chat_id}: {user_id} admin ekanligini tekshirib bo'lmadi: {e}")
+        return False
+    return member.status in ["creator", "administrator"]
+
 
 @router.callback_query(F.data.startswith("group_quiz:"))
 async def start_group_quiz_selection(callback: CallbackQuery, bot: Bot):
@@ -119,6 +141,7 @@ async def start_quiz_in_group(message: Message, bot: Bot):
             parse_mode="HTML"
         )
         
+        session.schedule_next(10)
         await asyncio.sleep(10)
         await show_group_question(message, session)
     else:
@@ -147,36 +170,32 @@ async def group_ready_countdown(message: Message, session, seconds: int):
         
         # Har 5 soniyada yangilash
         if remaining % 5 == 0 or remaining <= 5:
-            try:
-                # Session'dagi ishtirokchilar sonini olish
-                ready_count = len(current_session.participants)
-                time_emoji = "🔴" if remaining <= 5 else "⏳"
-                
-                await message.edit_text(
-                    f"🎯 <b>{session.quiz.title}</b>\n\n"
-                    f"👥 Guruh testi tayyorlanmoqda!\n"
-                    f"❓ Savollar soni: {session.quiz.total_questions}\n"
-                    f"⏱ Vaqt: {session.quiz.time_display}\n\n"
-                    f"{time_emoji} <b>Test {remaining} soniyadan keyin boshlanadi...</b>\n"
-                    f"✅ Tayyor: {ready_count} kishi",
-                    parse_mode="HTML",
-                    reply_markup=QuizKeyboard.group_ready_button(str(session.chat_id))
-                )
-            except Exception:
-                pass
+            # Session'dagi ishtirokchilar sonini olish
+            ready_count = len(current_session.participants)
+            time_emoji = "🔴" if remaining <= 5 else "⏳"
+            
+            await edit_coalescer.edit(
+                message,
+                f"🎯 <b>{session.quiz.title}</b>\n\n"
+                f"👥 Guruh testi tayyorlanmoqda!\n"
+                f"❓ Savollar soni: {session.total_questions}\n"
+                f"⏱ Vaqt: {session.quiz.time_display}\n\n"
+                f"{time_emoji} <b>Test {remaining} soniyadan keyin boshlanadi...</b>\n"
+                f"✅ Tayyor: {ready_count} kishi",
+                parse_mode="HTML",
+                reply_markup=QuizKeyboard.group_ready_button(str(session.chat_id))
+            )
     
     # Test boshlash
     current_session = quiz_manager.get_group_session(session.chat_id)
     if current_session:
         ready_count = len(current_session.participants)
-        try:
-            await message.edit_text(
-                f"🎯 <b>Test boshlanmoqda!</b>\n\n"
-                f"✅ Ishtirokchilar: {ready_count} kishi",
-                parse_mode="HTML"
-            )
-        except Exception:
-            pass
+        await edit_coalescer.edit_now(
+            message,
+            f"🎯 <b>Test boshlanmoqda!</b>\n\n"
+            f"✅ Ishtirokchilar: {ready_count} kishi",
+            parse_mode="HTML"
+        )
     
     await asyncio.sleep(2)
     await show_group_question(message, session)
@@ -211,7 +230,7 @@ async def show_group_question(message: Message, session):
         return
     
     # Savol matni
-    progress = f"{session.current_index + 1}/{len(session.quiz.questions)}"
+    progress = f"{session.current_index + 1}/{session.total_questions}"
     time_limit = session.quiz.time_per_question
     
     question_text = (
@@ -233,9 +252,13 @@ async def show_group_question(message: Message, session):
         )
     )
     
+    # Savol xabari va vaqt tugash paytini saqlash (restart'dan keyin tiklash uchun)
+    session.set_question_message(question_msg.message_id, time_limit)
+    
     # Timer boshlash
-    asyncio.create_task(
-        group_countdown_timer(question_msg, session, session.current_index, time_limit)
+    spawn(
+        group_countdown_timer(question_msg, session, session.current_index, time_limit),
+        f"Guruh {session.chat_id}: taymer"
     )
 
 
@@ -248,7 +271,7 @@ async def update_group_question(question_msg: Message, session):
         return
     
     # Savol matni
-    progress = f"{session.current_index + 1}/{len(session.quiz.questions)}"
+    progress = f"{session.current_index + 1}/{session.total_questions}"
     time_limit = session.quiz.time_per_question
     
     question_text = (
@@ -260,22 +283,25 @@ async def update_group_question(question_msg: Message, session):
     )
     
     # Xabarni edit qilish
-    try:
-        await question_msg.edit_text(
-            question_text,
-            parse_mode="HTML",
-            reply_markup=QuizKeyboard.group_question_options(
-                question, 
-                session.current_index,
-                str(session.chat_id)
-            )
-        )
-    except Exception:
-        pass
+    await edit_coalescer.edit_now(
+        question_msg,
+        question_text,
+        parse_mode="HTML",
+        reply_markup=QuizKeyboard.group_question_options(
+            question, 
+            session.current_index,
+            str(session.chat_id)
+        ),
+        final=False
+    )
+    
+    # Savol xabari va vaqt tugash paytini saqlash (restart'dan keyin tiklash uchun)
+    session.set_question_message(question_msg.message_id, time_limit)
     
     # Timer boshlash
-    asyncio.create_task(
-        group_countdown_timer(question_msg, session, session.current_index, time_limit)
+    spawn(
+        group_countdown_timer(question_msg, session, session.current_index, time_limit),
+        f"Guruh {session.chat_id}: taymer"
     )
 
 
@@ -291,85 +317,114 @@ async def group_countdown_timer(question_msg: Message, session, question_index:
             return
         
         # Faqat muhim paytlarda yangilash (flood control)
-        # 20, 15, 10, 5 soniya va oxirgi 5 soniyada har soniyada
-        should_update = (
-            time_left in [20, 15, 10, 5] or  # Muhim nuqtalar
-            time_left <= 5  # Oxirgi 5 soniya
-        )
-        
-        if should_update:
+        # Odatda 20, 15, 10, 5 soniya va oxirgi 5 soniyada; yuklama oshsa kamroq
+        if countdown_policy.should_update(question_msg.chat.type, time_left):
             question = session.current_question
             if question:
-                try:
-                    progress = f"{question_index + 1}/{len(session.quiz.questions)}"
-                    answered = len(session.answered_current)
-                    time_emoji = "🔴" if time_left <= 5 else "⏱"
-                    
-                    question_text = (
-                        f"<b>{question_index + 1}-savol</b> ({progress})\n\n"
-                        f"{question.text}\n\n"
-                        f"{time_emoji} <b>Vaqt: {time_left} soniya</b>\n"
-                        f"👥 Javob berganlar: {answered}\n\n"
-                        f"<i>Admin: testni to'xtatish uchun /stop</i>"
-                    )
-                    
-                    await question_msg.edit_text(
-                        question_text,
-                        parse_mode="HTML",
-                        reply_markup=QuizKeyboard.group_question_options(
-                            question, question_index, str(session.chat_id)
-                        )
+                progress = f"{question_index + 1}/{session.total_questions}"
+                answered = len(session.answered_current)
+                time_emoji = "🔴" if time_left <= 5 else "⏱"
+                histogram = ""
+                if answered:
+                    histogram = f"\n<code>{format_option_histogram(session.option_histogram(question_index))}</code>\n"
+                
+                question_text = (
+                    f"<b>{question_index + 1}-savol</b> ({progress})\n\n"
+                    f"{question.text}\n\n"
+                    f"{time_emoji} <b>Vaqt: {time_left} soniya</b>\n"
+                    f"👥 Javob berganlar: {answered}\n"
+                    f"{histogram}\n"
+                    f"<i>Admin: testni to'xtatish uchun /stop</i>"
+                )
+                
+                # Coalescer orqali - o'zgarmagan matn qayta yuborilmaydi
+                await edit_coalescer.edit(
+                    question_msg,
+                    question_text,
+                    parse_mode="HTML",
+                    reply_markup=QuizKeyboard.group_question_options(
+                        question, question_index, str(session.chat_id)
                     )
-                    
-                except Exception:
-                    pass  # Flood control xatosi bo'lsa, o'tkazib yuborish
+                )
     
     # Vaqt tugadi - savol va to'g'ri javobni ko'rsatish
     current_session = quiz_manager.get_group_session(session.chat_id)
     if current_session and current_session.current_index == question_index:
         question = session.current_question
         if question:
-            progress = f"{question_index + 1}/{len(session.quiz.questions)}"
+            progress = f"{question_index + 1}/{session.total_questions}"
             
             # To'g'ri javobni olish
             correct_answer = question.correct_answer
             correct_letter = question.get_option_letter(question.correct_index)
             
+            histogram = format_option_histogram(session.option_histogram(question_index))
+            
             result_text = (
                 f"⏰ <b>Vaqt tugadi!</b>\n\n"
                 f"<b>{question_index + 1}-savol</b> ({progress})\n\n"
                 f"{question.text}\n\n"
-                f"✅ <b>To'g'ri javob: {correct_letter}) {correct_answer}</b>"
+                f"✅ <b>To'g'ri javob: {correct_letter}) {correct_answer}</b>\n\n"
+                f"📊 <b>Javoblar:</b>\n<code>{histogram}</code>"
             )
             
-            try:
-                await question_msg.edit_text(
-                    result_text,
-                    parse_mode="HTML"
-                )
-            except Exception:
-                pass
+            # Savollar orasida joriy yetakchilar
+            top = session.get_leaderboard(limit=LIVE_TOP_SIZE)
+            if top:
+                result_text += f"\n\n🏆 <b>Yetakchilar:</b>\n{StatisticsService.format_live_top(top)}"
+            
+            await edit_coalescer.edit_now(
+                question_msg,
+                result_text,
+                parse_mode="HTML"
+            )
         
         if current_session.next_question():
+            current_session.schedule_next(3)
             await asyncio.sleep(3)  # 3 soniya kutish (odamlar o'qishi uchun)
-            # Keyingi savolni YANGI xabar sifatida yuborish, flood control xatolarini hisobga olib
+            # Keyingi savolni YANGI xabar sifatida yuborish.
+            # Flood control va tarmoq xatolari RetryMiddleware'da qayta uriniladi
             try:
                 await show_group_question(question_msg, current_session)
-            except TelegramRetryAfter as e:
-                # Telegram flood control: biroz kutib, yana urinib ko'rish
-                await asyncio.sleep(e.retry_after)
-                try:
-                    await show_group_question(question_msg, current_session)
-                except Exception:
-                    pass
-            except Exception:
-                # Har qanday boshqa xatoni e'tiborsiz qoldirish (testni to'xtatmaslik uchun)
-                pass
+            except Exception as e:
+                logging.warning(f"Guruh {session.chat_id}: keyingi savolni yuborib bo'lmadi: {e}")
         else:
             await asyncio.sleep(2)
             await finish_group_quiz(question_msg, current_session)
 
 
+async def resume_group_sessions(bot: Bot) -> None:
+    """Restart'dan keyin tiklangan guruh sessiyalarini davom ettirish"""
+    for chat_id, session in list(quiz_manager.group_sessions.items()):
+        # Admin rejim tanlashi yoki oraliq/son kiritishi kutilmoqda
+        if session.waiting_mode or (not session.is_started and session.deadline is None):
+            continue
+        
+        message = make_message(bot, chat_id, session.message_id, chat_type="supergroup")
+        
+        if session.is_finished:
+            spawn(finish_group_quiz(message, session), f"Guruh {session.chat_id}: testni yakunlash")
+        elif session.message_id is not None:
+            # Taymerni saqlangan muddatdan qayta ishga tushirish
+            time_left = max(0, math.ceil(session.deadline - time.time())) if session.deadline else 0
+            spawn(
+                group_countdown_timer(message, session, session.current_index, time_left),
+                f"Guruh {session.chat_id}: taymer"
+            )
+        else:
+            # Test boshlanishi yoki keyingi savol kutilayotgan edi
+            delay = max(0.0, session.deadline - time.time()) if session.deadline else 0.0
+            spawn(_show_group_question_later(message, session, delay),
+                   f"Guruh {session.chat_id}: savolni ko'rsatish")
+
+
+async def _show_group_question_later(message: Message, session, delay: float) -> None:
+    """Belgilangan vaqtdan keyin savolni ko'rsatish (sessiya hali faol bo'lsa)"""
+    await asyncio.sleep(delay)
+    if quiz_manager.get_group_session(session.chat_id) is session:
+        await show_group_question(message, session)
+
+
 @router.callback_query(F.data.startswith("group_answer:"))
 async def process_group_answer(callback: CallbackQuery):
     """Guruhda javobni qabul qilish"""
@@ -423,11 +478,7 @@ async def next_group_question(callback: CallbackQuery, bot: Bot):
     is_group_admin = False
     
     if not is_creator:
-        try:
-            member = await bot.get_chat_member(chat_id, callback.from_user.id)
-            is_group_admin = member.status in ["creator", "administrator"]
-        except Exception:
-            pass
+        is_group_admin = await is_chat_admin(bot, chat_id, callback.from_user.id)
     
     if not is_creator and not is_group_admin:
         await callback.answer("⚠️ Faqat test boshlagan yoki guruh admini o'tkazishi mumkin", show_alert=True)
@@ -457,11 +508,7 @@ async def end_group_quiz(callback: CallbackQuery, bot: Bot):
     is_group_admin = False
     
     if not is_creator:
-        try:
-            member = await bot.get_chat_member(chat_id, callback.from_user.id)
-            is_group_admin = member.status in ["creator", "administrator"]
-        except Exception:
-            pass
+        is_group_admin = await is_chat_admin(bot, chat_id, callback.from_user.id)
     
     if not is_creator and not is_group_admin:
         await callback.answer("⚠️ Faqat admin tugatishi mumkin", show_alert=True)
@@ -488,17 +535,14 @@ async def stop_group_quiz(callback: CallbackQuery, bot: Bot):
     is_group_admin = False
     
     if not is_creator:
-        try:
-            member = await bot.get_chat_member(chat_id, callback.from_user.id)
-            is_group_admin = member.status in ["creator", "administrator"]
-        except Exception:
-            pass
+        is_group_admin = await is_chat_admin(bot, chat_id, callback.from_user.id)
     
     if not is_creator and not is_group_admin:
         await callback.answer("⚠️ Faqat admin testni to'xtata oladi", show_alert=True)
         return
     
-    await callback.message.edit_text(
+    await edit_coalescer.edit_now(
+        callback.message,
         "🛑 <b>Test admin tomonidan to'xtatildi!</b>",
         parse_mode="HTML"
     )
@@ -532,13 +576,7 @@ async def stop_group_quiz_command(message: Message, bot: Bot):
     
     # Faqat test boshlagan yoki admin to'xtata oladi
     is_creator = message.from_user.id == session.creator_id
-    is_admin = False
-    
-    try:
-        member = await bot.get_chat_member(message.chat.id, message.from_user.id)
-        is_admin = member.status in ["creator", "administrator"]
-    except Exception:
-        pass
+    is_admin = await is_chat_admin(bot, message.chat.id, message.from_user.id)
     
     if not is_creator and not is_admin:
         await message.answer(
@@ -558,16 +596,22 @@ async def stop_group_quiz_command(message: Message, bot: Bot):
 
 async def finish_group_quiz(message: Message, session):
     """Guruh testini tugatish"""
-    quiz_manager.end_group_session(session.chat_id)
+    # Sessiyani faqat birinchi chaqiruv yakunlaydi (timer va /stop bir vaqtda kelishi mumkin)
+    is_owner = quiz_manager.end_group_session(session.chat_id) is session
     
-    # Natijalar
-    leaderboard = session.get_leaderboard()
+    # Natijalar (xabarga sig'adigan eng yaxshilar)
+    leaderboard = session.get_leaderboard(limit=LEADERBOARD_LIMIT)
     
     result_text = StatisticsService.format_leaderboard(
         leaderboard,
-        session.quiz.title
+        session.quiz.title,
+        total_participants=len(session.participants)
     )
     
+    # Natijalarni fonda saqlash - leaderboard xabari kutib qolmaydi
+    if is_owner:
+        spawn(save_group_results(session), f"Guruh {session.chat_id}: natijalarni saqlash")
+    
     await message.answer(
         result_text,
         parse_mode="HTML",
@@ -575,19 +619,25 @@ async def finish_group_quiz(message: Message, session):
     )
 
 
+async def save_group_results(session) -> None:
+    """Guruh ishtirokchilari natijalari va statistikasini bitta tranzaksiyada yozish"""
+    # Katta guruhlarda natijalarni yig'ish event loop'ni band qilmasligi uchun alohida thread'da
+    results = await asyncio.to_thread(session.get_results)
+    if not results:
+        return
+    db = await get_db()
+    if not await db.save_group_results(results):
+        logging.warning(f"Guruh {session.chat_id}: {len(results)} ta natija saqlanmadi")
+
+
 @router.callback_query(F.data.startswith("group_restart:"))
 async def restart_group_quiz(callback: CallbackQuery, bot: Bot):
     """Guruh testini qayta boshlash"""
     quiz_id = callback.data.split(":")[1]
     
     # Admin tekshirish - guruh admini
-    try:
-        member = await bot.get_chat_member(callback.message.chat.id, callback.from_user.id)
-        if member.status not in ["creator", "administrator"]:
-            await callback.answer("⚠️ Faqat admin qayta boshlashi mumkin", show_alert=True)
-            return
-    except Exception:
-        await callback.answer("❌ Xatolik yuz berdi", show_alert=True)
+    if not await is_chat_admin(bot, callback.message.chat.id, callback.from_user.id):
+        await callback.answer("⚠️ Faqat admin qayta boshlashi mumkin", show_alert=True)
         return
     
     db = await get_db()
@@ -625,6 +675,7 @@ async def restart_group_quiz(callback: CallbackQuery, bot: Bot):
         )
 
         await callback.answer()
+        session.schedule_next(10)
         await asyncio.sleep(10)
         await show_group_question(callback.message, session)
     else:
@@ -80,6 +80,7 @@ async def start_group_quiz(message: Message, session, delay: int = 10):
     except TelegramBadRequest:
         pass
 
+    session.schedule_next(delay)
     await asyncio.sleep(delay)
     await show_group_question(message, session)
 
@@ -106,7 +107,7 @@ async def group_quiz_mode(callback: CallbackQuery, state: FSMContext, bot: Bot):
         await callback.message.edit_text(
             f"🎯 <b>{session.quiz.title}</b>\n\n"
             f"📚 To‘liq test tanlandi\n"
-            f"Savollar soni: {len(session.quiz.questions)}",
+            f"Savollar soni: {session.total_questions}",
             parse_mode="HTML"
         )
         await start_group_quiz(callback.message, session)
@@ -114,7 +115,7 @@ async def group_quiz_mode(callback: CallbackQuery, state: FSMContext, bot: Bot):
 
     # RANGE / RANDOM → Guruh chat'ida kiritiladi
     # Session'da waiting_mode'ni o'rnatish
-    session.waiting_mode = mode
+    session.set_waiting_mode(mode)
 
     if mode == "range":
         await callback.answer("✏️ Iltimos, oraliqni kiriting")
@@ -164,9 +165,9 @@ async def process_group_input(message: Message, state: FSMContext, bot: Bot):
             )
 
         start, end = rng
-        if end > len(session.quiz.questions):
+        if end > session.total_available:
             return await message.answer(
-                f"❌ Testda {len(session.quiz.questions)} ta savol bor.\n"
+                f"❌ Testda {session.total_available} ta savol bor.\n"
                 "To‘g‘ri oraliq kiriting."
             )
 
@@ -182,7 +183,7 @@ async def process_group_input(message: Message, state: FSMContext, bot: Bot):
             f"Jami: {end - start + 1} ta savol",
             parse_mode="HTML"
         )
-        session.waiting_mode = None
+        session.set_waiting_mode(None)
         return await start_group_quiz(message, session)
 
     # RANDOM MODE
@@ -194,9 +195,9 @@ async def process_group_input(message: Message, state: FSMContext, bot: Bot):
                 parse_mode="HTML"
             )
 
-        if num > len(session.quiz.questions):
+        if num > session.total_available:
             return await message.answer(
-                f"❌ Testda {len(session.quiz.questions)} ta savol bor."
+                f"❌ Testda {session.total_available} ta savol bor."
             )
 
         session.settings = QuizSettings(
@@ -209,5 +210,5 @@ async def process_group_input(message: Message, state: FSMContext, bot: Bot):
             f"🎲 Tasodifiy test: {num} ta savol",
             parse_mode="HTML"
         )
-        session.waiting_mode = None
+        session.set_waiting_mode(None)
         await start_group_quiz(message, session)
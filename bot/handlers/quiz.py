@@ -4,6 +4,8 @@ Test jarayonini boshqarish
 """
 import asyncio
 import logging
+import math
+import time
 from aiogram import Router, F, Bot
 from aiogram.types import Message, CallbackQuery, InlineQuery, InlineQueryResultArticle, InputTextMessageContent
 from aiogram.fsm.context import FSMContext
@@ -13,8 +15,11 @@ from uuid import uuid4
 from bot.keyboards import MainMenuKeyboard, QuizKeyboard, SettingsKeyboard
 from bot.services import StatisticsService
 from bot.services.quiz_manager import quiz_manager
+from bot.services.edit_coalescer import edit_coalescer
+from bot.services.countdown_policy import countdown_policy
 from bot.models import Quiz
 from bot.database import get_db
+from bot.utils import make_message, spawn
 
 router = Router(name="quiz")
 
@@ -83,12 +88,35 @@ async def show_question(message: Message, session, user_id: int):
         reply_markup=QuizKeyboard.question_options(question, session.current_index)
     )
     
+    # Savol xabari va vaqt tugash paytini saqlash (restart'dan keyin tiklash uchun)
+    session.set_question_message(sent_message.message_id, time_limit)
+    
     # Vaqt hisoblagichini boshlash
-    asyncio.create_task(
-        countdown_timer(sent_message, session, user_id, session.current_index, time_limit)
+    spawn(
+        countdown_timer(sent_message, session, user_id, session.current_index, time_limit),
+        f"Foydalanuvchi {user_id}: taymer"
     )
 
 
+async def resume_sessions(bot: Bot) -> None:
+    """Restart'dan keyin tiklangan shaxsiy sessiyalarni davom ettirish"""
+    for user_id, session in list(quiz_manager.active_sessions.items()):
+        message = make_message(bot, user_id, session.message_id)
+        
+        if session.is_finished:
+            spawn(finish_quiz(message, user_id), f"Foydalanuvchi {user_id}: testni yakunlash")
+        elif session.message_id is None:
+            # Savol hali yuborilmagan edi - qayta yuborish
+            spawn(show_question(message, session, user_id), f"Foydalanuvchi {user_id}: savolni yuborish")
+        elif session.deadline is not None:
+            # Taymerni saqlangan muddatdan qayta ishga tushirish
+            time_left = max(0, math.ceil(session.deadline - time.time()))
+            spawn(
+                countdown_timer(message, session, user_id, session.current_index, time_left),
+                f"Foydalanuvchi {user_id}: taymer"
+            )
+
+
 async def countdown_timer(message: Message, session, user_id: int, question_index: int, time_left: int):
     """Real-time countdown timer"""
     from bot.services.quiz_manager import quiz_manager
@@ -102,38 +130,34 @@ async def countdown_timer(message: Message, session, user_id: int, question_inde
         if not current_session or current_session.current_index != question_index:
             return  # Javob berilgan yoki test tugatilgan
         
-        # Har 5 soniyada yoki oxirgi 5 soniyada yangilash
-        if time_left <= 5 or time_left % 5 == 0:
+        # Yangilash chastotasi yuklamaga qarab tanlanadi (odatda har 5 soniyada va oxirgi 5 soniyada)
+        if countdown_policy.should_update(message.chat.type, time_left):
             question = session.current_question
             if question:
-                try:
-                    # Vaqt ko'rsatgichni yangilash
-                    time_emoji = "🔴" if time_left <= 5 else "⏱"
-                    question_text = (
-                        f"<b>{question_index + 1}-savol:</b> ({session.progress})\n\n"
-                        f"{question.text}\n\n"
-                        f"{time_emoji} <b>Vaqt: {time_left} soniya</b>"
-                    )
-                    await message.edit_text(
-                        question_text,
-                        parse_mode="HTML",
-                        reply_markup=QuizKeyboard.question_options(question, question_index)
-                    )
-                except Exception:
-                    pass  # Xabar o'chirilgan bo'lishi mumkin
+                # Vaqt ko'rsatgichni yangilash (coalescer orqali, takroriy edit'lar birlashtiriladi)
+                time_emoji = "🔴" if time_left <= 5 else "⏱"
+                question_text = (
+                    f"<b>{question_index + 1}-savol:</b> ({session.progress})\n\n"
+                    f"{question.text}\n\n"
+                    f"{time_emoji} <b>Vaqt: {time_left} soniya</b>"
+                )
+                await edit_coalescer.edit(
+                    message,
+                    question_text,
+                    parse_mode="HTML",
+                    reply_markup=QuizKeyboard.question_options(question, question_index)
+                )
     
     # Vaqt tugadi
     current_session = quiz_manager.get_session(user_id)
     if current_session and current_session.current_index == question_index:
         session.skip_question()
         
-        try:
-            await message.edit_text(
-                "⏰ <b>Vaqt tugadi!</b>\nSavol o'tkazib yuborildi.",
-                parse_mode="HTML"
-            )
-        except Exception:
-            pass
+        await edit_coalescer.edit_now(
+            message,
+            "⏰ <b>Vaqt tugadi!</b>\nSavol o'tkazib yuborildi.",
+            parse_mode="HTML"
+        )
         
         if not session.is_finished:
             await asyncio.sleep(1.5)
@@ -152,7 +176,8 @@ async def stop_quiz(callback: CallbackQuery, state: FSMContext):
         return
     
     # Testni tugatish
-    await callback.message.edit_text(
+    await edit_coalescer.edit_now(
+        callback.message,
         "🛑 <b>Test to'xtatildi!</b>",
         parse_mode="HTML"
     )
@@ -185,7 +210,7 @@ async def process_answer(callback: CallbackQuery, state: FSMContext):
     
     # Natija xabari
     question_number = question_index + 1
-    current_question = session.quiz.questions[question_index]
+    current_question = session.question_at(question_index)
     
     if is_correct:
         result_text = (
@@ -201,7 +226,8 @@ async def process_answer(callback: CallbackQuery, state: FSMContext):
             f"💡 To'g'ri javob: <i>{correct_answer}</i>"
         )
     
-    await callback.message.edit_text(
+    await edit_coalescer.edit_now(
+        callback.message,
         result_text,
         parse_mode="HTML"
     )
@@ -262,7 +288,8 @@ async def skip_current_question(callback: CallbackQuery):
     
     session.skip_question()
     
-    await callback.message.edit_text(
+    await edit_coalescer.edit_now(
+        callback.message,
         "⏭ Savol o'tkazib yuborildi.",
         parse_mode="HTML"
     )
@@ -40,7 +40,7 @@ async def load_quiz(quiz_id: str):
 async def start_quiz_message(message: Message, quiz, session, user_id: int, question_count: int | None = None):
     """Testni boshlash va birinchi savolni ko'rsatish"""
     try:
-        count = question_count if question_count else len(session.quiz.questions)
+        count = question_count if question_count else session.total_questions
 
         await message.answer(
             f"🎯 <b>{quiz.title}</b>\n\n"
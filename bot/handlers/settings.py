@@ -117,7 +117,7 @@ async def process_shuffle(callback: CallbackQuery, state: FSMContext):
         await db.update_user_statistics(
             user_id=callback.from_user.id,
             username=callback.from_user.username or callback.from_user.first_name,
-            quiz_created=True
+            quizzes_created=1
         )
     except Exception as e:
         await callback.answer(f"❌ Xatolik yuz berdi: {e}", show_alert=True)
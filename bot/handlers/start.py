@@ -2,7 +2,10 @@
 Start handler
 /start komandasi va asosiy menyu
 """
+import logging
+
 from aiogram import Router, F
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
 from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command, CommandStart
 from aiogram.fsm.context import FSMContext
@@ -59,7 +62,7 @@ async def cmd_start(message: Message, state: FSMContext):
                 await db.update_user_statistics(
                     user_id=message.from_user.id,
                     username=message.from_user.username or message.from_user.first_name,
-                    quiz_created=True
+                    quizzes_created=1
                 )
 
                 quiz = cloned_quiz
@@ -200,6 +203,8 @@ async def show_full_guide(callback: CallbackQuery):
         "   • To'g'ri javobni * yoki + bilan belgilang\n\n"
         "2️⃣ Faylni botga yuboring\n"
         "   • .docx formati bo'lishi kerak\n"
+        "   • Savollar banki .txt, .csv yoki .json faylda ham bo'lishi mumkin\n"
+        "   • Ko'p testni .zip arxivda birdan yuklash mumkin\n"
         "   • Bot avtomatik tekshiradi\n\n"
         "3️⃣ Sozlamalarni tanlang\n"
         "   • Test sarlavhasini kiriting\n"
@@ -222,8 +227,9 @@ async def back_to_main(callback: CallbackQuery, state: FSMContext):
     
     try:
         await callback.message.delete()
-    except Exception:
-        pass
+    except (TelegramBadRequest, TelegramForbiddenError) as e:
+        # Eski (48 soatdan oshgan) xabarni o'chirib bo'lmaydi - menyu baribir yuboriladi
+        logging.warning(f"Xabarni o'chirib bo'lmadi: {e}")
     
     await callback.message.answer(
         "🏠 <b>Bosh menyu</b>\n\n"
@@ -96,7 +96,7 @@ async def cmd_startquiz(message: Message, state: FSMContext):
         await db.update_user_statistics(
             user_id=message.from_user.id,
             username=message.from_user.username or message.from_user.first_name,
-            quiz_created=True
+            quizzes_created=1
         )
         
         quiz = cloned_quiz
@@ -1,6 +1,6 @@
 """
 Upload handler
-DOCX fayl yuklash va tekshirish
+Test fayli (.docx, .txt, .csv, .json) yoki ZIP arxiv yuklash va tekshirish
 """
 from aiogram import Router, F, Bot
 from aiogram.types import Message, CallbackQuery
@@ -8,13 +8,40 @@ from aiogram.fsm.context import FSMContext
 
 from bot.states import QuizStates
 from bot.keyboards import MainMenuKeyboard
-from bot.services import DocxParser
+from bot.config import config
+from bot.services.parse_pool import parse_pool, ParsePoolBusy
+from bot.services.edit_coalescer import edit_coalescer
+from bot.services.importers import file_format
+from bot.services.batch_import import import_archive, ArchiveError, BatchReport
+from bot.utils import download_to_spool, FileTooLarge, escape_html
 from bot.models import Quiz
 from bot.database import get_db
 
 router = Router(name="upload")
 
 
+# Arxiv hisobotidagi fayllar ro'yxati shu uzunlikdan oshmaydi (Telegram chegarasi 4096)
+REPORT_DETAILS_LIMIT = 3000
+
+
+def too_large_text(max_size: int = None) -> str:
+    """Fayl hajmi chegarasi haqida xabar"""
+    return (
+        "❌ <b>Fayl juda katta!</b>\n\n"
+        f"Maksimal fayl hajmi: {(max_size or config.parsing.max_file_size) // (1024 * 1024)} MB"
+    )
+
+
+def progress_text(fraction: float, questions: int) -> str:
+    """Parse jarayoni haqida xabar"""
+    filled = int(fraction * 10)
+    return (
+        "⏳ Fayl tekshirilmoqda...\n\n"
+        f"{'▓' * filled}{'░' * (10 - filled)} {int(fraction * 100)}%\n"
+        f"📊 Topilgan savollar: {questions}"
+    )
+
+
 @router.message(F.text == "📄 Test yuklash")
 async def start_upload(message: Message, state: FSMContext):
     """Test yuklashni boshlash"""
@@ -22,7 +49,9 @@ async def start_upload(message: Message, state: FSMContext):
     
     await message.answer(
         "📄 <b>Test yuklash</b>\n\n"
-        "Iltimos, test savollari yozilgan <b>.docx</b> formatdagi faylni yuboring.\n\n"
+        "Iltimos, test savollari yozilgan <b>.docx</b> formatdagi faylni yuboring.\n"
+        "Savollar banki <b>.txt</b>, <b>.csv</b> yoki <b>.json</b> faylda bo'lsa, uni ham yuborishingiz mumkin.\n"
+        "Ko'p testni birdan yuklash uchun ularni <b>.zip</b> arxivda yuboring.\n\n"
         "💡 <i>Fayl formati haqida ma'lumot uchun \"❓ Yordam\" tugmasini bosing.</i>",
         parse_mode="HTML",
         reply_markup=MainMenuKeyboard.cancel_menu()
@@ -45,42 +74,56 @@ async def upload_new_callback(callback: CallbackQuery, state: FSMContext):
 
 @router.message(QuizStates.waiting_for_docx, F.document)
 async def process_docx(message: Message, state: FSMContext, bot: Bot):
-    """DOCX faylni qabul qilish va tekshirish"""
+    """Test faylini qabul qilish va tekshirish"""
     document = message.document
     
+    # Ko'p test bitta arxivda
+    if (document.file_name or "").lower().endswith(".zip"):
+        await process_archive(message, state, bot)
+        return
+    
     # Fayl turini tekshirish
-    if not document.file_name.endswith('.docx'):
+    upload_format = file_format(document.file_name)
+    if upload_format is None:
         await message.answer(
             "❌ <b>Noto'g'ri fayl formati!</b>\n\n"
-            "Faqat <b>.docx</b> (Word) formatdagi fayllar qabul qilinadi.\n"
+            "<b>.docx</b> (Word), <b>.txt</b>, <b>.csv</b> yoki <b>.json</b> formatdagi fayllar "
+            "(ko'p test uchun <b>.zip</b> arxiv) qabul qilinadi.\n"
             "Iltimos, to'g'ri formatdagi faylni yuboring.",
             parse_mode="HTML"
         )
         return
     
-    # Fayl hajmini tekshirish (10 MB gacha)
-    if document.file_size > 10 * 1024 * 1024:
-        await message.answer(
-            "❌ <b>Fayl juda katta!</b>\n\n"
-            "Maksimal fayl hajmi: 10 MB",
-            parse_mode="HTML"
-        )
+    # Fayl hajmini tekshirish (Telegram bergan hajm bo'yicha, yuklashdan oldin)
+    if (document.file_size or 0) > config.parsing.max_file_size:
+        await message.answer(too_large_text(), parse_mode="HTML")
         return
     
     # Yuklanmoqda xabari
     processing_msg = await message.answer("⏳ Fayl tekshirilmoqda...")
     
     try:
-        # Faylni yuklab olish
+        # Faylni yuklab olish (hajm yuklash davomida ham tekshiriladi)
         file = await bot.get_file(document.file_id)
-        file_bytes = await bot.download_file(file.file_path)
+        try:
+            upload = await download_to_spool(bot, file.file_path, config.parsing.max_file_size)
+        except FileTooLarge:
+            await processing_msg.edit_text(too_large_text(), parse_mode="HTML")
+            return
         
-        # DOCX ni parse qilish
-        parser = DocxParser()
-        result = await parser.parse_bytes(file_bytes.read())
+        async def report_progress(fraction: float, questions: int):
+            # Kosmetik yangilanish: birlashtiriladi, natija xabari ustidan yozmaydi
+            await edit_coalescer.edit(processing_msg, progress_text(fraction, questions), parse_mode=None)
+        
+        # Faylni parse qilish (alohida jarayonda - event loop bloklanmaydi)
+        with upload:
+            result = await parse_pool.parse(
+                message.from_user.id, upload, progress=report_progress, file_format=upload_format
+            )
         
         if not result.success:
-            await processing_msg.edit_text(
+            await edit_coalescer.edit_now(
+                processing_msg,
                 f"❌ <b>Xatolik!</b>\n\n{result.error_message}",
                 parse_mode="HTML"
             )
@@ -116,7 +159,8 @@ async def process_docx(message: Message, state: FSMContext, bot: Bot):
         if result.warnings:
             warnings_text = "\n\n⚠️ <b>Ogohlantirishlar:</b>\n" + "\n".join(result.warnings)
         
-        await processing_msg.edit_text(
+        await edit_coalescer.edit_now(
+            processing_msg,
             f"✅ <b>Test yuklandi!</b>\n\n"
             f"📊 Topilgan savollar: <b>{len(questions)}</b>\n"
             f"{warnings_text}\n\n"
@@ -126,7 +170,8 @@ async def process_docx(message: Message, state: FSMContext, bot: Bot):
         )
         
     except Exception as e:
-        await processing_msg.edit_text(
+        await edit_coalescer.edit_now(
+            processing_msg,
             f"❌ <b>Xatolik yuz berdi!</b>\n\n"
             f"<code>{str(e)}</code>\n\n"
             f"Iltimos, qaytadan urinib ko'ring.",
@@ -134,6 +179,93 @@ async def process_docx(message: Message, state: FSMContext, bot: Bot):
         )
 
 
+async def process_archive(message: Message, state: FSMContext, bot: Bot):
+    """ZIP arxivdagi testlarni birdan yuklash (sozlamalar standart yoki manifest.json'dan)"""
+    document = message.document
+    max_size = config.parsing.max_archive_size
+    
+    if (document.file_size or 0) > max_size:
+        await message.answer(too_large_text(max_size), parse_mode="HTML")
+        return
+    
+    processing_msg = await message.answer("⏳ Arxiv tekshirilmoqda...")
+    
+    try:
+        file = await bot.get_file(document.file_id)
+        try:
+            upload = await download_to_spool(bot, file.file_path, max_size)
+        except FileTooLarge:
+            await edit_coalescer.edit_now(processing_msg, too_large_text(max_size))
+            return
+        
+        async def report_progress(done: int, total: int):
+            await edit_coalescer.edit(
+                processing_msg, f"⏳ Arxiv tekshirilmoqda...\n\n📄 Fayllar: {done}/{total}", parse_mode=None
+            )
+        
+        with upload:
+            report = await import_archive(
+                message.from_user.id,
+                message.from_user.username or message.from_user.first_name,
+                upload,
+                report_progress
+            )
+    except (ArchiveError, ParsePoolBusy) as e:
+        await edit_coalescer.edit_now(processing_msg, f"❌ <b>Xatolik!</b>\n\n{escape_html(str(e))}")
+        return
+    except Exception as e:
+        await edit_coalescer.edit_now(
+            processing_msg,
+            f"❌ <b>Xatolik yuz berdi!</b>\n\n"
+            f"<code>{escape_html(str(e))}</code>\n\n"
+            f"Iltimos, qaytadan urinib ko'ring."
+        )
+        return
+    
+    await state.clear()
+    await edit_coalescer.edit_now(processing_msg, archive_report_text(report))
+    await message.answer("🏠 Bosh menyu", reply_markup=MainMenuKeyboard.main_menu())
+
+
+def archive_report_text(report: BatchReport) -> str:
+    """Arxiv import natijasi: umumiy sonlar va har bir fayl"""
+    quizzes = report.quizzes
+    if report.saved:
+        lines = ["📦 <b>Arxiv yuklandi!</b>\n", f"✅ Yuklangan testlar: <b>{len(quizzes)}</b>"]
+    else:
+        lines = ["❌ <b>Testlarni saqlashda xatolik yuz berdi!</b>\n", "Iltimos, qaytadan urinib ko'ring."]
+    if report.failed:
+        lines.append(f"❌ Xatoli fayllar: <b>{len(report.failed)}</b>")
+    if report.skipped:
+        lines.append(f"⏭ O'tkazib yuborilgan: <b>{len(report.skipped)}</b>")
+    
+    details = []
+    for item in report.items:
+        if item.quiz is None:
+            reason = item.error.strip().split("\n")[0].removeprefix("❌").strip()
+            details.append(f"❌ {escape_html(item.name)} - {escape_html(reason)}")
+        elif report.saved:
+            details.append(
+                f"✅ {escape_html(item.name)} - {item.quiz.total_questions} savol, "
+                f"kod <code>{item.quiz.share_code}</code>"
+            )
+    details.extend(f"⏭ {escape_html(skipped)}" for skipped in report.skipped)
+    
+    shown = []
+    length = 0
+    for line in details:
+        length += len(line) + 1
+        if length > REPORT_DETAILS_LIMIT:
+            shown.append(f"... yana {len(details) - len(shown)} ta")
+            break
+        shown.append(line)
+    
+    if shown:
+        lines.append("")
+        lines.extend(shown)
+    return "\n".join(lines)
+
+
 @router.message(QuizStates.waiting_for_docx)
 async def wrong_file_type(message: Message):
     """Noto'g'ri fayl turi"""
@@ -145,6 +277,6 @@ async def wrong_file_type(message: Message):
         )
     else:
         await message.answer(
-            "❌ Faqat <b>.docx</b> (Word) formatdagi fayllar qabul qilinadi.",
+            "❌ Faqat <b>.docx</b>, <b>.txt</b>, <b>.csv</b> yoki <b>.json</b> formatdagi fayllar qabul qilinadi.",
             parse_mode="HTML"
         )
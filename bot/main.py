@@ -6,19 +6,29 @@ import asyncio
 import logging
 import sys
 from pathlib import Path
+from typing import Callable, Optional
 
 # Loyiha papkasini PATH ga qo'shish
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from aiogram import Bot, Dispatcher
 from aiogram.enums import ParseMode
-from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.client.default import DefaultBotProperties
 from aiogram.types import BotCommand
 
 from bot.config import config
-from bot.database import get_db
+from bot.database import get_db, SQLiteStorage
 from bot.handlers import get_all_routers
+from bot.handlers.quiz import resume_sessions
+from bot.handlers.group import resume_group_sessions
+from bot.middlewares import OutboundSchedulerMiddleware, RetryMiddleware
+from bot.services.edit_coalescer import edit_coalescer
+from bot.services.outbound_scheduler import outbound_scheduler
+from bot.services.countdown_policy import countdown_policy
+from bot.services.quiz_manager import quiz_manager
+from bot.services.parse_pool import parse_pool
+from bot.webhook import run_webhook
+from bot.workers import run_supervisor
 
 
 # Logging sozlash
@@ -33,89 +43,166 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Bot API xatolarini qayta urinish (statistika shutdown'da chiqariladi)
+retry_middleware = RetryMiddleware(
+    max_retries=config.outbound.max_retries,
+    max_retry_after=config.outbound.max_retry_after
+)
 
-async def on_startup(bot: Bot):
-    """Bot ishga tushganda"""
-    logger.info("Bot ishga tushmoqda...")
-    
+# FSM state'lari bazada saqlanadi (restart'dan keyin ham yo'qolmaydi)
+fsm_storage = SQLiteStorage(
+    cache_size=config.fsm.cache_size,
+    state_ttl=config.fsm.state_ttl,
+    flush_interval=config.fsm.flush_interval
+)
+
+
+async def start_services(bot: Bot, shard: Optional[Callable[[int], bool]] = None) -> None:
+    """Database va sessiyalarni tayyorlash (shard - worker'ga tegishli chat'lar)"""
     # Database'ni ishga tushirish
-    db = await get_db()
+    await get_db()
     logger.info("Database tayyor")
     
-    # Bot ma'lumotlarini olish
-    bot_info = await bot.get_me()
-    logger.info(f"Bot: @{bot_info.username} ({bot_info.full_name})")
+    # Restart'dan oldingi sessiyalarni tiklash va davom ettirish
+    restored = await quiz_manager.restore_sessions(shard)
+    if restored:
+        await resume_sessions(bot)
+        await resume_group_sessions(bot)
+        logger.info(f"{restored} ta sessiya tiklandi")
 
-    # Bot komandalar menyusi (/start va /help)
+
+async def stop_services() -> None:
+    """Navbatlar, sessiyalar va FSM state'larini oxirgi marta saqlash"""
+    # Navbatda qolgan edit'larni yuborish
+    await edit_coalescer.stop()
+    
+    # Faol sessiyalar va FSM state'larini oxirgi marta saqlash
+    logger.info(f"Sessiya statistika: {quiz_manager.stats()}")
+    await quiz_manager.stop()
+    await fsm_storage.close()
+    
+    # Parse jarayonlarini to'xtatish (ishlanayotgan fayl tugashi thread'da kutiladi)
+    logger.info(f"Parse statistika: {parse_pool.stats()}")
+    await asyncio.to_thread(parse_pool.shutdown)
+
+
+async def stop_outbound() -> None:
+    """Statistikani chiqarish va Bot API navbatini to'xtatish"""
+    logger.info(f"Outbound statistika: {outbound_scheduler.stats()}")
+    logger.info(f"Retry statistika: {retry_middleware.stats()}")
+    logger.info(f"Taymer statistika: {countdown_policy.stats()}")
+    logger.info(f"FSM statistika: {fsm_storage.stats}")
+    await outbound_scheduler.stop()
+
+
+async def set_commands(bot: Bot) -> None:
+    """Bot komandalar menyusi (/start va /help)"""
     await bot.set_my_commands([
         BotCommand(command="start", description="Botni boshlash va asosiy menyuni ko'rish"),
         BotCommand(command="help", description="Yordam va foydalanish bo'yicha ma'lumot")
     ])
+
+
+async def notify_admins(bot: Bot, text: str) -> None:
+    """Admin'larga xabar yuborish"""
+    for admin_id in config.bot.admin_ids:
+        try:
+            await bot.send_message(admin_id, text, parse_mode=ParseMode.HTML)
+        except Exception as e:
+            logger.warning(f"Admin {admin_id} ga xabar yuborib bo'lmadi: {e}")
+
+
+async def on_startup(bot: Bot):
+    """Bot ishga tushganda"""
+    logger.info("Bot ishga tushmoqda...")
+    
+    await start_services(bot)
+    
+    # Bot ma'lumotlarini olish
+    bot_info = await bot.get_me()
+    logger.info(f"Bot: @{bot_info.username} ({bot_info.full_name})")
     
-    # Admin'larga xabar yuborish
-    if config.bot.admin_ids:
-        for admin_id in config.bot.admin_ids:
-            try:
-                await bot.send_message(
-                    admin_id,
-                    "✅ <b>Bot ishga tushdi!</b>\n\n"
-                    f"🤖 Bot: @{bot_info.username}",
-                    parse_mode=ParseMode.HTML
-                )
-            except Exception as e:
-                logger.warning(f"Admin {admin_id} ga xabar yuborib bo'lmadi: {e}")
+    await set_commands(bot)
+    await notify_admins(bot, f"✅ <b>Bot ishga tushdi!</b>\n\n🤖 Bot: @{bot_info.username}")
 
 
 async def on_shutdown(bot: Bot):
     """Bot to'xtaganda"""
     logger.info("Bot to'xtatilmoqda...")
     
-    # Admin'larga xabar
-    if config.bot.admin_ids:
-        for admin_id in config.bot.admin_ids:
-            try:
-                await bot.send_message(
-                    admin_id,
-                    "⚠️ <b>Bot to'xtatildi!</b>",
-                    parse_mode=ParseMode.HTML
-                )
-            except Exception:
-                pass
+    await stop_services()
+    await notify_admins(bot, "⚠️ <b>Bot to'xtatildi!</b>")
+    await stop_outbound()
 
 
-async def main():
-    """Asosiy funksiya"""
-    # Token tekshirish
-    if not config.bot.token:
-        logger.error("BOT_TOKEN topilmadi! .env faylni tekshiring.")
-        sys.exit(1)
-    
-    # Bot va Dispatcher yaratish
+def create_bot() -> Bot:
+    """Bot obyektini so'rov middleware'lari bilan yaratish"""
     bot = Bot(
         token=config.bot.token,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML)
     )
     
-    dp = Dispatcher(storage=MemoryStorage())
+    # Barcha Bot API so'rovlari: avval retry (tashqi), keyin ustuvorlik navbati
+    bot.session.middleware(retry_middleware)
+    bot.session.middleware(OutboundSchedulerMiddleware(outbound_scheduler))
+    return bot
+
+
+def create_dispatcher() -> Dispatcher:
+    """Dispatcher'ni barcha routerlar bilan yaratish"""
+    dp = Dispatcher(storage=fsm_storage)
     
     # Routerlarni ro'yxatdan o'tkazish
     for router in get_all_routers():
         dp.include_router(router)
         logger.info(f"Router qo'shildi: {router.name}")
+    return dp
+
+
+async def main():
+    """Asosiy funksiya"""
+    # Token tekshirish
+    if not config.bot.token:
+        logger.error("BOT_TOKEN topilmadi! .env faylni tekshiring.")
+        sys.exit(1)
+    
+    if config.bot.mode == "webhook" and not config.webhook.url:
+        logger.error("BOT_MODE=webhook uchun WEBHOOK_URL topilmadi! .env faylni tekshiring.")
+        sys.exit(1)
+    
+    # Bot va Dispatcher yaratish
+    bot = create_bot()
+    dp = create_dispatcher()
+    
+    # Ko'p jarayonli rejim: update'lar worker'larga taqsimlanadi
+    if config.workers.count > 1:
+        try:
+            await set_commands(bot)
+            await notify_admins(bot, f"✅ <b>Bot ishga tushdi!</b>\n\n⚙️ Worker'lar: {config.workers.count}")
+            await run_supervisor(bot, dp)
+        finally:
+            await notify_admins(bot, "⚠️ <b>Bot to'xtatildi!</b>")
+            await outbound_scheduler.stop()
+            await bot.session.close()
+        return
     
     # Startup va shutdown hodisalari
     dp.startup.register(on_startup)
     dp.shutdown.register(on_shutdown)
     
     # Botni ishga tushirish
-    logger.info("Polling boshlanmoqda...")
-    
     try:
-        await dp.start_polling(
-            bot,
-            allowed_updates=dp.resolve_used_update_types(),
-            drop_pending_updates=True
-        )
+        if config.bot.mode == "webhook":
+            logger.info("Webhook rejimi boshlanmoqda...")
+            await run_webhook(
+                dp, bot, config.webhook,
+                drop_pending_updates=config.bot.drop_pending_updates
+            )
+        else:
+            logger.info("Polling boshlanmoqda...")
+            # Oldingi webhook o'chiriladi (aks holda getUpdates ishlamaydi)
+            await bot.delete_webhook(drop_pending_updates=config.bot.drop_pending_updates)
+            await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
     finally:
         await bot.session.close()
 
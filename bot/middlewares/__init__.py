@@ -0,0 +1,4 @@
+from .outbound import OutboundSchedulerMiddleware
+from .retry import RetryMiddleware
+
+__all__ = ["OutboundSchedulerMiddleware", "RetryMiddleware"]
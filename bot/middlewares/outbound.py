@@ -0,0 +1,34 @@
+"""
+Outbound middleware
+Barcha Bot API so'rovlarini ustuvorlik navbatidan o'tkazish
+"""
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from bot.services.outbound_scheduler import OutboundScheduler, Priority
+
+
+class OutboundSchedulerMiddleware(BaseRequestMiddleware):
+    """Har bir so'rovni yuborishdan oldin navbatdan ruxsat olish"""
+
+    def __init__(self, scheduler: OutboundScheduler):
+        self.scheduler = scheduler
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ):
+        priority = self.scheduler.classify(method)
+        if priority is None:
+            return await make_request(bot, method)
+
+        key = self.scheduler.merge_key(method) if priority == Priority.COSMETIC else None
+        ticket = await self.scheduler.acquire(priority, key)
+        try:
+            return await make_request(bot, method)
+        finally:
+            self.scheduler.release(ticket)
@@ -0,0 +1,152 @@
+"""
+Retry middleware
+RetryAfter (flood control) va vaqtinchalik tarmoq xatolarini qayta urinish
+"""
+import asyncio
+import logging
+import random
+import time
+from collections import Counter
+from typing import Optional, Union
+
+from aiohttp import ClientConnectorError
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramNetworkError, TelegramRetryAfter, TelegramServerError
+from aiogram.methods import GetUpdates, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from bot.services.outbound_scheduler import OutboundDropped, Priority, current_priority
+
+logger = logging.getLogger(__name__)
+
+ChatId = Union[int, str]
+
+# Qayta yuborilsa ikki marta bajarilmaydigan metodlar. send*, forwardMessage kabi
+# metodlar timeout'dan keyin ham Telegram'da bajarilgan bo'lishi mumkin - ular faqat
+# so'rov umuman ketmagan (ulanish o'rnatilmagan) bo'lsa qayta yuboriladi
+_IDEMPOTENT_PREFIXES = ("get", "edit", "delete", "answer", "set", "pin", "unpin")
+_IDEMPOTENT_METHODS = {"sendChatAction"}
+
+# Flood control yozuvlari shuncha bo'lganda muddati o'tganlari tozalanadi
+BACKOFF_PRUNE_SIZE = 256
+
+
+class RetryMiddleware(BaseRequestMiddleware):
+    """
+    Bot API so'rovlarini xatolikda qayta yuborish.
+
+    - TelegramRetryAfter: faqat shu chat uchun kutish (boshqa guruhlar to'xtamaydi)
+    - Tarmoq va server xatolari: eksponensial kutish + jitter bilan qayta urinish
+      (yuborish metodlari faqat ulanish o'rnatilmagan bo'lsa)
+    - Har bir xato turi necha marta uchragani hisoblanadi
+    """
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.5,
+                 max_delay: float = 10.0, max_retry_after: float = 60.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+        self._chat_resume_at: dict[ChatId, float] = {}  # chat_id -> qachondan yuborish mumkin
+        self._prune_at = BACKOFF_PRUNE_SIZE
+        self.error_counts: Counter = Counter()
+        self.retried = 0
+        self.recovered = 0
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ):
+        if isinstance(method, GetUpdates):
+            return await make_request(bot, method)  # Polling o'z backoff'iga ega
+
+        chat_id: Optional[ChatId] = getattr(method, "chat_id", None)
+        cosmetic = current_priority() == Priority.COSMETIC
+        attempt = 0
+
+        while True:
+            await self._wait_for_chat(chat_id, cosmetic)
+            try:
+                result = await make_request(bot, method)
+                if attempt:
+                    self.recovered += 1
+                return result
+            except TelegramRetryAfter as e:
+                self.error_counts["TelegramRetryAfter"] += 1
+                self._set_chat_backoff(chat_id, e.retry_after)
+                # Kosmetik yangilanishni kutishdan foyda yo'q - keyingisi baribir keladi
+                if cosmetic or attempt >= self.max_retries or e.retry_after > self.max_retry_after:
+                    raise
+                logger.info(f"Flood control: chat {chat_id}, {e.retry_after} soniya kutiladi")
+            except (TelegramNetworkError, TelegramServerError, asyncio.TimeoutError) as e:
+                self.error_counts[type(e).__name__] += 1
+                if attempt >= self.max_retries:
+                    raise
+                if not self._safe_to_retry(method, e):
+                    self.error_counts["NotRetriedUnsafe"] += 1
+                    raise
+                await asyncio.sleep(self._backoff_delay(attempt))
+
+            attempt += 1
+            self.retried += 1
+
+    def stats(self) -> dict:
+        """Xatolar statistikasi"""
+        self._prune_expired(time.monotonic())
+        return {
+            "errors": dict(self.error_counts),
+            "retried": self.retried,
+            "recovered": self.recovered,
+            "chats_in_backoff": len(self._chat_resume_at),
+        }
+
+    # ==================== ICHKI METODLAR ====================
+
+    @staticmethod
+    def _safe_to_retry(method: TelegramMethod, error: Exception) -> bool:
+        """Qayta yuborish takroriy xabar yaratmasligi"""
+        name = method.__api_method__
+        if name in _IDEMPOTENT_METHODS or name.startswith(_IDEMPOTENT_PREFIXES):
+            return True
+        # aiogram aiohttp xatosini TelegramNetworkError ichiga o'raydi (__context__)
+        return isinstance(error.__context__, ClientConnectorError)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Eksponensial kutish vaqti (full jitter)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _set_chat_backoff(self, chat_id: Optional[ChatId], retry_after: float) -> None:
+        now = time.monotonic()
+        # Qayta yozmagan chatlar lug'atda qolib ketmasligi uchun; chegara ikki
+        # barobar o'sadi, shuning uchun tozalash o'rtacha O(1)
+        if len(self._chat_resume_at) >= self._prune_at:
+            self._prune_expired(now)
+            self._prune_at = max(BACKOFF_PRUNE_SIZE, 2 * len(self._chat_resume_at))
+        resume_at = now + retry_after
+        self._chat_resume_at[chat_id] = max(resume_at, self._chat_resume_at.get(chat_id, 0.0))
+
+    def _prune_expired(self, now: float) -> None:
+        """Flood control muddati tugagan chatlarni unutish"""
+        expired = [chat_id for chat_id, resume_at in self._chat_resume_at.items() if resume_at <= now]
+        for chat_id in expired:
+            del self._chat_resume_at[chat_id]
+
+    async def _wait_for_chat(self, chat_id: Optional[ChatId], cosmetic: bool) -> None:
+        """Chat uchun flood control muddati tugashini kutish"""
+        resume_at = self._chat_resume_at.get(chat_id)
+        if resume_at is None:
+            return
+
+        delay = resume_at - time.monotonic()
+        if delay <= 0:
+            self._chat_resume_at.pop(chat_id, None)
+            return
+
+        if cosmetic:
+            self.error_counts["ShedDuringBackoff"] += 1
+            raise OutboundDropped(f"Chat {chat_id} flood control ostida")
+        await asyncio.sleep(delay)
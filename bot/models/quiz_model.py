@@ -4,46 +4,51 @@ Dataclass'lar yordamida ma'lumotlarni saqlash
 """
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Sequence
 import uuid
-import random
 
 
-@dataclass
+@dataclass(frozen=True, slots=True, init=False)
 class Question:
-    """Savol modeli"""
+    """Savol modeli (o'zgarmas - bir nechta sessiya bitta nusxadan foydalanadi)"""
     id: str
     text: str
-    options: list[str]  # Barcha variantlar
+    options: tuple[str, ...]  # Barcha variantlar
     correct_index: int  # To'g'ri javob indeksi (0 dan boshlanadi)
-    original_options: list[str] = field(default_factory=list)  # Asl tartibdagi variantlar
+    _original: Optional[tuple[str, ...]] = field(default=None, repr=False)  # Faqat options'dan farq qilsa
     
-    def __post_init__(self):
-        if not self.original_options:
-            self.original_options = self.options.copy()
+    def __init__(self, id: str, text: str, options: Sequence[str], correct_index: int,
+                 original_options: Optional[Sequence[str]] = None):
+        options = tuple(options)
+        object.__setattr__(self, "id", id)
+        object.__setattr__(self, "text", text)
+        object.__setattr__(self, "options", options)
+        object.__setattr__(self, "correct_index", correct_index)
+        # Asl tartib odatda variantlar bilan bir xil - nusxa saqlanmaydi
+        original = tuple(original_options) if original_options else None
+        object.__setattr__(self, "_original", original if original != options else None)
+    
+    @property
+    def original_options(self) -> tuple[str, ...]:
+        """Asl tartibdagi variantlar"""
+        return self._original if self._original is not None else self.options
     
     @property
     def correct_answer(self) -> str:
         """To'g'ri javobni qaytarish"""
         return self.options[self.correct_index]
     
-    def shuffle_options(self) -> None:
-        """Variantlarni aralashtirish"""
-        correct_text = self.options[self.correct_index]
-        random.shuffle(self.options)
-        self.correct_index = self.options.index(correct_text)
-    
     def get_option_letter(self, index: int) -> str:
         """Variant harfini olish (A, B, C, D...)"""
         return chr(65 + index)  # 65 = 'A' ASCII kodi
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Quiz:
-    """Quiz modeli"""
+    """Quiz modeli (o'zgarmas - sessiyalar uchun umumiy savollar to'plami)"""
     id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
     title: str = ""
-    questions: list[Question] = field(default_factory=list)
+    questions: tuple[Question, ...] = ()
     creator_id: int = 0
     time_per_question: int = 30  # Soniyada
     shuffle_options: bool = True
@@ -51,6 +56,10 @@ class Quiz:
     is_active: bool = False
     share_code: str = field(default_factory=lambda: str(uuid.uuid4())[:6].upper())
     
+    def __post_init__(self):
+        if not isinstance(self.questions, tuple):
+            object.__setattr__(self, "questions", tuple(self.questions))
+    
     @property
     def total_questions(self) -> int:
         """Umumiy savollar soni"""
@@ -67,15 +76,9 @@ class Quiz:
             return f"{minutes} daqiqa"
         else:
             return f"{self.time_per_question} soniya"
-    
-    def prepare_quiz(self) -> None:
-        """Quizni tayyorlash (variantlarni aralashtirish)"""
-        if self.shuffle_options:
-            for question in self.questions:
-                question.shuffle_options()
 
 
-@dataclass
+@dataclass(slots=True)
 class QuizResult:
     """Quiz natijasi modeli"""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -132,7 +135,7 @@ class QuizResult:
             return "Qayta o'qing"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class QuizSettings:
     """Quiz sozlamalari"""
     quiz_mode: str = "full"  # full/range/random
@@ -142,7 +145,7 @@ class QuizSettings:
     shuffle: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class UserStatistics:
     """Foydalanuvchi statistikasi"""
     user_id: int
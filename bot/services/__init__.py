@@ -1,5 +1,9 @@
 from .docx_parser import DocxParser, ParseResult
 from .quiz_manager import QuizManager
 from .statistics_service import StatisticsService
+from .edit_coalescer import EditCoalescer
+from .parse_pool import ParsePool
+from .importers import TextImporter, CsvImporter, JsonImporter
 
-__all__ = ["DocxParser", "ParseResult", "QuizManager", "StatisticsService"]
+__all__ = ["DocxParser", "ParseResult", "QuizManager", "StatisticsService", "EditCoalescer", "ParsePool",
+           "TextImporter", "CsvImporter", "JsonImporter"]
@@ -0,0 +1,216 @@
+"""
+Batch Import Service
+ZIP arxivdagi ko'p test faylini birdan import qilish
+"""
+import asyncio
+import json
+import posixpath
+import zipfile
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, BinaryIO, Callable, Optional
+
+from bot.config import config
+from bot.database import get_db
+from bot.models import Quiz
+from bot.services.importers import file_format
+from bot.services.parse_pool import parse_pool
+
+MANIFEST_NAME = "manifest.json"
+MAX_MANIFEST_SIZE = 1024 * 1024
+MAX_TITLE_LENGTH = 100
+MAX_TIME_PER_QUESTION = 3600
+
+
+class ArchiveError(Exception):
+    """Arxivni import qilib bo'lmaydi (xabar foydalanuvchiga ko'rsatiladi)"""
+
+
+@dataclass
+class ArchiveEntry:
+    """Arxivdagi import qilinadigan fayl va uning sozlamalari"""
+    name: str
+    file_format: str
+    title: str
+    time_per_question: int
+    shuffle_options: bool
+
+
+@dataclass
+class BatchItem:
+    """Bitta fayl natijasi"""
+    name: str
+    quiz: Optional[Quiz] = None
+    error: str = ""
+
+
+@dataclass
+class BatchReport:
+    """Arxiv import natijasi"""
+    items: list[BatchItem] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)  # "fayl - sabab"
+    saved: bool = True
+
+    @property
+    def quizzes(self) -> list[Quiz]:
+        """Muvaffaqiyatli yaratilgan testlar"""
+        return [item.quiz for item in self.items if item.quiz is not None]
+
+    @property
+    def failed(self) -> list[BatchItem]:
+        """Parse qilinmagan fayllar"""
+        return [item for item in self.items if item.quiz is None]
+
+
+# ==================== MANIFEST ====================
+
+def read_manifest(archive: zipfile.ZipFile) -> tuple[str, dict]:
+    """
+    manifest.json (ixtiyoriy) - (joylashgan papka, mazmuni).
+
+    Arxiv papka bilan siqilgan bo'lsa, manifest eng yuqori darajadagisi olinadi.
+    {
+        "time_per_question": 30,            - barcha fayllar uchun (ixtiyoriy)
+        "shuffle_options": true,
+        "files": {
+            "algebra.docx": {"title": "Algebra 1", "time_per_question": 60}
+        }
+    }
+    """
+    candidates = [
+        info for info in archive.infolist()
+        if posixpath.basename(info.filename) == MANIFEST_NAME and not _is_hidden(info.filename)
+    ]
+    if not candidates:
+        return "", {}
+
+    info = min(candidates, key=lambda item: item.filename.count("/"))
+    if info.file_size > MAX_MANIFEST_SIZE:
+        raise ArchiveError(f"{MANIFEST_NAME} juda katta")
+    try:
+        manifest = json.loads(archive.read(info).decode("utf-8-sig"))
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ArchiveError(f"{MANIFEST_NAME} o'qilmadi: {e}")
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("files", {}), dict):
+        raise ArchiveError(f"{MANIFEST_NAME}: obyekt va \"files\" bo'limi obyekt bo'lishi kerak")
+    return posixpath.dirname(info.filename), manifest
+
+
+def _entry_settings(name: str, base: str, manifest: dict) -> tuple[str, int, bool]:
+    """Fayl uchun (sarlavha, vaqt, aralashtirish): manifest yoki standart qiymatlar"""
+    files = manifest.get("files", {})
+    relative = posixpath.relpath(name, base) if base else name
+    overrides = files.get(relative, files.get(posixpath.basename(name), {}))
+    if not isinstance(overrides, dict):
+        raise ArchiveError(f"{MANIFEST_NAME}: \"{relative}\" sozlamalari obyekt bo'lishi kerak")
+
+    def setting(key: str, default: Any) -> Any:
+        return overrides.get(key, manifest.get(key, default))
+
+    title = setting("title", posixpath.splitext(posixpath.basename(name))[0])
+    time_per_question = setting("time_per_question", config.quiz.default_time)
+    shuffle_options = setting("shuffle_options", True)
+
+    if not isinstance(title, str) or not title.strip():
+        raise ArchiveError(f"{MANIFEST_NAME}: \"{relative}\" sarlavhasi matn bo'lishi kerak")
+    if (isinstance(time_per_question, bool) or not isinstance(time_per_question, int)
+            or not 0 <= time_per_question <= MAX_TIME_PER_QUESTION):
+        raise ArchiveError(
+            f"{MANIFEST_NAME}: time_per_question 0 dan {MAX_TIME_PER_QUESTION} gacha butun son bo'lishi kerak"
+        )
+    if not isinstance(shuffle_options, bool):
+        raise ArchiveError(f"{MANIFEST_NAME}: shuffle_options true yoki false bo'lishi kerak")
+    return title.strip()[:MAX_TITLE_LENGTH], time_per_question, shuffle_options
+
+
+# ==================== ARXIV ====================
+
+def plan_archive(archive: zipfile.ZipFile, max_files: int) -> tuple[list[ArchiveEntry], list[str]]:
+    """Import qilinadigan fayllar va o'tkazib yuborilganlar ("fayl - sabab")"""
+    base, manifest = read_manifest(archive)
+    entries: list[ArchiveEntry] = []
+    skipped: list[str] = []
+
+    for info in archive.infolist():
+        name = info.filename
+        if info.is_dir() or _is_hidden(name) or posixpath.basename(name) == MANIFEST_NAME:
+            continue
+
+        entry_format = file_format(name)
+        if entry_format is None:
+            skipped.append(f"{name} - format qo'llab-quvvatlanmaydi")
+        elif info.flag_bits & 0x1:
+            skipped.append(f"{name} - parol bilan himoyalangan")
+        elif len(entries) >= max_files:
+            skipped.append(f"{name} - arxivda {max_files} tadan ortiq fayl")
+        else:
+            entries.append(ArchiveEntry(name, entry_format, *_entry_settings(name, base, manifest)))
+    return entries, skipped
+
+
+def _is_hidden(name: str) -> bool:
+    """macOS xizmat fayllari va yashirin fayllar"""
+    return name.startswith("__MACOSX/") or posixpath.basename(name).startswith(".")
+
+
+def _read_entry(archive: zipfile.ZipFile, name: str, max_size: int) -> bytes:
+    """Arxivdagi faylni ochish (ochilgan hajm chegarasi bilan)"""
+    info = archive.getinfo(name)
+    too_large = ValueError(f"fayl hajmi {max_size // (1024 * 1024)} MB dan oshdi")
+    if info.file_size > max_size:
+        raise too_large
+    with archive.open(info) as entry:
+        # Sarlavhadagi hajmga ishonilmaydi
+        data = entry.read(max_size + 1)
+    if len(data) > max_size:
+        raise too_large
+    return data
+
+
+async def import_archive(user_id: int, username: str, upload: BinaryIO,
+                         progress: Optional[Callable[[int, int], Awaitable[None]]] = None) -> BatchReport:
+    """
+    ZIP arxivdagi test fayllarini import qilish.
+
+    Fayllar parse_pool'da parallel parse qilinadi (arxiv to'liq ochilmaydi -
+    har bir fayl worker bo'shaganda o'qiladi), muvaffaqiyatli testlar bitta
+    tranzaksiyada saqlanadi. Arxiv yoki manifest yaroqsiz bo'lsa ArchiveError,
+    pool band bo'lsa ParsePoolBusy ko'tariladi.
+    """
+    try:
+        archive = await asyncio.to_thread(zipfile.ZipFile, upload)
+    except zipfile.BadZipFile:
+        raise ArchiveError("ZIP arxiv buzilgan yoki ZIP emas")
+
+    with archive:
+        entries, skipped = await asyncio.to_thread(plan_archive, archive, config.parsing.max_archive_files)
+        if not entries:
+            raise ArchiveError("Arxivda test fayllari (.docx, .txt, .csv, .json) topilmadi")
+
+        max_size = config.parsing.max_file_size
+        results = await parse_pool.parse_batch(
+            user_id,
+            [(entry.name, entry.file_format) for entry in entries],
+            lambda name: _read_entry(archive, name, max_size),
+            progress
+        )
+
+    report = BatchReport(skipped=skipped)
+    for entry, result in zip(entries, results):
+        if not result.success:
+            report.items.append(BatchItem(entry.name, error=result.error_message))
+            continue
+        report.items.append(BatchItem(entry.name, quiz=Quiz(
+            title=entry.title,
+            questions=result.questions,
+            creator_id=user_id,
+            time_per_question=entry.time_per_question,
+            shuffle_options=entry.shuffle_options
+        )))
+
+    quizzes = report.quizzes
+    if quizzes:
+        db = await get_db()
+        report.saved = await db.save_quizzes(quizzes)
+        if report.saved:
+            await db.update_user_statistics(user_id=user_id, username=username, quizzes_created=len(quizzes))
+    return report
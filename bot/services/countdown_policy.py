@@ -0,0 +1,78 @@
+"""
+Countdown Policy Service
+Taymer xabarlarini qanchalik tez-tez yangilashni yuklamaga qarab tanlash
+"""
+from collections import Counter
+from enum import Enum
+
+from bot.config import CountdownConfig, config
+from bot.services.edit_coalescer import edit_coalescer
+from bot.services.outbound_scheduler import outbound_scheduler
+
+
+class LoadLevel(str, Enum):
+    """Tizim yuklamasi darajasi"""
+    NORMAL = "normal"  # Odatiy chastota
+    REDUCED = "reduced"  # Kamroq yangilanish
+    MINIMAL = "minimal"  # Faqat boshi va oxiri
+
+
+class CountdownPolicy:
+    """
+    Taymer yangilanish chastotasini tanlash.
+
+    Qaror chiquvchi navbat chuqurligi (scheduler + coalescer), chat turi
+    va qolgan vaqt asosida qabul qilinadi. Og'ir yuklamada oraliq
+    yangilanishlar to'xtatiladi - faqat savol va "Vaqt tugadi" xabari qoladi.
+    """
+
+    def __init__(self, settings: CountdownConfig):
+        self.settings = settings
+        self._decisions: Counter = Counter()  # (level, updated) -> soni
+
+    def current_depth(self) -> int:
+        """Chiquvchi so'rovlar navbati chuqurligi"""
+        return outbound_scheduler.queue_depth + edit_coalescer.pending_count
+
+    def current_level(self) -> LoadLevel:
+        """Joriy yuklama darajasi"""
+        depth = self.current_depth()
+        if depth >= self.settings.minimal_queue_depth:
+            return LoadLevel.MINIMAL
+        if depth >= self.settings.reduced_queue_depth:
+            return LoadLevel.REDUCED
+        return LoadLevel.NORMAL
+
+    def should_update(self, chat_type: str, time_left: int) -> bool:
+        """Taymer xabarini shu soniyada yangilash kerakmi"""
+        level = self.current_level()
+        is_group = chat_type in ("group", "supergroup")
+        s = self.settings
+
+        if level == LoadLevel.NORMAL:
+            if is_group:
+                update = time_left <= s.final_seconds or time_left in s.group_checkpoints
+            else:
+                update = time_left <= s.final_seconds or time_left % s.private_step == 0
+        elif level == LoadLevel.REDUCED:
+            # Guruh va shaxsiy chat bir xil: har reduced_step soniyada va oxirgi soniyalarda
+            update = time_left <= s.reduced_final_seconds or time_left % s.reduced_step == 0
+        else:
+            update = False
+
+        self._decisions[(level.value, update)] += 1
+        return update
+
+    def stats(self) -> dict:
+        """Har bir daraja bo'yicha yangilangan va o'tkazib yuborilgan tick'lar"""
+        return {
+            level.value: {
+                "updated": self._decisions[(level.value, True)],
+                "skipped": self._decisions[(level.value, False)],
+            }
+            for level in LoadLevel
+        }
+
+
+# Global countdown policy
+countdown_policy = CountdownPolicy(config.countdown)
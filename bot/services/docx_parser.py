@@ -2,12 +2,508 @@
 DOCX Parser Service
 Word fayldan savollarni o'qib olish
 """
+import io
+import posixpath
 import re
+import time
 import uuid
-from dataclasses import dataclass
-from typing import Optional
-from docx import Document
+import zipfile
+from dataclasses import dataclass, field
+from typing import IO, Callable, Iterable, Iterator, Optional, Union
+from lxml import etree
+from bot.config import config
 from bot.models import Question
+from bot.utils.text_pool import normalize_text, text_pool
+
+
+# ==================== DOCX O'QISH ====================
+
+# WordprocessingML teglari
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_BODY = f"{_W}body"
+_W_P = f"{_W}p"
+_W_R = f"{_W}r"
+_W_T = f"{_W}t"
+_W_BR = f"{_W}br"
+_W_HYPERLINK = f"{_W}hyperlink"
+
+# Run ichidagi maxsus belgilar (python-docx Run.text bilan bir xil)
+_RUN_CHARS = {
+    f"{_W}tab": "\t",
+    f"{_W}ptab": "\t",
+    f"{_W}cr": "\n",
+    f"{_W}noBreakHyphen": "-",
+}
+
+_DEFAULT_MAIN_PART = "word/document.xml"
+_OFFICE_DOCUMENT_REL = "/officeDocument"
+
+# Qismlar turi: [Content_Types].xml (Default - kengaytma bo'yicha, Override - qism nomi bo'yicha)
+_CONTENT_TYPES_PART = "[Content_Types].xml"
+_CT = "{http://schemas.openxmlformats.org/package/2006/content-types}"
+_MAIN_CONTENT_TYPES = frozenset({
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.template.main+xml",
+    "application/vnd.ms-word.document.macroEnabled.main+xml",
+    "application/vnd.ms-word.template.macroEnabledTemplate.main+xml",
+})
+# Matn uchun kerak bo'lmagan qismlar: rasm, audio, video va ichki obyektlar
+_MEDIA_TYPE_PREFIXES = ("image/", "audio/", "video/")
+_MEDIA_DIRS = ("media", "embeddings")
+
+# Paket ro'yxatlari ([Content_Types].xml, .rels) shundan katta bo'lsa o'qilmaydi
+_MAX_INDEX_PART_SIZE = 1024 * 1024
+
+# Tashqi entity va tarmoq so'rovlari o'chirilgan (XXE himoyasi)
+_SAFE_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+
+
+def iter_docx_paragraphs(source: Union[str, IO[bytes]],
+                         max_part_size: Optional[int] = None,
+                         on_read: Optional[Callable[[int, int], None]] = None) -> Iterator[str]:
+    """
+    .docx faylidagi paragraflar matnini ketma-ket qaytarish.
+
+    python-docx Document (to'liq DOM) qurilmaydi: asosiy hujjat XML'i
+    iterparse bilan o'qiladi, har bir paragraf matni olingach u va undan
+    oldingi elementlar xotiradan tozalanadi. doc.paragraphs kabi faqat
+    body darajasidagi paragraflar olinadi (jadval ichidagilari emas).
+
+    max_part_size berilsa, ochilgan hajmi undan katta XML o'qilmaydi
+    (arxiv katalogidagi hajm bo'yicha, ochishdan oldin).
+
+    on_read(o'qilgan, jami) XML'ning har bir o'qilgan bo'lagidan keyin
+    chaqiriladi (ochilgan baytlarda) - progress hisoblash uchun.
+    """
+    with zipfile.ZipFile(source) as archive:
+        info = _main_part_info(archive, max_part_size)
+        with archive.open(info) as xml:
+            if on_read is not None:
+                xml = _CountingReader(xml, info.file_size, on_read)
+            yield from _body_paragraphs(etree.iterparse(xml, events=("end",), tag=_W_P,
+                                                        resolve_entities=False, no_network=True))
+
+
+def iter_docx_chunk(source: Union[str, IO[bytes]], index: int, count: int,
+                    max_part_size: Optional[int] = None,
+                    on_read: Optional[Callable[[int, int], None]] = None) -> Iterator[str]:
+    """
+    Hujjatning index-bo'lagidagi (count tadan) paragraflar matni.
+
+    Asosiy XML ochilgan hajm bo'yicha teng qismlarga bo'linadi: k-chegara -
+    k/count o'rnidan keyingi birinchi <w:p> boshi. Har bir worker chegaralarni
+    boshqalaridan mustaqil, lekin bir xil topadi. Bo'lak boshiga hujjatning
+    <w:body> gacha qismi, oxiriga yopuvchi teglar qo'shiladi. Chegara body
+    darajasiga tushmasa (jadval yoki matn maydoni ichida), bo'lak XML'i
+    yaroqsiz bo'ladi va XMLSyntaxError ko'tariladi.
+    """
+    with zipfile.ZipFile(source) as archive:
+        info = _main_part_info(archive, max_part_size)
+        with archive.open(info) as xml:
+            if on_read is not None:
+                xml = _CountingReader(xml, info.file_size, on_read)
+            parser = etree.XMLPullParser(events=("end",), tag=_W_P,
+                                         resolve_entities=False, no_network=True)
+            fed = False
+            for block in _chunk_blocks(xml, info.file_size, index, count):
+                parser.feed(block)
+                fed = True
+                yield from _body_paragraphs(parser.read_events())
+            if fed:
+                parser.close()
+                yield from _body_paragraphs(parser.read_events())
+
+
+def docx_part_size(source: Union[str, IO[bytes]]) -> int:
+    """Asosiy hujjat XML'ining ochilgan hajmi (arxiv katalogidan, ochmasdan)"""
+    with zipfile.ZipFile(source) as archive:
+        return archive.getinfo(_main_part_name(archive)).file_size
+
+
+def _main_part_info(archive: zipfile.ZipFile, max_part_size: Optional[int]) -> zipfile.ZipInfo:
+    """Asosiy hujjat qismi (hajmi max_part_size dan oshsa ValueError)"""
+    info = archive.getinfo(_main_part_name(archive))
+    if max_part_size is not None and info.file_size > max_part_size:
+        raise ValueError(
+            f"hujjat matni juda katta ({info.file_size / (1024 * 1024):.1f} MB, "
+            f"ruxsat etilgani {max_part_size / (1024 * 1024):.1f} MB)"
+        )
+    return info
+
+
+def _body_paragraphs(events: Iterable) -> Iterator[str]:
+    """("end", w:p) hodisalaridan body darajasidagi paragraflar matni"""
+    for _, paragraph in events:
+        body = paragraph.getparent()
+        if body is None or body.tag != _W_BODY:
+            continue
+        
+        yield _paragraph_text(paragraph)
+        
+        # O'qilgan elementlarni bo'shatish
+        paragraph.clear()
+        while paragraph.getprevious() is not None:
+            del body[0]
+
+
+class _CountingReader:
+    """Fayl obyekti o'rami: har bir read() dan keyin on_read chaqiriladi"""
+
+    def __init__(self, raw: IO[bytes], total: int, on_read: Callable[[int, int], None]):
+        self._raw = raw
+        self._total = total
+        self._on_read = on_read
+        self._consumed = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._raw.read(size)
+        self._consumed += len(data)
+        self._on_read(self._consumed, self._total)
+        return data
+
+
+# Bo'laklarga ajratish (Word teglarni doim w: prefiksi bilan yozadi)
+_BODY_START = b"<w:body>"
+_BODY_END = b"</w:body></w:document>"
+_BODY_START_RE = re.compile(re.escape(_BODY_START))
+_PARAGRAPH_START_RE = re.compile(rb'<w:p[ >]')
+_BLOCK_SIZE = 64 * 1024
+
+
+class _XmlBlocks:
+    """Ochilgan XML oqimi: bloklab o'qib, naqsh bo'yicha chegaralarni topish"""
+    
+    # Bloklar chegarasida bo'linib qolgan naqsh uchun bufer oxirida qoldiriladi
+    _OVERLAP = 16
+    
+    def __init__(self, raw: IO[bytes]):
+        self._raw = raw
+        self._data = b""
+        self._offset = 0  # _data[0] ning XML'dagi o'rni
+        self.exhausted = False
+    
+    def until(self, pattern: re.Pattern, position: Optional[int]) -> Iterator[bytes]:
+        """
+        Joriy o'rindan position va undan keyingi birinchi pattern boshigacha
+        bo'lgan baytlar. Naqsh topilmasa (yoki position None bo'lsa) oqim
+        oxirigacha o'qiladi va exhausted=True bo'ladi.
+        """
+        while True:
+            if position is not None:
+                match = pattern.search(self._data, max(0, position - self._offset))
+                if match:
+                    yield from self._advance(match.start())
+                    return
+            block = self._raw.read(_BLOCK_SIZE)
+            if not block:
+                self.exhausted = True
+                yield from self._advance(len(self._data))
+                return
+            yield from self._advance(max(0, len(self._data) - self._OVERLAP))
+            self._data += block
+    
+    def take(self, size: int) -> bytes:
+        """Buferdagi keyingi size bayt (until topgan naqsh uchun)"""
+        data = self._data[:size]
+        self._data = self._data[size:]
+        self._offset += len(data)
+        return data
+    
+    def _advance(self, size: int) -> Iterator[bytes]:
+        if size:
+            yield self.take(size)
+
+
+def _chunk_blocks(xml: IO[bytes], total: int, index: int, count: int) -> Iterator[bytes]:
+    """index-bo'lak XML'i: hujjat boshi, [k-chegara, k+1-chegara) oralig'i va yopuvchi teglar"""
+    stream = _XmlBlocks(xml)
+    header = b"".join(stream.until(_BODY_START_RE, 0))
+    if stream.exhausted:
+        raise ValueError("hujjatda <w:body> topilmadi")
+    header += stream.take(len(_BODY_START))
+    
+    if index > 0:
+        for _ in stream.until(_PARAGRAPH_START_RE, total * index // count):
+            pass
+        if stream.exhausted:
+            # Oldingi bo'lak hujjat oxirigacha yetdi - bu bo'lak bo'sh
+            return
+    
+    yield header
+    last = index == count - 1
+    yield from stream.until(_PARAGRAPH_START_RE, None if last else total * (index + 1) // count)
+    if not stream.exhausted:
+        yield _BODY_END
+
+
+def _main_part_name(archive: zipfile.ZipFile) -> str:
+    """
+    Asosiy hujjat qismi nomi (odatda word/document.xml): [Content_Types].xml
+    dagi hujjat turi bo'yicha, bo'lmasa _rels/.rels dagi officeDocument.
+    """
+    _, overrides = _content_types(archive)
+    for name, content_type in overrides.items():
+        if content_type in _MAIN_CONTENT_TYPES and name in archive.NameToInfo:
+            return name
+    
+    rels = _read_index_part(archive, "_rels/.rels")
+    if rels is None:
+        return _DEFAULT_MAIN_PART
+    for rel in rels:
+        if rel.get("Type", "").endswith(_OFFICE_DOCUMENT_REL):
+            return rel.get("Target", _DEFAULT_MAIN_PART).lstrip("/")
+    return _DEFAULT_MAIN_PART
+
+
+def media_entries(archive: zipfile.ZipFile) -> list[zipfile.ZipInfo]:
+    """
+    Hujjatdagi rasm, audio, video va ichki obyektlar.
+
+    Faqat arxiv katalogi va [Content_Types].xml bo'yicha aniqlanadi -
+    qismlarning o'zi ochilmaydi.
+    """
+    defaults, overrides = _content_types(archive)
+    media = []
+    for info in archive.infolist():
+        name = info.filename
+        content_type = overrides.get(name) or defaults.get(posixpath.splitext(name)[1][1:].lower(), "")
+        if (content_type.startswith(_MEDIA_TYPE_PREFIXES)
+                or any(part in _MEDIA_DIRS for part in name.split("/")[:-1])):
+            media.append(info)
+    return media
+
+
+def _content_types(archive: zipfile.ZipFile) -> tuple[dict[str, str], dict[str, str]]:
+    """[Content_Types].xml: (kengaytma -> tur, qism nomi -> tur)"""
+    types = _read_index_part(archive, _CONTENT_TYPES_PART)
+    defaults: dict[str, str] = {}
+    overrides: dict[str, str] = {}
+    if types is None:
+        return defaults, overrides
+    for item in types:
+        content_type = item.get("ContentType", "")
+        if item.tag == f"{_CT}Default":
+            defaults[item.get("Extension", "").lower()] = content_type
+        elif item.tag == f"{_CT}Override":
+            overrides[item.get("PartName", "").lstrip("/")] = content_type
+    return defaults, overrides
+
+
+def _read_index_part(archive: zipfile.ZipFile, name: str):
+    """Paket ro'yxati XML'i (yo'q yoki juda katta bo'lsa None)"""
+    try:
+        info = archive.getinfo(name)
+    except KeyError:
+        return None
+    if info.file_size > _MAX_INDEX_PART_SIZE:
+        return None
+    return etree.fromstring(archive.read(info), _SAFE_PARSER)
+
+
+def _paragraph_text(paragraph) -> str:
+    """Paragraf matni: w:r va w:hyperlink ichidagi run'lar (python-docx p.text kabi)"""
+    parts: list[str] = []
+    for child in paragraph:
+        if child.tag == _W_R:
+            _run_text(child, parts)
+        elif child.tag == _W_HYPERLINK:
+            for run in child.iterchildren(_W_R):
+                _run_text(run, parts)
+    return "".join(parts)
+
+
+def _run_text(run, parts: list[str]) -> None:
+    for element in run:
+        tag = element.tag
+        if tag == _W_T:
+            parts.append(element.text or "")
+        elif tag == _W_BR:
+            # Faqat oddiy qator uzilishi matnga qo'shiladi (sahifa/ustun emas)
+            if element.get(f"{_W}type", "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag in _RUN_CHARS:
+            parts.append(_RUN_CHARS[tag])
+
+
+# ==================== QATORLARNI TASNIFLASH ====================
+
+# Klassik format paragraf turlari
+LINE_NOISE = 0
+LINE_QUESTION = 1
+LINE_OPTION = 2
+
+# To'g'ri javob belgilari (har biri bitta belgi)
+CORRECT_MARKERS = ('*', '+', '✓', '✔', '√')
+_MARKER_SET = frozenset(CORRECT_MARKERS)
+
+# Savol: "1. Savol", "1) Savol", "Savol 1: Savol", "S1. Savol"
+_QUESTION_RE = re.compile(
+    r'(?:\d+\s*[.)\-]|Savol\s*\d+\s*[.:)]|S\s*\d+\s*[.:)])\s*(.+)$',
+    re.IGNORECASE
+)
+
+# Variant: "A) variant", "a. variant", "1) variant"
+_OPTION_RE = re.compile(r'(?:[A-Za-z]|\d+)\s*[).\-]\s*(.+)$', re.IGNORECASE)
+
+# Savol faqat raqam yoki S harfi bilan boshlanadi (ſ - IGNORECASE'da s bilan teng)
+_QUESTION_FIRST = frozenset("Ssſ")
+
+
+def classify_line(text: str) -> tuple[int, str, bool]:
+    """
+    Klassik format paragrafini bir o'tishda tasniflash.
+    
+    (tur, tozalangan matn, to'g'ri javobmi) qaytaradi. Savol varianta
+    nisbatan ustun: "1) matn" savol hisoblanadi.
+    """
+    if not text:
+        return LINE_NOISE, "", False
+    
+    first = text[0]
+    if first.isdigit() or first in _QUESTION_FIRST:
+        question = _QUESTION_RE.match(text)
+        if question:
+            return LINE_QUESTION, question.group(1).strip(), False
+    
+    option = _classify_option(text)
+    if option is None:
+        return LINE_NOISE, "", False
+    return LINE_OPTION, option[0], option[1]
+
+
+def _is_classic_question(text: str) -> bool:
+    """classify_line(text) savol qaytaradimi (variantni tekshirmasdan)"""
+    first = text[0]
+    return (first.isdigit() or first in _QUESTION_FIRST) and _QUESTION_RE.match(text) is not None
+
+
+def _classify_option(text: str) -> Optional[tuple[str, bool]]:
+    """Variant matni va to'g'riligi (variant bo'lmasa None)"""
+    first = text[0]
+    # + yoki = bilan boshlanganlar yangi formatga tegishli
+    if first == '+' or first == '=':
+        return None
+    
+    # Boshida yoki oxirida to'g'ri javob belgisi
+    is_correct = False
+    clean_text = text
+    if first in _MARKER_SET:
+        is_correct = True
+        clean_text = text[1:].strip()
+    elif text[-1] in _MARKER_SET:
+        is_correct = True
+        clean_text = text[:-1].strip()
+    
+    match = _OPTION_RE.match(clean_text)
+    if match is None:
+        return None
+    
+    option_text = match.group(1).strip()
+    # Harf/raqamdan keyingi matn oxiridagi belgilar
+    if option_text and option_text[-1] in _MARKER_SET:
+        for marker in CORRECT_MARKERS:
+            if option_text.endswith(marker):
+                is_correct = True
+                option_text = option_text[:-1].strip()
+    return option_text, is_correct
+
+
+# ==================== SAVOLLARNI YIG'ISH ====================
+
+# Tugagan savol: (matn, variantlar, to'g'ri javob indeksi)
+CompletedQuestion = tuple[str, list[str], int]
+
+
+class _ClassicAssembler:
+    """
+    Klassik format: paragraflar birma-bir beriladi, keyingi savol
+    boshlanganda oldingisi tugagan savol sifatida qaytariladi.
+    """
+    
+    def __init__(self):
+        self.question: Optional[str] = None
+        self.options: list[str] = []
+        self.correct_index = -1
+    
+    def feed(self, para: str) -> Optional[CompletedQuestion]:
+        # Har bir paragraf bir marta tasniflanadi
+        kind, text, is_correct = classify_line(para)
+        
+        if kind == LINE_QUESTION:
+            completed = self.finish()
+            self.question = text
+            self.options = []
+            self.correct_index = -1
+            return completed
+        
+        if kind == LINE_OPTION and self.question:
+            self.options.append(text)
+            if is_correct:
+                self.correct_index = len(self.options) - 1
+        return None
+    
+    def finish(self) -> Optional[CompletedQuestion]:
+        """Oxirgi (yoki joriy) savol"""
+        if self.question and self.options:
+            return self.question, self.options, self.correct_index
+        return None
+
+
+class _QuestionMarkAssembler(_ClassicAssembler):
+    """Yangi format: ?savol, +to'g'ri javob, =noto'g'ri variant"""
+    
+    def feed(self, para: str) -> Optional[CompletedQuestion]:
+        para = para.strip()
+        if not para:
+            return None
+        
+        # Savol (? bilan boshlanadi) - barcha ? belgilari olib tashlanadi
+        if para[0] == '?':
+            completed = self.finish()
+            self.question = para.lstrip('?').strip()
+            self.options = []
+            self.correct_index = -1
+            return completed
+        
+        if not self.question:
+            return None
+        
+        # To'g'ri javob (+) yoki noto'g'ri variant (=)
+        if para[0] == '+':
+            self.options.append(para[1:].strip())
+            self.correct_index = len(self.options) - 1
+        elif para[0] == '=':
+            self.options.append(para[1:].strip())
+        return None
+
+
+def _assemble(assembler: _ClassicAssembler, paragraphs: Iterable[str]) -> Iterator[CompletedQuestion]:
+    """Paragraflar oqimidan tugagan savollar oqimi"""
+    for para in paragraphs:
+        completed = assembler.feed(para)
+        if completed is not None:
+            yield completed
+    completed = assembler.finish()
+    if completed is not None:
+        yield completed
+
+
+@dataclass
+class DocumentChunk:
+    """
+    Hujjat bo'lagi (DocxParser.parse_chunk natijasi).
+
+    Bo'lak qatorlari birinchi va oxirgi savol boshida kesiladi: head -
+    oldingi bo'lakdagi savolning davomi, questions - to'liq bo'lakda
+    joylashgan savollar, tail - keyingi bo'lakda davom etishi mumkin
+    bo'lgan oxirgi savol qatorlari. Savol boshi bo'lmasa hamma qatorlar head'da.
+    """
+    has_text: bool
+    question_mark: bool  # Bo'lakda ? bilan boshlangan qator bor
+    head: list[str]
+    questions: list[CompletedQuestion]
+    tail: list[str]
+    warnings: list[str] = field(default_factory=list)  # Hujjat haqida (birinchi bo'lakda)
 
 
 @dataclass
@@ -50,32 +546,51 @@ class DocxParser:
     C) Variant 3
     """
     
-    # Savol boshlanish pattern'lari
-    QUESTION_PATTERNS = [
-        r'^\?+\s*(.+)$',  # ?Savol matni (yangi format)
-        r'^(\d+)\s*[\.\)\-]\s*(.+)$',  # 1. Savol yoki 1) Savol
-        r'^Savol\s*(\d+)\s*[\.\:\)]\s*(.+)$',  # Savol 1: Savol matni
-        r'^S\s*(\d+)\s*[\.\:\)]\s*(.+)$',  # S1. Savol matni
-    ]
+    # To'g'ri javob belgilari
+    CORRECT_MARKERS = CORRECT_MARKERS
+    
+    # progress chaqiruvlari orasidagi eng kam vaqt (soniya)
+    PROGRESS_INTERVAL = 0.5
     
-    # Variant pattern'lari (klassik A, B, C, D)
-    OPTION_PATTERNS = [
-        r'^([A-Za-z])\s*[\)\.\-]\s*(.+)$',  # A) variant yoki A. variant
-        r'^(\d+)\s*[\)\.\-]\s*(.+)$',  # 1) variant
-    ]
+    NO_QUESTIONS_MESSAGE = (
+        "❌ Hech qanday savol topilmadi.\n\n"
+        "📝 Quyidagi formatlardan birini ishlating:\n\n"
+        "<b>Format 1:</b>\n"
+        "?Savol matni\n"
+        "+To'g'ri javob\n"
+        "=Noto'g'ri variant\n"
+        "=Noto'g'ri variant\n\n"
+        "<b>Format 2:</b>\n"
+        "1. Savol matni?\n"
+        "A) Birinchi variant\n"
+        "*B) To'g'ri javob\n"
+        "C) Uchinchi variant"
+    )
     
-    # To'g'ri javob belgilari
-    CORRECT_MARKERS = ['*', '+', '✓', '✔', '√']
+    EMPTY_MESSAGE = "❌ Fayl bo'sh yoki matn topilmadi."
     
-    def __init__(self):
-        self.questions: list[Question] = []
-        self.warnings: list[str] = []
+    def __init__(self, max_part_size: Optional[int] = None, error_budget: Optional[int] = None):
+        self.max_part_size = max_part_size or config.parsing.max_part_size
+        self.error_budget = config.parsing.error_budget if error_budget is None else error_budget
+        self._reset()
     
-    async def parse_file(self, file_path: str) -> ParseResult:
-        """DOCX faylni parse qilish"""
+    def parse(self, source: Union[str, bytes, IO[bytes]],
+              progress: Optional[Callable[[float, int], None]] = None) -> ParseResult:
+        """
+        DOCX faylni (yo'l, bytes yoki seek qilinadigan fayl obyekti) parse qilish.
+        
+        Sinxron va CPU talab qiladi - event loop ichida katta fayllar uchun
+        parse_pool orqali chaqiriladi. progress(ulush, savollar) berilsa,
+        u parse davomida PROGRESS_INTERVAL da ko'pi bilan bir marta chaqiriladi.
+        """
         try:
-            doc = Document(file_path)
-            return await self._parse_document(doc)
+            if isinstance(source, (bytes, bytearray)):
+                source = io.BytesIO(source)
+            on_read = self._progress_reporter(progress) if progress else None
+            result = self._parse_paragraphs(iter_docx_paragraphs(source, self.max_part_size, on_read))
+            if result.success:
+                result.warnings.extend(self._media_warnings(source))
+            return result
         except Exception as e:
             return ParseResult(
                 success=False,
@@ -83,177 +598,286 @@ class DocxParser:
                 error_message=f"Faylni o'qishda xato: {str(e)}"
             )
     
+    async def parse_file(self, file_path: str) -> ParseResult:
+        """DOCX faylni parse qilish (joriy jarayonda)"""
+        return self.parse(file_path)
+    
     async def parse_bytes(self, file_bytes) -> ParseResult:
-        """Bytes dan parse qilish"""
-        import io
-        try:
-            doc = Document(io.BytesIO(file_bytes))
-            return await self._parse_document(doc)
-        except Exception as e:
-            return ParseResult(
-                success=False,
-                questions=[],
-                error_message=f"Faylni o'qishda xato: {str(e)}"
-            )
+        """Bytes dan parse qilish (joriy jarayonda)"""
+        return self.parse(file_bytes)
     
-    async def _parse_document(self, doc: Document) -> ParseResult:
-        """Document obyektini parse qilish"""
-        self.questions = []
-        self.warnings = []
+    def _parse_paragraphs(self, texts: Iterable[str]) -> ParseResult:
+        """
+        Paragraf matnlarini oqim bilan parse qilish.
+        
+        Har bir savol tugashi bilan tekshiriladi; xatolar error_budget dan
+        oshsa qolgan paragraflar o'qilmaydi. Format birinchi ? bilan
+        boshlangan paragrafgacha klassik deb hisoblanadi - u uchrasa,
+        shu paytgacha yig'ilgan klassik savollar tashlab yuboriladi
+        (butun fayl yangi formatda o'qiladi). Shuning uchun klassik
+        xatolar chegaradan oshsa ham, natija faqat fayl oxirida beriladi:
+        qolgan paragraflar savolga yig'ilmaydi, faqat ? qatori qidiriladi.
+        """
+        self._reset()
+        assembler = _ClassicAssembler()
+        question_mark_format = False
+        has_text = False
+        classic_aborted: Optional[ParseResult] = None
         
-        # Barcha paragraflarni olish
-        paragraphs = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
+        for text in texts:
+            text = text.strip()
+            if not text:
+                continue
+            has_text = True
+            
+            # Yangi format: ?savol, +to'g'ri, =noto'g'ri
+            if not question_mark_format and text[0] == '?':
+                question_mark_format = True
+                assembler = _QuestionMarkAssembler()
+                classic_aborted = None
+                self._reset()
+            elif classic_aborted is not None:
+                continue
+            
+            if not self._accept(assembler.feed(text)):
+                if question_mark_format:
+                    return self._validate_and_return(aborted=True)
+                classic_aborted = self._validate_and_return(aborted=True)
         
-        if not paragraphs:
+        if not has_text:
             return ParseResult(
                 success=False,
                 questions=[],
-                error_message="❌ Fayl bo'sh yoki matn topilmadi."
+                error_message=self.EMPTY_MESSAGE
             )
+        if classic_aborted is not None:
+            return classic_aborted
+        
+        self._accept(assembler.finish())
+        return self._validate_and_return()
+    
+    def parse_chunk(self, source: Union[str, bytes, IO[bytes]], index: int, count: int,
+                    progress: Optional[Callable[[float, int], None]] = None) -> Optional[DocumentChunk]:
+        """
+        Hujjatning index-bo'lagini (count tadan) o'qish - parse_pool katta
+        fayllarni bo'laklarga bo'lib, ularni parallel o'qiydi.
+        
+        Xato bo'lsa (chegara jadval ichiga tushgan, fayl buzilgan va h.k.)
+        None qaytariladi: fayl butunligicha parse qilinadi va xato xabari
+        o'sha yerda shakllanadi. progress - bo'lak bo'yicha ulush.
+        """
+        lines: list[str] = []
+        classic_starts: list[int] = []
+        question_starts: list[int] = []
+        try:
+            if isinstance(source, (bytes, bytearray)):
+                source = io.BytesIO(source)
+            on_read = None
+            if progress is not None:
+                report = self._progress_reporter(
+                    lambda fraction, _: progress(fraction, len(question_starts) or len(classic_starts))
+                )
+                
+                def report_chunk(consumed: int, total: int) -> None:
+                    low, high = total * index // count, total * (index + 1) // count
+                    report(max(0, consumed - low), high - low)
+                
+                on_read = report_chunk
+            
+            for text in iter_docx_chunk(source, index, count, self.max_part_size, on_read):
+                text = text.strip()
+                if not text:
+                    continue
+                if text[0] == '?':
+                    question_starts.append(len(lines))
+                elif _is_classic_question(text):
+                    classic_starts.append(len(lines))
+                lines.append(text)
+        except Exception:
+            return None
         
-        # Formatni aniqlash
-        has_question_mark_format = any(p.startswith('?') for p in paragraphs)
+        question_mark = bool(question_starts)
+        warnings = self._media_warnings(source) if index == 0 else []
+        starts = question_starts if question_mark else classic_starts
+        if not starts:
+            return DocumentChunk(bool(lines), question_mark, lines, [], [], warnings)
         
-        if has_question_mark_format:
-            # Yangi format: ?savol, +to'g'ri, =noto'g'ri
-            return await self._parse_question_mark_format(paragraphs)
-        else:
-            # Klassik format: 1. Savol, A) variant
-            return await self._parse_classic_format(paragraphs)
+        assembler = _QuestionMarkAssembler() if question_mark else _ClassicAssembler()
+        return DocumentChunk(
+            has_text=True,
+            question_mark=question_mark,
+            head=lines[:starts[0]],
+            questions=list(_assemble(assembler, lines[starts[0]:starts[-1]])),
+            tail=lines[starts[-1]:],
+            warnings=warnings
+        )
     
-    async def _parse_question_mark_format(self, paragraphs: list[str]) -> ParseResult:
+    def merge_chunks(self, chunks: list[Optional[DocumentChunk]]) -> Optional[ParseResult]:
+        """
+        parse_chunk natijalarini hujjat tartibida birlashtirish va tekshirish.
+        
+        Bo'laklar chegarasidagi savol (tail + keyingi head) qayta yig'iladi,
+        savollar raqami va error_budget butun hujjat bo'yicha hisoblanadi.
+        Birlashtirib bo'lmasa None (fayl butunligicha parse qilinadi).
+        """
+        if any(chunk is None for chunk in chunks):
+            return None
+        if not any(chunk.has_text for chunk in chunks):
+            return ParseResult(success=False, questions=[], error_message=self.EMPTY_MESSAGE)
+        
+        document_warnings = chunks[0].warnings
+        question_mark = any(chunk.question_mark for chunk in chunks)
+        self._reset()
+        if question_mark:
+            # Birinchi ? qatorigacha bo'lgan qism o'qilmaydi (_parse_paragraphs kabi
+            # butun fayl yangi formatda): klassik xatolar natijaga ta'sir qilmaydi
+            first = next(i for i, chunk in enumerate(chunks) if chunk.question_mark)
+            chunks = chunks[first:]
+            # ? qatorisiz bo'lak klassik format bo'yicha kesilgan - qatorlari faqat
+            # unda klassik savol boshi ham bo'lmasa (hammasi head'da) yaroqli
+            if any(not chunk.question_mark and chunk.tail for chunk in chunks):
+                return None
+        
+        assembler = _QuestionMarkAssembler() if question_mark else _ClassicAssembler()
+        for question in self._merged_questions(chunks, assembler):
+            if not self._accept(question):
+                return self._validate_and_return(aborted=True)
+        self._accept(assembler.finish())
+        result = self._validate_and_return()
+        if result.success:
+            result.warnings.extend(document_warnings)
+        return result
+    
+    @staticmethod
+    def _merged_questions(chunks: list[DocumentChunk],
+                          assembler: _ClassicAssembler) -> Iterator[CompletedQuestion]:
+        """
+        Bo'laklar savollari hujjat tartibida (chegaradagilari qayta yig'ilgan).
+        Oxirgi savol assembler'da qoladi - uni assembler.finish() qaytaradi.
+        """
+        pending: list[str] = []
+        for chunk in chunks:
+            pending.extend(chunk.head)
+            if chunk.tail:
+                yield from _assemble(type(assembler)(), pending)
+                yield from chunk.questions
+                pending = list(chunk.tail)
+        
+        for para in pending:
+            completed = assembler.feed(para)
+            if completed is not None:
+                yield completed
+    
+    def _parse_question_mark_format(self, paragraphs: Iterable[str]) -> ParseResult:
         """
         Yangi format parse qilish:
         ?Savol matni
         +To'g'ri javob
         =Noto'g'ri variant
         """
-        current_question = None
-        current_options = []
-        correct_index = -1
-        
-        for para in paragraphs:
-            para = para.strip()
-            if not para:
-                continue
-            
-            # Savol (? bilan boshlanadi)
-            if para.startswith('?'):
-                # Oldingi savolni saqlash
-                if current_question and current_options:
-                    self._save_question(current_question, current_options, correct_index)
-                
-                # Yangi savol - barcha ? belgilarini olib tashlash
-                current_question = para.lstrip('?').strip()
-                current_options = []
-                correct_index = -1
-                continue
-            
-            # To'g'ri javob (+ bilan boshlanadi)
-            if para.startswith('+') and current_question:
-                option_text = para[1:].strip()
-                current_options.append(option_text)
-                correct_index = len(current_options) - 1
-                continue
-            
-            # Noto'g'ri variant (= bilan boshlanadi)
-            if para.startswith('=') and current_question:
-                option_text = para[1:].strip()
-                current_options.append(option_text)
-                continue
-        
-        # Oxirgi savolni saqlash
-        if current_question and current_options:
-            self._save_question(current_question, current_options, correct_index)
-        
-        return self._validate_and_return()
+        return self._parse_with(_QuestionMarkAssembler(), paragraphs)
     
-    async def _parse_classic_format(self, paragraphs: list[str]) -> ParseResult:
+    def _parse_classic_format(self, paragraphs: Iterable[str]) -> ParseResult:
         """
         Klassik format parse qilish:
         1. Savol matni?
         A) Variant
         *B) To'g'ri javob
         """
-        current_question = None
-        current_options = []
-        correct_index = -1
-        
-        for para in paragraphs:
-            # Savol ekanligini tekshirish
-            question_match = self._match_question(para)
-            if question_match:
-                # Oldingi savolni saqlash
-                if current_question and current_options:
-                    self._save_question(current_question, current_options, correct_index)
-                
-                # Yangi savol
-                current_question = question_match
-                current_options = []
-                correct_index = -1
-                continue
-            
-            # Variant ekanligini tekshirish
-            option_match = self._match_option(para)
-            if option_match and current_question:
-                option_text, is_correct = option_match
-                current_options.append(option_text)
-                if is_correct:
-                    correct_index = len(current_options) - 1
+        return self._parse_with(_ClassicAssembler(), paragraphs)
+    
+    def _parse_with(self, assembler, paragraphs: Iterable[str]) -> ParseResult:
+        """Paragraflarni bitta format yig'uvchisi orqali o'tkazish"""
+        return self._collect(_assemble(assembler, paragraphs))
+    
+    def _collect(self, completed: Iterable[CompletedQuestion]) -> ParseResult:
+        """Tayyor savollarni saqlash va tekshirish (CSV/JSON import ham shu yo'ldan)"""
+        self._reset()
+        for question in completed:
+            if not self._accept(question):
+                return self._validate_and_return(aborted=True)
+        return self._validate_and_return()
+    
+    @staticmethod
+    def _media_warnings(source: Union[str, IO[bytes]]) -> list[str]:
+        """O'qilmagan rasm va media haqida ogohlantirish (arxiv katalogidan)"""
+        with zipfile.ZipFile(source) as archive:
+            media = media_entries(archive)
+        if not media:
+            return []
+        size = sum(info.file_size for info in media)
+        size_text = f"{size / (1024 * 1024):.1f} MB" if size >= 1024 * 1024 else f"{max(1, size // 1024)} KB"
+        return [
+            f"🖼 Hujjatdagi {len(media)} ta rasm va media fayl ({size_text}) o'qilmadi - "
+            f"testga faqat matn olinadi."
+        ]
+    
+    def _reset(self) -> None:
+        self.questions = []
+        self.warnings = []
+        self._without_correct: list[int] = []
+        self._few_options: list[int] = []
+        self._seen_texts: dict[str, str] = {}  # Hujjat ichidagi teng matnlar (text_pool uchun)
+    
+    def _accept(self, completed: Optional[CompletedQuestion]) -> bool:
+        """Tugagan savolni saqlash. Xatolar chegaradan oshsa False"""
+        if completed is None:
+            return True
+        self._save_question(*completed)
+        return len(self._without_correct) + len(self._few_options) <= self.error_budget
+    
+    def _progress_reporter(self, progress: Callable[[float, int], None]) -> Callable[[int, int], None]:
+        """iter_docx_paragraphs uchun on_read: progress'ni PROGRESS_INTERVAL da bir chaqiradi"""
+        last_report = time.monotonic()
         
-        # Oxirgi savolni saqlash
-        if current_question and current_options:
-            self._save_question(current_question, current_options, correct_index)
+        def on_read(consumed: int, total: int) -> None:
+            nonlocal last_report
+            now = time.monotonic()
+            if now - last_report >= self.PROGRESS_INTERVAL:
+                last_report = now
+                progress(min(consumed / total, 1.0) if total else 1.0, len(self.questions))
         
-        return self._validate_and_return()
+        return on_read
     
-    def _validate_and_return(self) -> ParseResult:
+    def _validate_and_return(self, aborted: bool = False) -> ParseResult:
         """Natijani tekshirish va qaytarish"""
         # Natijani tekshirish
         if not self.questions:
             return ParseResult(
                 success=False,
                 questions=[],
-                error_message="❌ Hech qanday savol topilmadi.\n\n"
-                             "📝 Quyidagi formatlardan birini ishlating:\n\n"
-                             "<b>Format 1:</b>\n"
-                             "?Savol matni\n"
-                             "+To'g'ri javob\n"
-                             "=Noto'g'ri variant\n"
-                             "=Noto'g'ri variant\n\n"
-                             "<b>Format 2:</b>\n"
-                             "1. Savol matni?\n"
-                             "A) Birinchi variant\n"
-                             "*B) To'g'ri javob\n"
-                             "C) Uchinchi variant"
+                error_message=self.NO_QUESTIONS_MESSAGE
             )
         
-        # Xatolarni tekshirish
-        questions_without_correct = [
-            i+1 for i, q in enumerate(self.questions) if q.correct_index == -1
-        ]
+        errors = []
         
-        if questions_without_correct:
-            return ParseResult(
-                success=False,
-                questions=[],
-                error_message=f"❌ Quyidagi savollarda to'g'ri javob belgilanmagan:\n"
-                             f"Savollar: {', '.join(map(str, questions_without_correct))}\n\n"
-                             f"💡 To'g'ri javobni + belgisi bilan belgilang:\n"
-                             f"+To'g'ri javob"
+        # Xatolarni tekshirish (savollar saqlanayotganda yig'ilgan)
+        if self._without_correct:
+            errors.append(
+                f"❌ Quyidagi savollarda to'g'ri javob belgilanmagan:\n"
+                f"Savollar: {', '.join(map(str, self._without_correct))}\n\n"
+                f"💡 To'g'ri javobni + belgisi bilan belgilang:\n"
+                f"+To'g'ri javob"
             )
         
-        # Kam variantli savollar
-        questions_few_options = [
-            i+1 for i, q in enumerate(self.questions) if len(q.options) < 2
-        ]
+        # Kam variantli savollar (oxirigacha o'qilganda faqat birinchi xato turi ko'rsatiladi)
+        if self._few_options and (aborted or not errors):
+            errors.append(
+                f"❌ Quyidagi savollarda kamida 2 ta variant bo'lishi kerak:\n"
+                f"Savollar: {', '.join(map(str, self._few_options))}"
+            )
         
-        if questions_few_options:
+        if aborted:
+            errors.append(
+                f"⚠️ Xatolar {self.error_budget} tadan oshgani uchun tekshiruv "
+                f"{len(self.questions)}-savolda to'xtatildi, qolgan qismi o'qilmadi."
+            )
+        
+        if errors:
             return ParseResult(
                 success=False,
                 questions=[],
-                error_message=f"❌ Quyidagi savollarda kamida 2 ta variant bo'lishi kerak:\n"
-                             f"Savollar: {', '.join(map(str, questions_few_options))}"
+                error_message="\n\n".join(errors)
             )
         
         return ParseResult(
@@ -264,65 +888,26 @@ class DocxParser:
     
     def _match_question(self, text: str) -> Optional[str]:
         """Savol ekanligini tekshirish (klassik format uchun)"""
-        # ?bilan boshlanganlarni bu yerda skip qilamiz
-        if text.startswith('?'):
-            return None
-            
-        for pattern in self.QUESTION_PATTERNS[1:]:  # Birinchi pattern ? uchun
-            match = re.match(pattern, text, re.IGNORECASE)
-            if match:
-                # Agar 2 ta guruh bo'lsa (raqam va matn)
-                if len(match.groups()) >= 2:
-                    return match.group(2).strip()
-                else:
-                    return match.group(1).strip()
-        return None
+        kind, question_text, _ = classify_line(text)
+        return question_text if kind == LINE_QUESTION else None
     
     def _match_option(self, text: str) -> Optional[tuple[str, bool]]:
         """Variant ekanligini tekshirish. (matn, to'g'rimi) qaytaradi"""
-        # + yoki = bilan boshlanganlarni skip qilamiz (yangi format)
-        if text.startswith('+') or text.startswith('='):
-            return None
-        
-        # To'g'ri javob belgisini tekshirish
-        is_correct = False
-        clean_text = text
-        
-        # Boshida * yoki + bor bo'lsa
-        for marker in self.CORRECT_MARKERS:
-            if text.startswith(marker):
-                is_correct = True
-                clean_text = text[1:].strip()
-                break
-        
-        # Oxirida * yoki + bor bo'lsa
-        if not is_correct:
-            for marker in self.CORRECT_MARKERS:
-                if text.endswith(marker):
-                    is_correct = True
-                    clean_text = text[:-1].strip()
-                    break
-        
-        # Variant pattern'ini tekshirish
-        for pattern in self.OPTION_PATTERNS:
-            match = re.match(pattern, clean_text, re.IGNORECASE)
-            if match:
-                option_text = match.group(2).strip()
-                # Oxiridagi * ni tozalash
-                for marker in self.CORRECT_MARKERS:
-                    if option_text.endswith(marker):
-                        is_correct = True
-                        option_text = option_text[:-1].strip()
-                return (option_text, is_correct)
-        
-        return None
+        return _classify_option(text) if text else None
     
     def _save_question(self, question_text: str, options: list[str], correct_index: int):
-        """Savolni saqlash"""
+        """Savolni saqlash va darhol tekshirish"""
+        number = len(self.questions) + 1
+        if correct_index == -1:
+            self._without_correct.append(number)
+        if len(options) < 2:
+            self._few_options.append(number)
+        
+        # Normallashtirilgan teng variantlar bitta str obyektiga aylanadi
         question = Question(
             id=str(uuid.uuid4())[:8],
-            text=question_text,
-            options=options,
+            text=text_pool.intern(normalize_text(question_text), self._seen_texts),
+            options=[text_pool.intern(normalize_text(option), self._seen_texts) for option in options],
             correct_index=correct_index
         )
         self.questions.append(question)
@@ -0,0 +1,239 @@
+"""
+Edit Coalescer Service
+Bir xil xabarga yuboriladigan edit_text chaqiruvlarini birlashtirish
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import InlineKeyboardMarkup, Message
+
+from bot.config import config
+from bot.services.outbound_scheduler import OutboundDropped, Priority, outbound_priority
+
+logger = logging.getLogger(__name__)
+
+EditKey = tuple[int, int]  # (chat_id, message_id)
+
+
+@dataclass
+class PendingEdit:
+    """Navbatdagi (hali yuborilmagan) edit"""
+    message: Message
+    text: str
+    reply_markup: Optional[InlineKeyboardMarkup]
+    parse_mode: Optional[str]
+    content_hash: int
+
+
+class EditCoalescer:
+    """
+    message.edit_text chaqiruvlarini (chat_id, message_id) bo'yicha birlashtiradi.
+
+    - Har bir xabar uchun faqat oxirgi kutilayotgan matn saqlanadi
+    - Matn va tugmalar o'zgarmagan bo'lsa, edit yuborilmaydi
+    - Edit'lar belgilangan tezlikda (flush_interval / min_edit_interval) yuboriladi
+    - edit_now bilan yakunlangan xabarga keyingi kosmetik edit'lar yuborilmaydi
+    """
+
+    def __init__(self, flush_interval: float = 0.25, min_edit_interval: float = 1.0,
+                 max_edits_per_flush: int = 20, max_tracked: int = 10000):
+        self.flush_interval = flush_interval
+        self.min_edit_interval = min_edit_interval
+        self.max_edits_per_flush = max_edits_per_flush
+        self.max_tracked = max_tracked
+
+        self._pending: OrderedDict[EditKey, PendingEdit] = OrderedDict()
+        self._last_hash: OrderedDict[EditKey, int] = OrderedDict()  # Oxirgi yuborilgan kontent
+        self._last_sent_at: dict[EditKey, float] = {}
+        self._final: OrderedDict[EditKey, None] = OrderedDict()  # edit_now bilan yakunlangan xabarlar
+        self._inflight: dict[EditKey, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        # Hisoblagichlar
+        self.stats = {"requested": 0, "merged": 0, "skipped": 0, "sent": 0, "shed": 0, "failed": 0}
+
+    # ==================== PUBLIC API ====================
+
+    async def edit(self, message: Message, text: str,
+                   reply_markup: Optional[InlineKeyboardMarkup] = None,
+                   parse_mode: Optional[str] = "HTML") -> None:
+        """Edit'ni navbatga qo'yish (kosmetik yangilanishlar uchun)"""
+        self.stats["requested"] += 1
+        key = self._key(message)
+        if key in self._final:
+            # Xabar yakuniy ko'rinishda - kechikkan kosmetik edit uni buzmasligi kerak
+            self.stats["skipped"] += 1
+            return
+        content_hash = self._hash(text, reply_markup)
+
+        if self._last_hash.get(key) == content_hash and key not in self._inflight:
+            # Xabar allaqachon shu ko'rinishda - kutilayotgan eski edit ham kerak emas
+            if self._pending.pop(key, None) is not None:
+                self.stats["merged"] += 1
+            self.stats["skipped"] += 1
+            return
+        if key in self._pending:
+            self.stats["merged"] += 1
+
+        self._pending[key] = PendingEdit(message, text, reply_markup, parse_mode, content_hash)
+        self._pending.move_to_end(key)
+        self._ensure_running()
+
+    async def edit_now(self, message: Message, text: str,
+                       reply_markup: Optional[InlineKeyboardMarkup] = None,
+                       parse_mode: Optional[str] = "HTML", final: bool = True) -> bool:
+        """
+        Edit'ni darhol yuborish (javob, natija kabi muhim o'zgarishlar uchun).
+        Kutilayotgan eski edit bekor qilinadi, shuning uchun u keyinroq ustiga yozmaydi.
+        final=True bo'lsa keyingi edit() chaqiruvlari ham tashlab yuboriladi;
+        xabar yana yangilanadigan bo'lsa (masalan, taymerli savol) final=False.
+        """
+        self.stats["requested"] += 1
+        key = self._key(message)
+        if final:
+            self._mark_final(key)
+        else:
+            self._final.pop(key, None)
+        self._pending.pop(key, None)
+        await self._wait_inflight(key)
+        # Kutish paytida navbatga tushgan edit'lar ham shu matndan eski
+        self._pending.pop(key, None)
+
+        content_hash = self._hash(text, reply_markup)
+        if self._last_hash.get(key) == content_hash:
+            self.stats["skipped"] += 1
+            return True
+
+        return await self._send(
+            key,
+            PendingEdit(message, text, reply_markup, parse_mode, content_hash),
+            priority=Priority.INTERACTIVE
+        )
+
+    def forget(self, message: Message) -> None:
+        """Xabar bo'yicha barcha kutilayotgan edit va holatni o'chirish"""
+        key = self._key(message)
+        self._pending.pop(key, None)
+        self._last_hash.pop(key, None)
+        self._last_sent_at.pop(key, None)
+        self._final.pop(key, None)
+
+    @property
+    def pending_count(self) -> int:
+        """Navbatdagi edit'lar soni"""
+        return len(self._pending)
+
+    async def stop(self) -> None:
+        """Flush siklini to'xtatish va qolgan edit'larni yuborish"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._pending:
+            key, pending = self._pending.popitem(last=False)
+            await self._send(key, pending, priority=Priority.INTERACTIVE)
+
+    # ==================== ICHKI METODLAR ====================
+
+    @staticmethod
+    def _key(message: Message) -> EditKey:
+        return message.chat.id, message.message_id
+
+    @staticmethod
+    def _hash(text: str, reply_markup: Optional[InlineKeyboardMarkup]) -> int:
+        markup = reply_markup.model_dump_json(exclude_none=True) if reply_markup else ""
+        return hash((text, markup))
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """Navbatdagi edit'larni belgilangan tezlikda yuborish"""
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            await self._flush()
+
+    async def _flush(self) -> None:
+        now = time.monotonic()
+        sent = 0
+        for key in list(self._pending):
+            if sent >= self.max_edits_per_flush:
+                break
+            if key in self._inflight:
+                continue
+            if now - self._last_sent_at.get(key, 0.0) < self.min_edit_interval:
+                continue
+
+            pending = self._pending.pop(key)
+            task = asyncio.create_task(self._send(key, pending))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _, k=key: self._inflight.pop(k, None))
+            sent += 1
+
+    async def _wait_inflight(self, key: EditKey) -> None:
+        task = self._inflight.get(key)
+        if task:
+            try:
+                await task
+            except Exception:
+                pass
+
+    async def _send(self, key: EditKey, pending: PendingEdit,
+                    priority: Priority = Priority.COSMETIC) -> bool:
+        """Edit'ni Telegram'ga yuborish"""
+        kwargs: dict[str, Any] = {"parse_mode": pending.parse_mode}
+        if pending.reply_markup is not None:
+            kwargs["reply_markup"] = pending.reply_markup
+
+        try:
+            with outbound_priority(priority):
+                await pending.message.edit_text(pending.text, **kwargs)
+        except OutboundDropped:
+            # Yuklama katta - keyingi yangilanish baribir yangi matnni olib keladi
+            self.stats["shed"] += 1
+            return False
+        except TelegramBadRequest as e:
+            if "message is not modified" not in str(e):
+                self.stats["failed"] += 1
+                logger.debug(f"Edit yuborilmadi {key}: {e}")
+                return False
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.debug(f"Edit yuborilmadi {key}: {e}")
+            return False
+
+        self.stats["sent"] += 1
+        self._remember(key, pending.content_hash)
+        return True
+
+    def _mark_final(self, key: EditKey) -> None:
+        self._final[key] = None
+        self._final.move_to_end(key)
+        while len(self._final) > self.max_tracked:
+            self._final.popitem(last=False)
+
+    def _remember(self, key: EditKey, content_hash: int) -> None:
+        self._last_hash[key] = content_hash
+        self._last_hash.move_to_end(key)
+        self._last_sent_at[key] = time.monotonic()
+
+        # Xotirani cheklash - eng eski xabarlarni unutish
+        while len(self._last_hash) > self.max_tracked:
+            old_key, _ = self._last_hash.popitem(last=False)
+            self._last_sent_at.pop(old_key, None)
+
+
+# Global edit coalescer
+edit_coalescer = EditCoalescer(
+    flush_interval=config.outbound.edit_flush_interval,
+    min_edit_interval=config.outbound.edit_min_interval
+)
@@ -0,0 +1,367 @@
+"""
+Importers Service
+Matn (.txt), CSV va JSON fayllardan savollarni o'qib olish
+"""
+import csv
+import io
+import json
+import os
+import re
+from abc import ABC, abstractmethod
+from typing import IO, Any, Callable, Iterable, Iterator, Optional, Union
+
+from bot.services.docx_parser import CompletedQuestion, DocxParser, ParseResult
+from bot.utils import escape_html
+
+# Progress har shuncha yozuvda (qator, element) bir tekshiriladi
+TRACK_EVERY = 256
+
+# CSV ajratuvchisini aniqlash uchun o'qiladigan namuna hajmi
+SNIFF_SIZE = 64 * 1024
+
+# JSON bo'laklab o'qiladi
+JSON_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'\s*')
+
+# {"questions": [...]} fayl boshi - ichki massiv oqim bilan o'qiladi
+_QUESTIONS_WRAPPER = re.compile(r'\{\s*"questions"\s*:\s*\[')
+
+
+# ==================== UMUMIY ====================
+
+class _TextImporter(DocxParser, ABC):
+    """
+    Matnli fayllar uchun asos: UTF-8 oqim bilan o'qiladi, yozuvlar
+    DocxParser'ning savol yaratish va tekshirish yo'lidan o'tadi
+    (error_budget, xabarlar bir xil).
+    """
+
+    def parse(self, source: Union[str, bytes, IO[bytes]],
+              progress: Optional[Callable[[float, int], None]] = None) -> ParseResult:
+        """Faylni (yo'l, bytes yoki fayl obyekti) parse qilish"""
+        try:
+            if isinstance(source, (bytes, bytearray)):
+                source = io.BytesIO(source)
+            if isinstance(source, str):
+                with open(source, "rb") as raw:
+                    return self._parse_binary(raw, progress)
+            return self._parse_binary(source, progress)
+        except UnicodeDecodeError:
+            return ParseResult(
+                success=False,
+                questions=[],
+                error_message="❌ Fayl UTF-8 kodlashda saqlangan bo'lishi kerak."
+            )
+        except Exception as e:
+            return ParseResult(
+                success=False,
+                questions=[],
+                # Xabar HTML sifatida ko'rsatiladi, matnda fayldagi belgilar bo'lishi mumkin
+                error_message=f"Faylni o'qishda xato: {escape_html(str(e))}"
+            )
+
+    def _parse_binary(self, raw: IO[bytes], progress: Optional[Callable[[float, int], None]]) -> ParseResult:
+        # newline="" - CSV qatorlari ichidagi qator uzilishlari buzilmaydi
+        text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+        try:
+            records = self._read_records(text)
+            if progress is not None:
+                records = self._tracked(records, raw, progress)
+            return self._build(records)
+        finally:
+            # Chaqirgan kodning fayli yopilmaydi
+            text.detach()
+
+    @abstractmethod
+    def _read_records(self, text: IO[str]) -> Iterable:
+        """Fayldan yozuvlar oqimi (qatorlar, CSV qatorlari, JSON elementlari)"""
+
+    @abstractmethod
+    def _build(self, records: Iterable) -> ParseResult:
+        """Yozuvlardan ParseResult"""
+
+    def _tracked(self, records: Iterable, raw: IO[bytes],
+                 progress: Callable[[float, int], None]) -> Iterator:
+        """Yozuvlarni o'tkazib, fayldagi o'rin bo'yicha progress hisoblash"""
+        start = raw.tell()
+        total = raw.seek(0, os.SEEK_END) - start
+        raw.seek(start)
+        on_read = self._progress_reporter(progress)
+        for index, record in enumerate(records):
+            if index % TRACK_EVERY == 0:
+                on_read(raw.tell() - start, total)
+            yield record
+
+
+def resolve_answer(value: Any, options: list[str]) -> int:
+    """
+    To'g'ri javob indeksi (topilmasa -1).
+
+    value: harf ("B"), 1 dan boshlanadigan raqam ("2"), variant matni
+    yoki JSON'da 0 dan boshlanadigan butun son. Harf yoki raqam
+    variantlar sonidan oshsa, variant matni sifatida qidiriladi.
+    """
+    if isinstance(value, bool) or value is None:
+        return -1
+    if isinstance(value, int):
+        return value if 0 <= value < len(options) else -1
+
+    value = str(value).strip()
+    index = -1
+    if len(value) == 1 and 'A' <= value.upper() <= 'Z':
+        index = ord(value.upper()) - ord('A')
+    elif value.isdigit():
+        index = int(value) - 1
+    if 0 <= index < len(options):
+        return index
+    return options.index(value) if value in options else -1
+
+
+def _looks_like_answer(value: Optional[str]) -> bool:
+    """Javob ustuniga o'xshaydi: bitta harf yoki raqam"""
+    return bool(value) and ((len(value) == 1 and value.isalpha()) or value.isdigit())
+
+
+def _drop_empty(options: list[str], correct_index: int) -> tuple[list[str], int]:
+    """Bo'sh variantlarni olib tashlash (to'g'ri javob indeksi saqlanadi)"""
+    if all(options):
+        return options, correct_index
+    kept = [i for i, option in enumerate(options) if option]
+    return [options[i] for i in kept], kept.index(correct_index) if correct_index in kept else -1
+
+
+# ==================== MATN (.txt) ====================
+
+class TextImporter(_TextImporter):
+    """
+    .txt fayl: har bir qator - Word'dagi bitta paragraf.
+
+    Formatlar DocxParser bilan bir xil (?savol / +to'g'ri / =noto'g'ri
+    yoki klassik 1. Savol / A) variant).
+    """
+
+    def _read_records(self, text: IO[str]) -> Iterable[str]:
+        return text
+
+    def _build(self, records: Iterable[str]) -> ParseResult:
+        return self._parse_paragraphs(records)
+
+
+# ==================== CSV ====================
+
+class CsvImporter(_TextImporter):
+    """
+    CSV fayl: har bir qator - bitta savol.
+
+    savol, variant 1, variant 2, ..., to'g'ri javob
+
+    To'g'ri javob - harf (B), raqam (2, birdan boshlab) yoki variant
+    matni. Ajratuvchi (, ; yoki tab) avtomatik aniqlanadi. Birinchi
+    qatorning javobi aniqlanmasa va harf yoki raqam bo'lmasa, u sarlavha
+    deb o'tkazib yuboriladi.
+    """
+
+    NO_QUESTIONS_MESSAGE = (
+        "❌ Hech qanday savol topilmadi.\n\n"
+        "📝 CSV faylda har bir qator bitta savol:\n\n"
+        "<code>Savol matni;Variant A;Variant B;Variant C;B</code>\n\n"
+        "Oxirgi ustun - to'g'ri javob (harf, raqam yoki variant matni)."
+    )
+
+    def _read_records(self, text: IO[str]) -> Iterable[list[str]]:
+        return csv.reader(text, self._sniff(text.buffer))
+
+    def _build(self, records: Iterable[list[str]]) -> ParseResult:
+        return self._collect(self._questions(records))
+
+    @staticmethod
+    def _sniff(raw: IO[bytes]):
+        """Ajratuvchini fayl boshidan aniqlash (fayl o'rni o'zgarmaydi)"""
+        start = raw.tell()
+        sample = raw.read(SNIFF_SIZE).decode("utf-8", "ignore")
+        raw.seek(start)
+        try:
+            return csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            return csv.excel
+
+    @staticmethod
+    def _questions(rows: Iterable[list[str]]) -> Iterator[CompletedQuestion]:
+        first = True
+        for line, row in enumerate(rows, start=1):
+            cells = [cell.strip() for cell in row]
+            while cells and not cells[-1]:
+                cells.pop()
+            if not cells:
+                continue
+
+            question, options, answer = cells[0], cells[1:-1], cells[-1] if len(cells) > 1 else None
+            correct_index = resolve_answer(answer, options)
+            if first:
+                first = False
+                if correct_index == -1 and not _looks_like_answer(answer):
+                    # Sarlavha qatori ("Javob" kabi). Harf yoki raqam bo'lsa - bu savol,
+                    # javobi noto'g'ri bo'lsa xato sifatida ko'rsatiladi
+                    continue
+            if not question:
+                raise ValueError(f"{line}-qator: savol matni bo'sh")
+
+            options, correct_index = _drop_empty(options, correct_index)
+            yield question, options, correct_index
+
+
+# ==================== JSON ====================
+
+class JsonImporter(_TextImporter):
+    """
+    JSON massivi yoki JSON Lines (har qatorda bitta obyekt):
+
+    {"question": "Savol matni", "options": ["A", "B", "C"], "correct": 1}
+
+    correct - 0 dan boshlanadigan indeks, harf ("B") yoki variant matni.
+    {"questions": [...]} ko'rinishidagi fayl ham qabul qilinadi.
+    """
+
+    NO_QUESTIONS_MESSAGE = (
+        "❌ Hech qanday savol topilmadi.\n\n"
+        "📝 JSON fayl savollar ro'yxatidan iborat bo'lishi kerak:\n\n"
+        "<code>[{\"question\": \"Savol matni\", \"options\": [\"A\", \"B\", \"C\"], \"correct\": 1}]</code>\n\n"
+        "correct - to'g'ri javob indeksi (0 dan boshlab)."
+    )
+
+    def _read_records(self, text: IO[str]) -> Iterable[Any]:
+        for value in iter_json_values(text):
+            if isinstance(value, dict) and isinstance(value.get("questions"), list):
+                yield from value["questions"]
+            else:
+                yield value
+
+    def _build(self, records: Iterable[Any]) -> ParseResult:
+        return self._collect(
+            self._question(item, number) for number, item in enumerate(records, start=1)
+        )
+
+    @staticmethod
+    def _question(item: Any, number: int) -> CompletedQuestion:
+        if not isinstance(item, dict):
+            raise ValueError(f"{number}-element obyekt emas")
+
+        question = item.get("question", item.get("text"))
+        options = item.get("options")
+        if (not isinstance(question, str) or not question.strip()
+                or not isinstance(options, list)
+                or not all(isinstance(option, (str, int, float)) for option in options)):
+            raise ValueError(
+                f"{number}-savol: \"question\" matn, \"options\" esa variantlar ro'yxati bo'lishi kerak"
+            )
+
+        options = [str(option).strip() for option in options]
+        correct_index = resolve_answer(item.get("correct", item.get("answer")), options)
+        options, correct_index = _drop_empty(options, correct_index)
+        return question.strip(), options, correct_index
+
+
+def iter_json_values(text: IO[str]) -> Iterator[Any]:
+    """
+    JSON massivi elementlari yoki ketma-ket JSON qiymatlari (JSON Lines).
+
+    Fayl to'liq xotiraga yuklanmaydi: bo'laklab o'qilgan buferdan
+    qiymatlar raw_decode bilan birma-bir olinadi. {"questions": [...]}
+    bilan boshlangan fayldan ichki massiv elementlari qaytariladi
+    (obyektning boshqa kalitlari tashlab yuboriladi).
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    in_array: Optional[bool] = None
+    wrapped = closing = skip_value = False
+    expect_value = True
+    read_size = JSON_CHUNK_SIZE
+
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos == len(buffer):
+            if eof:
+                if in_array:
+                    raise ValueError("JSON massivi yopilmagan")
+                if closing:
+                    raise ValueError("JSON obyekti yopilmagan")
+                return
+            chunk = text.read(JSON_CHUNK_SIZE)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+            continue
+
+        char = buffer[pos]
+        if in_array is None:
+            wrapper = _QUESTIONS_WRAPPER.match(buffer, pos) if char == '{' else None
+            wrapped = wrapper is not None
+            in_array = wrapped or char == '['
+            if in_array:
+                pos = wrapper.end() if wrapped else pos + 1
+                continue
+
+        if in_array:
+            if char == ']':
+                if not wrapped:
+                    return
+                # {"questions": [...]} massivi tugadi - obyekt yopilishi kutiladi
+                pos += 1
+                in_array, wrapped, closing = False, False, True
+                continue
+            if not expect_value:
+                if char != ',':
+                    raise ValueError(f"JSON: ',' yoki ']' kutilgan, '{char}' topildi")
+                pos += 1
+                expect_value = True
+                continue
+
+        if closing:
+            closing = False
+            if char == '}':
+                pos += 1
+                continue
+            if char != ',':
+                raise ValueError(f"JSON: ',' yoki '}}' kutilgan, '{char}' topildi")
+            # Qolgan kalitlar alohida obyekt sifatida tekshiriladi va tashlab yuboriladi
+            buffer, pos, skip_value = "{" + buffer[pos + 1:], 0, True
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Qiymat bufer oxirida uzilgan - yana o'qish. O'qish hajmi har safar
+            # ikki barobar: katta qiymat bufer boshidan ko'p marta qayta o'qilmaydi
+            chunk = text.read(read_size)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+            read_size *= 2
+            continue
+
+        pos = end
+        expect_value = False
+        read_size = JSON_CHUNK_SIZE
+        if skip_value:
+            skip_value = False
+            if not value:
+                raise ValueError("JSON: ',' dan keyin kalit kutilgan")
+            continue
+        yield value
+
+
+# ==================== FORMATLAR ====================
+
+# Fayl kengaytmasi -> parser klassi
+PARSERS: dict[str, type[DocxParser]] = {
+    ".docx": DocxParser,
+    ".txt": TextImporter,
+    ".csv": CsvImporter,
+    ".json": JsonImporter,
+    ".jsonl": JsonImporter,
+}
+
+
+def file_format(file_name: Optional[str]) -> Optional[str]:
+    """Qo'llab-quvvatlanadigan fayl kengaytmasi (yoki None)"""
+    extension = os.path.splitext(file_name or "")[1].lower()
+    return extension if extension in PARSERS else None
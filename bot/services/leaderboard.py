@@ -0,0 +1,131 @@
+"""
+Leaderboard Service
+Guruh ishtirokchilari reytingini bosqichma-bosqich yuritish
+"""
+from typing import Iterator, Optional
+
+
+class Leaderboard:
+    """
+    Fenwick (binary indexed) daraxti asosidagi reyting.
+
+    Har bir natija (to'g'ri javoblar, javob berilgan savollar) bitta butun
+    songa kodlanadi: ko'proq to'g'ri javob yaxshiroq, teng bo'lsa kamroq
+    javob berilgani (kamroq xato) yaxshiroq. Daraxt siyrak (dict) - faqat
+    band qilingan tugunlar saqlanadi.
+
+    - update: O(log K)
+    - rank: O(log K)
+    - top(n): O(n + b log K), b - ko'rilgan turli natijalar soni
+    """
+
+    __slots__ = ("max_questions", "_size", "_step", "_tree", "_index", "_buckets")
+
+    def __init__(self, max_questions: int):
+        self.max_questions = max_questions
+        q = max_questions + 1
+        self._size = q * q  # Barcha mumkin bo'lgan natijalar soni
+        self._step = 1 << (self._size.bit_length() - 1)
+        self._tree: dict[int, int] = {}  # Fenwick tugunlari (siyrak)
+        self._index: dict[int, int] = {}  # user_id -> daraxtdagi pozitsiya
+        self._buckets: dict[int, dict[int, None]] = {}  # pozitsiya -> user_id'lar (qo'shilish tartibida)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._index
+
+    # ==================== PUBLIC API ====================
+
+    def update(self, user_id: int, correct: int, answered: int) -> None:
+        """Ishtirokchi natijasini qo'yish yoki yangilash"""
+        position = self._position(correct, answered)
+        old = self._index.get(user_id)
+        if old == position:
+            return
+        if old is not None:
+            self._detach(user_id, old)
+
+        self._index[user_id] = position
+        self._buckets.setdefault(position, {})[user_id] = None
+        self._add(position, 1)
+
+    def remove(self, user_id: int) -> None:
+        """Ishtirokchini reytingdan o'chirish"""
+        position = self._index.pop(user_id, None)
+        if position is not None:
+            self._detach(user_id, position, forget=False)
+
+    def rank(self, user_id: int) -> Optional[int]:
+        """Ishtirokchi o'rni (1 dan boshlanadi, teng natijalar bir xil o'rinda)"""
+        position = self._index.get(user_id)
+        if position is None:
+            return None
+        return self._prefix(position - 1) + 1
+
+    def top(self, n: Optional[int] = None) -> list[int]:
+        """Eng yaxshi n ta ishtirokchi (user_id) reyting tartibida"""
+        return list(self._iter_top(len(self._index) if n is None else n))
+
+    # ==================== ICHKI METODLAR ====================
+
+    def _position(self, correct: int, answered: int) -> int:
+        """Natijani daraxt pozitsiyasiga kodlash (1 - eng yaxshi natija)"""
+        q = self.max_questions + 1
+        wrong = max(0, answered - correct)
+        return (self.max_questions - min(correct, self.max_questions)) * q + min(wrong, self.max_questions) + 1
+
+    def _detach(self, user_id: int, position: int, forget: bool = True) -> None:
+        bucket = self._buckets[position]
+        del bucket[user_id]
+        if not bucket:
+            del self._buckets[position]
+        self._add(position, -1)
+        if forget:
+            self._index.pop(user_id, None)
+
+    def _add(self, position: int, delta: int) -> None:
+        tree = self._tree
+        while position <= self._size:
+            value = tree.get(position, 0) + delta
+            if value:
+                tree[position] = value
+            else:
+                tree.pop(position, None)
+            position += position & -position
+
+    def _prefix(self, position: int) -> int:
+        """1..position oralig'idagi ishtirokchilar soni"""
+        total = 0
+        tree = self._tree
+        while position > 0:
+            total += tree.get(position, 0)
+            position -= position & -position
+        return total
+
+    def _find(self, k: int) -> int:
+        """k-chi ishtirokchi turgan pozitsiya (binary lifting)"""
+        position = 0
+        step = self._step
+        tree = self._tree
+        while step:
+            nxt = position + step
+            if nxt <= self._size:
+                value = tree.get(nxt, 0)
+                if value < k:
+                    position = nxt
+                    k -= value
+            step >>= 1
+        return position + 1
+
+    def _iter_top(self, n: int) -> Iterator[int]:
+        seen = 0
+        total = min(n, len(self._index))
+        while seen < total:
+            bucket = self._buckets[self._find(seen + 1)]
+            for user_id in bucket:
+                yield user_id
+                seen += 1
+                if seen >= total:
+                    return
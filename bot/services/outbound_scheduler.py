@@ -0,0 +1,283 @@
+"""
+Outbound Scheduler Service
+Bot API so'rovlarini ustuvorlik (priority) bo'yicha navbatga qo'yish
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Hashable, Iterator, Optional
+
+from aiogram.methods import (
+    AnswerCallbackQuery,
+    AnswerInlineQuery,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    GetUpdates,
+    TelegramMethod,
+)
+
+from bot.config import config
+
+
+class Priority(IntEnum):
+    """So'rov ustuvorligi (kichik son - yuqori ustuvorlik)"""
+    CRITICAL = 0  # Yangi savol, yakuniy natijalar
+    INTERACTIVE = 1  # Javob tasdiqlari, callback javoblari
+    COSMETIC = 2  # Taymer va hisoblagich yangilanishlari
+
+
+class OutboundDropped(Exception):
+    """Kosmetik so'rov yuklama sababli tashlab yuborildi yoki yangisi bilan almashtirildi"""
+
+
+# Joriy kontekst uchun ustuvorlikni majburan belgilash
+_priority_override: ContextVar[Optional[Priority]] = ContextVar("outbound_priority", default=None)
+
+
+def current_priority() -> Optional[Priority]:
+    """Joriy kontekstda majburan belgilangan ustuvorlik"""
+    return _priority_override.get()
+
+
+@contextmanager
+def outbound_priority(priority: Priority) -> Iterator[None]:
+    """Blok ichidagi barcha Bot API chaqiruvlariga ustuvorlik berish"""
+    token = _priority_override.set(priority)
+    try:
+        yield
+    finally:
+        _priority_override.reset(token)
+
+
+@dataclass(order=True)
+class Ticket:
+    """Navbatdagi so'rov"""
+    priority: int
+    seq: int
+    key: Optional[Hashable] = field(compare=False, default=None)
+    enqueued_at: float = field(compare=False, default=0.0)
+    future: Optional[asyncio.Future] = field(compare=False, default=None)
+
+
+class ClassStats:
+    """Bitta ustuvorlik sinfi bo'yicha hisoblagichlar"""
+
+    __slots__ = ("sent", "dropped", "merged", "wait_total", "latency_total", "latency_max")
+
+    def __init__(self):
+        self.sent = 0
+        self.dropped = 0
+        self.merged = 0
+        self.wait_total = 0.0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "merged": self.merged,
+            "avg_wait_ms": round(self.wait_total / self.sent * 1000, 1) if self.sent else 0.0,
+            "avg_latency_ms": round(self.latency_total / self.sent * 1000, 1) if self.sent else 0.0,
+            "max_latency_ms": round(self.latency_max * 1000, 1),
+        }
+
+
+class OutboundScheduler:
+    """
+    Bot API so'rovlari oldidagi ustuvorlik navbati.
+
+    - So'rovlar CRITICAL > INTERACTIVE > COSMETIC tartibida yuboriladi
+    - Umumiy tezlik (rate_limit) va bir vaqtdagi so'rovlar soni (max_in_flight) cheklanadi
+    - Navbat to'lib ketganda birinchi navbatda kosmetik so'rovlar tashlab yuboriladi,
+      bir xil kalitli (chat_id, message_id) kosmetik so'rovlar birlashtiriladi
+    """
+
+    def __init__(self, rate_limit: float = 25.0, max_in_flight: int = 10,
+                 shed_threshold: int = 100, cosmetic_max_wait: float = 3.0):
+        self.rate_limit = rate_limit
+        self.max_in_flight = max_in_flight
+        self.shed_threshold = shed_threshold
+        self.cosmetic_max_wait = cosmetic_max_wait
+
+        self._heap: list[Ticket] = []
+        self._seq = itertools.count()
+        self._cosmetic_by_key: dict[Hashable, Ticket] = {}
+        self._queued: Counter = Counter()  # priority -> navbatdagi so'rovlar soni
+        self._in_flight = 0
+        self._tokens = rate_limit
+        self._last_refill = time.monotonic()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {p: ClassStats() for p in Priority}
+
+    # ==================== PUBLIC API ====================
+
+    @property
+    def queue_depth(self) -> int:
+        """Navbatdagi so'rovlar soni"""
+        return sum(self._queued.values())
+
+    def classify(self, method: TelegramMethod) -> Optional[Priority]:
+        """So'rov ustuvorligini aniqlash. None - navbatsiz yuboriladi"""
+        if isinstance(method, GetUpdates):
+            return None  # Long polling navbatni band qilmasligi kerak
+
+        override = current_priority()
+        if override is not None:
+            return override
+
+        if isinstance(method, (AnswerCallbackQuery, AnswerInlineQuery,
+                               EditMessageText, EditMessageReplyMarkup)):
+            return Priority.INTERACTIVE
+        return Priority.CRITICAL
+
+    @staticmethod
+    def merge_key(method: TelegramMethod) -> Optional[Hashable]:
+        """Kosmetik so'rovlarni birlashtirish kaliti"""
+        chat_id = getattr(method, "chat_id", None)
+        message_id = getattr(method, "message_id", None)
+        if chat_id is None or message_id is None:
+            return None
+        return type(method).__name__, chat_id, message_id
+
+    async def acquire(self, priority: Priority, key: Optional[Hashable] = None) -> Ticket:
+        """Navbatga turish va yuborish uchun ruxsat kutish"""
+        self._ensure_running()
+        stats = self._stats[priority]
+
+        if priority == Priority.COSMETIC:
+            # Yuklama katta - kosmetik so'rovni darhol tashlash
+            if self.queue_depth >= self.shed_threshold:
+                stats.dropped += 1
+                raise OutboundDropped("Navbat to'lgan")
+
+            # Eski kutilayotgan so'rovni yangisi bilan almashtirish
+            if key is not None:
+                old = self._cosmetic_by_key.pop(key, None)
+                if old is not None and not old.future.done():
+                    stats.merged += 1
+                    self._queued[priority] -= 1
+                    old.future.set_exception(OutboundDropped("Yangi so'rov bilan almashtirildi"))
+
+        ticket = Ticket(
+            priority=priority,
+            seq=next(self._seq),
+            key=key,
+            enqueued_at=time.monotonic(),
+            future=asyncio.get_running_loop().create_future()
+        )
+        if priority == Priority.COSMETIC and key is not None:
+            self._cosmetic_by_key[key] = ticket
+
+        heapq.heappush(self._heap, ticket)
+        self._queued[priority] += 1
+        self._wakeup.set()
+
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if not ticket.future.done():
+                # Hali navbatda - navbatdan chiqarilgan deb belgilash
+                ticket.future.cancel()
+                self._queued[priority] -= 1
+                self._forget_key(ticket)
+            elif not ticket.future.cancelled() and ticket.future.exception() is None:
+                # Ruxsat berilgan, lekin so'rov yuborilmaydi
+                self.release(ticket, sent=False)
+            raise
+
+        stats.wait_total += time.monotonic() - ticket.enqueued_at
+        return ticket
+
+    def release(self, ticket: Ticket, sent: bool = True) -> None:
+        """So'rov tugaganini bildirish"""
+        self._in_flight -= 1
+        if sent:
+            stats = self._stats[Priority(ticket.priority)]
+            latency = time.monotonic() - ticket.enqueued_at
+            stats.sent += 1
+            stats.latency_total += latency
+            stats.latency_max = max(stats.latency_max, latency)
+        if self._wakeup:
+            self._wakeup.set()
+
+    def stats(self) -> dict:
+        """Har bir sinf bo'yicha kechikish va tashlab yuborilganlar statistikasi"""
+        return {
+            "queue_depth": self.queue_depth,
+            "in_flight": self._in_flight,
+            "classes": {p.name.lower(): self._stats[p].as_dict() for p in Priority},
+        }
+
+    async def stop(self) -> None:
+        """Navbat siklini to'xtatish"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ==================== ICHKI METODLAR ====================
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._pump())
+
+    def _forget_key(self, ticket: Ticket) -> None:
+        if ticket.key is not None and self._cosmetic_by_key.get(ticket.key) is ticket:
+            del self._cosmetic_by_key[ticket.key]
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.rate_limit, self._tokens + (now - self._last_refill) * self.rate_limit)
+        self._last_refill = now
+
+    async def _pump(self) -> None:
+        """Navbatdan so'rovlarni ustuvorlik va tezlik bo'yicha chiqarish"""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            while self._heap and self._in_flight < self.max_in_flight:
+                self._refill()
+                if self._tokens < 1:
+                    await asyncio.sleep((1 - self._tokens) / self.rate_limit)
+                    continue
+
+                ticket = heapq.heappop(self._heap)
+                if ticket.future.done():
+                    continue  # Birlashtirilgan yoki bekor qilingan
+
+                priority = Priority(ticket.priority)
+                self._queued[priority] -= 1
+                self._forget_key(ticket)
+
+                # Juda uzoq kutgan kosmetik yangilanish endi ahamiyatsiz
+                if (priority == Priority.COSMETIC
+                        and time.monotonic() - ticket.enqueued_at > self.cosmetic_max_wait):
+                    self._stats[priority].dropped += 1
+                    ticket.future.set_exception(OutboundDropped("Kutish vaqti tugadi"))
+                    continue
+
+                self._tokens -= 1
+                self._in_flight += 1
+                ticket.future.set_result(None)
+
+
+# Global outbound scheduler
+outbound_scheduler = OutboundScheduler(
+    rate_limit=config.outbound.rate_limit,
+    max_in_flight=config.outbound.max_in_flight,
+    shed_threshold=config.outbound.shed_threshold,
+    cosmetic_max_wait=config.outbound.cosmetic_max_wait
+)
@@ -0,0 +1,408 @@
+"""
+Parse Pool Service
+DOCX fayllarni alohida jarayonlarda parse qilish (event loop bloklanmaydi)
+"""
+import asyncio
+import io
+import itertools
+import logging
+import multiprocessing as mp
+import os
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Awaitable, BinaryIO, Callable, Optional, Union
+
+from bot.config import config
+from bot.models import Question
+from bot.services.docx_parser import DocumentChunk, DocxParser, ParseResult, docx_part_size
+from bot.services.importers import PARSERS
+from bot.utils.text_pool import text_pool
+
+logger = logging.getLogger(__name__)
+
+BUSY_MESSAGE = (
+    "⏳ Hozir juda ko'p fayl tekshirilmoqda.\n\n"
+    "Iltimos, birozdan keyin qayta yuboring."
+)
+USER_BUSY_MESSAGE = (
+    "⏳ Oldingi faylingiz hali tekshirilmoqda.\n\n"
+    "U tugagach keyingisini yuboring."
+)
+CRASHED_MESSAGE = "❌ Faylni o'qishda xato: fayl tekshiruvi to'xtab qoldi."
+
+
+class ParsePoolBusy(Exception):
+    """Pool yoki foydalanuvchi navbati to'la (xabar - foydalanuvchiga ko'rsatiladigan matn)"""
+
+
+# progress(ulush, topilgan savollar) - parse davomida chaqiriladi
+ProgressCallback = Callable[[float, int], Awaitable[None]]
+
+# Worker jarayonidagi progress navbati (pool initializer o'rnatadi)
+_progress_queue = None
+
+
+def _init_worker(progress_queue) -> None:
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _progress_sender(job_id: Optional[int]) -> Optional[Callable[[float, int], None]]:
+    """job_id berilsa - progress'ni (job_id, ulush, savollar) ko'rinishida asosiy jarayonga yuboruvchi"""
+    if job_id is None or _progress_queue is None:
+        return None
+
+    def progress(fraction: float, questions: int) -> None:
+        _progress_queue.put_nowait((job_id, fraction, questions))
+
+    return progress
+
+
+def _parse_compact(source: Union[bytes, str], file_format: str = ".docx", job_id: Optional[int] = None) -> tuple:
+    """
+    Worker jarayonida parse qilish (file_format - PARSERS kaliti).
+
+    Natija ixcham tuple ko'rinishida qaytariladi (Question obyektlari
+    emas) - jarayonlar orasida tezroq uzatiladi.
+    """
+    result = PARSERS[file_format]().parse(source, _progress_sender(job_id))
+    return (
+        result.success,
+        result.error_message,
+        result.warnings,
+        [(q.text, q.options, q.correct_index) for q in result.questions],
+    )
+
+
+def _parse_chunk(source: Union[bytes, str], index: int, count: int, job_id: Optional[int] = None) -> Optional[DocumentChunk]:
+    """Worker jarayonida .docx bo'lagini o'qish (DocxParser.parse_chunk)"""
+    return DocxParser().parse_chunk(source, index, count, _progress_sender(job_id))
+
+
+def _worker_source(file: BinaryIO) -> Union[bytes, str]:
+    """
+    Worker'ga uzatiladigan manba: diskdagi fayl - yo'li (worker o'zi ochadi,
+    mazmuni nusxalanmaydi va pickle qilinmaydi), xotiradagi kichik fayl - bytes.
+    """
+    name = getattr(file, "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        file.flush()
+        return name
+    file.seek(0)
+    return file.read()
+
+
+def _from_compact(data: tuple) -> ParseResult:
+    success, error_message, warnings, questions = data
+    seen = {}  # Worker'dagi pool boshqa jarayonda - matnlar asosiy jarayon pool'idan o'tkaziladi
+    return ParseResult(
+        success=success,
+        questions=[
+            Question(id=str(uuid.uuid4())[:8], text=text_pool.intern(text, seen),
+                     options=text_pool.intern_all(options, seen), correct_index=correct_index)
+            for text, options, correct_index in questions
+        ],
+        error_message=error_message,
+        warnings=warnings
+    )
+
+
+class ParsePool:
+    """
+    Cheklangan ProcessPoolExecutor ustidagi parse navbati.
+
+    - Bir vaqtda max_workers ta fayl parse qilinadi, yana max_queue tasi kutadi
+    - Navbat to'lsa yoki foydalanuvchida per_user ta fayl ishlanayotgan
+      bo'lsa, darhol "band" natijasi qaytariladi
+    - Worker jarayoni qulasa pool qayta yaratiladi
+    - Worker'lar progress'ni umumiy navbatga yozadi, alohida thread uni
+      o'qib, tegishli parse chaqiruvining callback'iga event loop'da uzatadi
+    - Hujjat XML'i chunk_size dan kamida ikki barobar katta .docx bo'laklarga
+      bo'linib, bir nechta worker'da parallel o'qiladi (navbatda bitta fayl)
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 8, per_user: int = 1, chunk_size: int = 0):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max_queue
+        self.per_user = per_user
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._by_user: Counter = Counter()
+        self._job_ids = itertools.count(1)
+        self._listeners: dict[int, ProgressCallback] = {}
+        self._progress_tasks: set[asyncio.Task] = set()
+        self._progress_queue = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Hisoblagichlar
+        self.counters = {"parsed": 0, "rejected": 0, "crashed": 0, "split": 0}
+        self._parse_seconds = 0.0
+
+    # ==================== PUBLIC API ====================
+
+    @property
+    def pending(self) -> int:
+        """Ishlanayotgan va navbatdagi fayllar soni"""
+        return self._pending
+
+    async def parse(self, user_id: int, source: Union[bytes, BinaryIO],
+                    progress: Optional[ProgressCallback] = None,
+                    file_format: str = ".docx") -> ParseResult:
+        """
+        Faylni worker jarayonida parse qilish.
+        
+        source fayl obyekti bo'lsa (masalan download_to_spool natijasi): diskdagi
+        fayl worker'da yo'li bo'yicha ochiladi, xotiradagisi bytes sifatida
+        uzatiladi. Fayl natija qaytguncha ochiq turishi kerak. progress berilsa,
+        u parse davomida (DocxParser.PROGRESS_INTERVAL da bir) chaqiriladi;
+        natija qaytgandan keyin boshqa chaqirilmaydi. Katta .docx bo'laklarga
+        bo'linib parse qilinadi (natija bir xil).
+        """
+        busy = self._busy_message(user_id)
+        if busy:
+            return ParseResult(success=False, questions=[], error_message=busy)
+
+        self._pending += 1
+        self._by_user[user_id] += 1
+        try:
+            if not isinstance(source, (bytes, bytearray)):
+                source = await asyncio.to_thread(_worker_source, source)
+            chunks = self._chunk_count(source, file_format)
+            if chunks > 1:
+                return await self._run_chunked(source, progress, chunks)
+            return await self._run(source, progress, file_format)
+        finally:
+            self._pending -= 1
+            self._release_user(user_id)
+
+    async def parse_batch(self, user_id: int, jobs: list[tuple[str, str]],
+                          load: Callable[[str], bytes],
+                          progress: Optional[Callable[[int, int], Awaitable[None]]] = None) -> list[ParseResult]:
+        """
+        Bir nechta faylni (masalan arxivdagi) parallel parse qilish.
+
+        jobs - (kalit, file_format) ro'yxati; fayl load(kalit) bilan thread'da
+        faqat worker bo'shaganda o'qiladi, shuning uchun xotirada bir vaqtda
+        ko'pi bilan max_workers ta fayl turadi. Butun to'plam foydalanuvchining
+        bitta o'rnini egallaydi. Natijalar jobs tartibida qaytariladi;
+        progress(tayyor, jami) har bir fayldan keyin chaqiriladi.
+        Pool band bo'lsa ParsePoolBusy ko'tariladi.
+        """
+        busy = self._busy_message(user_id)
+        if busy:
+            raise ParsePoolBusy(busy)
+
+        self._by_user[user_id] += 1
+        window = asyncio.Semaphore(self.max_workers)
+        done = 0
+
+        async def run_one(key: str, file_format: str) -> ParseResult:
+            nonlocal done
+            async with window:
+                self._pending += 1
+                try:
+                    source = await asyncio.to_thread(load, key)
+                    result = await self._run(source, None, file_format)
+                except Exception as e:
+                    result = ParseResult(
+                        success=False,
+                        questions=[],
+                        error_message=f"Faylni o'qishda xato: {str(e)}"
+                    )
+                finally:
+                    self._pending -= 1
+            done += 1
+            if progress is not None:
+                await progress(done, len(jobs))
+            return result
+
+        try:
+            return list(await asyncio.gather(*(run_one(key, file_format) for key, file_format in jobs)))
+        finally:
+            self._release_user(user_id)
+
+    def stats(self) -> dict:
+        """Parse pool statistikasi"""
+        done = self.counters["parsed"] + self.counters["crashed"]
+        return {
+            **self.counters,
+            "pending": self._pending,
+            "avg_parse_ms": round(self._parse_seconds / done * 1000, 1) if done else 0.0
+        }
+
+    def shutdown(self) -> None:
+        """
+        Worker jarayonlarini to'xtatish.
+        
+        Navbatdagi fayllar bekor qilinadi, ishlanayotganlari tugashi kutiladi
+        (ishga tushayotgan worker progress navbati yopilgandan keyin ulanmasligi uchun).
+        """
+        self._reset_executor(wait=True)
+
+    # ==================== ICHKI METODLAR ====================
+
+    def _busy_message(self, user_id: int) -> Optional[str]:
+        """Yangi fayl qabul qilinmasa - sababi"""
+        if self._by_user[user_id] >= self.per_user:
+            self.counters["rejected"] += 1
+            return USER_BUSY_MESSAGE
+        if self._pending >= self.max_workers + self.max_queue:
+            self.counters["rejected"] += 1
+            return BUSY_MESSAGE
+        return None
+
+    def _release_user(self, user_id: int) -> None:
+        self._by_user[user_id] -= 1
+        if not self._by_user[user_id]:
+            del self._by_user[user_id]
+
+    def _chunk_count(self, source: Union[bytes, str], file_format: str) -> int:
+        """Fayl nechta bo'lakda parse qilinadi (1 - bo'linmaydi)"""
+        if file_format != ".docx" or not self.chunk_size or self.max_workers < 2:
+            return 1
+        try:
+            size = docx_part_size(source if isinstance(source, str) else io.BytesIO(source))
+        except Exception:
+            # Buzilgan fayl - xato odatiy parse'da ko'rsatiladi
+            return 1
+        return max(1, min(self.max_workers, size // self.chunk_size))
+
+    async def _run(self, source: Union[bytes, str], progress: Optional[ProgressCallback], file_format: str) -> ParseResult:
+        """Bitta faylni worker'da parse qilish"""
+        started = time.perf_counter()
+        try:
+            data = await self._call(_parse_compact, source, file_format, progress=progress)
+        except BrokenProcessPool:
+            return self._crashed()
+        finally:
+            self._parse_seconds += time.perf_counter() - started
+        self.counters["parsed"] += 1
+        return _from_compact(data)
+
+    async def _run_chunked(self, source: Union[bytes, str], progress: Optional[ProgressCallback], chunks: int) -> ParseResult:
+        """
+        .docx'ni chunks ta bo'lakka bo'lib parallel o'qish.
+
+        Bo'laklar hujjat tartibida birlashtiriladi (DocxParser.merge_chunks);
+        bo'lib bo'lmasa fayl odatiy usulda bitta worker'da parse qilinadi.
+        """
+        fractions = [0.0] * chunks
+        counts = [0] * chunks
+
+        def chunk_progress(index: int) -> ProgressCallback:
+            async def report(fraction: float, questions: int) -> None:
+                fractions[index], counts[index] = fraction, questions
+                await progress(sum(fractions) / chunks, sum(counts))
+            return report
+
+        started = time.perf_counter()
+        try:
+            parts = await asyncio.gather(*(
+                self._call(_parse_chunk, source, index, chunks,
+                           progress=chunk_progress(index) if progress is not None else None)
+                for index in range(chunks)
+            ))
+        except BrokenProcessPool:
+            return self._crashed()
+        finally:
+            self._parse_seconds += time.perf_counter() - started
+
+        result = await asyncio.to_thread(DocxParser().merge_chunks, parts)
+        if result is None:
+            logger.info("Hujjatni bo'laklarga bo'lib bo'lmadi, butunligicha parse qilinadi")
+            return await self._run(source, progress, ".docx")
+        self.counters["parsed"] += 1
+        self.counters["split"] += 1
+        return result
+
+    async def _call(self, function: Callable, *args, progress: Optional[ProgressCallback] = None):
+        """
+        function(*args, job_id) ni worker'da bajarish.
+
+        Worker jarayoni qulasa pool qayta yaratiladi va BrokenProcessPool
+        ko'tariladi (parallel chaqiruvlar uchun pool bir marta yaratiladi).
+        """
+        job_id = None
+        executor = self._get_executor()
+        try:
+            if progress is not None:
+                job_id = next(self._job_ids)
+                self._listeners[job_id] = progress
+            return await self._loop.run_in_executor(executor, function, *args, job_id)
+        except BrokenProcessPool:
+            if executor is self._executor:
+                logger.warning("Parse jarayoni to'xtadi, pool qayta yaratiladi")
+                self._reset_executor()
+            raise
+        finally:
+            self._listeners.pop(job_id, None)
+
+    def _crashed(self) -> ParseResult:
+        self.counters["crashed"] += 1
+        return ParseResult(success=False, questions=[], error_message=CRASHED_MESSAGE)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: event loop va ochiq ulanishlar worker'larga nusxalanmaydi
+            context = mp.get_context("spawn")
+            self._loop = asyncio.get_running_loop()
+            self._progress_queue = context.Queue()
+            threading.Thread(
+                target=self._read_progress, args=(self._progress_queue,),
+                name="parse-progress", daemon=True
+            ).start()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=context,
+                initializer=_init_worker, initargs=(self._progress_queue,)
+            )
+        return self._executor
+
+    def _reset_executor(self, wait: bool = False) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+        # Qulagan worker navbatni buzgan bo'lishi mumkin - yangi pool yangi navbat oladi
+        progress_queue, self._progress_queue = self._progress_queue, None
+        if progress_queue is not None:
+            progress_queue.put(None)
+
+    def _read_progress(self, progress_queue) -> None:
+        """Progress navbatini o'qish (alohida thread, None - to'xtash belgisi)"""
+        loop = self._loop
+        while True:
+            item = progress_queue.get()
+            if item is None:
+                return
+            try:
+                loop.call_soon_threadsafe(self._dispatch_progress, *item)
+            except RuntimeError:
+                # Event loop yopilgan
+                return
+
+    def _dispatch_progress(self, job_id: int, fraction: float, questions: int) -> None:
+        callback = self._listeners.get(job_id)
+        if callback is None:
+            # Parse allaqachon tugagan
+            return
+        task = asyncio.ensure_future(callback(fraction, questions))
+        self._progress_tasks.add(task)
+        task.add_done_callback(self._progress_done)
+
+    def _progress_done(self, task: asyncio.Task) -> None:
+        self._progress_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Parse progress callback xatosi: {task.exception()}")
+
+
+# Global parse pool
+parse_pool = ParsePool(
+    max_workers=config.parsing.workers,
+    max_queue=config.parsing.max_queue,
+    per_user=config.parsing.per_user,
+    chunk_size=config.parsing.chunk_size
+)
@@ -2,26 +2,49 @@
 Quiz Manager Service
 Quiz jarayonini boshqarish
 """
+from array import array
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional
+import asyncio
+import logging
 import random
+import sys
+import time
 from bot.models import Quiz, Question, QuizResult, QuizSettings
 from bot.database import get_db
+from bot.config import config
+from bot.services.session_store import SessionStore, KIND_PRIVATE, KIND_GROUP
+from bot.services.leaderboard import Leaderboard
+from bot.utils.text_pool import text_pool
+
+logger = logging.getLogger(__name__)
 
 
 class QuizManager:
     """Quiz jarayonini boshqaruvchi class"""
     
-    def __init__(self):
-        self.active_sessions: dict[int, QuizSession] = {}  # user_id -> QuizSession
-        self.group_sessions: dict[int, GroupQuizSession] = {}  # chat_id -> GroupQuizSession
+    def __init__(self, idle_timeout: float = 3600, max_sessions: int = 10000,
+                 max_group_sessions: int = 2000, reap_interval: float = 60):
+        # Faollik tartibida (eng eskisi boshida) - LRU
+        self.active_sessions: OrderedDict[int, QuizSession] = OrderedDict()  # user_id -> QuizSession
+        self.group_sessions: OrderedDict[int, GroupQuizSession] = OrderedDict()  # chat_id -> GroupQuizSession
+        self.store = SessionStore(self, checkpoint_interval=config.sessions.checkpoint_interval)
+        self._banks: dict[str, QuestionBank] = {}  # quiz_id -> umumiy savollar to'plami
+        
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.max_group_sessions = max_group_sessions
+        self.reap_interval = reap_interval
+        self._reaper: Optional[asyncio.Task] = None
+        self.counters = {"reaped": 0, "evicted": 0}
     
     # ==================== SHAXSIY QUIZ ====================
     
     def create_session(self, user_id: int, quiz: Quiz, settings: Optional[QuizSettings] = None) -> 'QuizSession':
         """Yangi quiz sessiya yaratish"""
-        session = QuizSession(user_id=user_id, quiz=quiz, settings=settings)
-        self.active_sessions[user_id] = session
+        session = QuizSession(user_id=user_id, quiz=self._acquire_bank(quiz), settings=settings)
+        self._register_session(session)
         return session
     
     def get_session(self, user_id: int) -> Optional['QuizSession']:
@@ -32,6 +55,8 @@ class QuizManager:
         """Sessiyani tugatish va natijani qaytarish"""
         session = self.active_sessions.pop(user_id, None)
         if session:
+            self.store.mark(KIND_PRIVATE, user_id)
+            self._release_bank(session.quiz)
             return session.get_result()
         return None
     
@@ -43,8 +68,8 @@ class QuizManager:
     
     def create_group_session(self, chat_id: int, quiz: Quiz, creator_id: int, settings: Optional[QuizSettings] = None) -> 'GroupQuizSession':
         """Guruh uchun quiz sessiya yaratish"""
-        session = GroupQuizSession(chat_id=chat_id, quiz=quiz, creator_id=creator_id, settings=settings)
-        self.group_sessions[chat_id] = session
+        session = GroupQuizSession(chat_id=chat_id, quiz=self._acquire_bank(quiz), creator_id=creator_id, settings=settings)
+        self._register_group_session(session)
         return session
     
     def get_group_session(self, chat_id: int) -> Optional['GroupQuizSession']:
@@ -53,42 +78,389 @@ class QuizManager:
     
     def end_group_session(self, chat_id: int) -> Optional['GroupQuizSession']:
         """Guruh sessiyasini tugatish"""
-        return self.group_sessions.pop(chat_id, None)
+        session = self.group_sessions.pop(chat_id, None)
+        if session:
+            self.store.mark(KIND_GROUP, chat_id)
+            self._release_bank(session.quiz)
+        return session
+    
+    # ==================== TIKLASH ====================
+    
+    async def restore_sessions(self, shard: Optional[Callable[[int], bool]] = None) -> int:
+        """
+        Saqlangan sessiyalarni (restart'dan keyin) xotiraga tiklash.
+        
+        shard berilsa faqat shu jarayonga tegishli chat'lar tiklanadi
+        (ko'p jarayonli rejimda).
+        """
+        db = await get_db()
+        restored = 0
+        
+        for kind, owner_id, snapshot in await self.store.load():
+            if shard is not None and not shard(owner_id):
+                continue
+            
+            # Bir xil quizdagi sessiyalar bitta savollar to'plamidan foydalanadi
+            quiz_id = snapshot.get("quiz_id", "")
+            bank = self._banks.get(quiz_id)
+            quiz = bank.quiz if bank else await db.get_quiz(quiz_id)
+            
+            if quiz is None:
+                self.store.mark(kind, owner_id)  # Quiz o'chirilgan
+                continue
+            
+            quiz = self._acquire_bank(quiz)
+            try:
+                if kind == KIND_PRIVATE:
+                    self._register_session(QuizSession(owner_id, quiz, snapshot=snapshot))
+                else:
+                    self._register_group_session(GroupQuizSession(
+                        owner_id, quiz, snapshot.get("creator_id", 0), snapshot=snapshot
+                    ))
+                restored += 1
+            except (ValueError, KeyError, IndexError, TypeError):
+                # Buzilgan yoki eskirgan snapshot - o'chirib yuborish
+                self._release_bank(quiz)
+                self.store.mark(kind, owner_id)
+        
+        return restored
+    
+    # ==================== XOTIRA CHEGARALARI ====================
+    
+    def reap_idle(self, now: Optional[float] = None) -> int:
+        """Uzoq vaqt harakatsiz qolgan sessiyalarni o'chirish"""
+        now = now or time.time()
+        expire_before = now - self.idle_timeout
+        reaped = 0
+        
+        for sessions, end in ((self.active_sessions, self.end_session),
+                              (self.group_sessions, self.end_group_session)):
+            # Sessiyalar faollik tartibida - birinchi faol sessiyada to'xtaymiz
+            for owner_id, session in list(sessions.items()):
+                if session.last_activity >= expire_before:
+                    break
+                if session.deadline and session.deadline > now:
+                    continue  # Taymer hali ishlamoqda
+                end(owner_id)
+                reaped += 1
+        
+        self.counters["reaped"] += reaped
+        return reaped
+    
+    def stats(self) -> dict:
+        """Sessiyalar soni va taxminiy xotira hajmi"""
+        seen = set()  # Keshdagi quizlar orasida bo'lishilgan matnlar
+        return {
+            "sessions": len(self.active_sessions),
+            "group_sessions": len(self.group_sessions),
+            "estimated_bytes": sum(
+                estimate_session_bytes(session)
+                for session in (*self.active_sessions.values(), *self.group_sessions.values())
+            ),
+            "banks": len(self._banks),
+            "bank_bytes": sum(estimate_bank_bytes(bank.quiz, seen) for bank in self._banks.values()),
+            "text_pool": text_pool.stats(),
+            **self.counters,
+        }
+    
+    async def stop(self) -> None:
+        """Reaper'ni to'xtatish va sessiyalarni oxirgi marta saqlash"""
+        if self._reaper:
+            self._reaper.cancel()
+            try:
+                await self._reaper
+            except asyncio.CancelledError:
+                pass
+            self._reaper = None
+        await self.store.stop()
+    
+    # ==================== ICHKI METODLAR ====================
+    
+    def _acquire_bank(self, quiz: Quiz) -> Quiz:
+        """
+        Quizning umumiy nusxasini olish. Bazadan qayta yuklangan bir xil quiz
+        uchun avvalgi nusxa qaytariladi, shuning uchun savollar xotirada bitta bo'ladi.
+        """
+        bank = self._banks.get(quiz.id)
+        if bank is None or (bank.quiz is not quiz and bank.version != QuestionBank.version_of(quiz)):
+            # Yangi yoki tahrirlangan quiz - eski sessiyalar eski nusxada qoladi
+            bank = QuestionBank(quiz)
+            self._banks[quiz.id] = bank
+        bank.refs += 1
+        return bank.quiz
+    
+    def _release_bank(self, quiz: Quiz) -> None:
+        bank = self._banks.get(quiz.id)
+        if bank is None or bank.quiz is not quiz:
+            return  # Eskirgan nusxa - GC o'zi tozalaydi
+        bank.refs -= 1
+        if bank.refs <= 0:
+            del self._banks[quiz.id]
+    
+    def _register_session(self, session: 'QuizSession') -> None:
+        old = self.active_sessions.get(session.user_id)
+        if old is not None and old is not session:
+            self._release_bank(old.quiz)
+        self.active_sessions[session.user_id] = session
+        session.on_change = lambda: self._touch(self.active_sessions, KIND_PRIVATE, session.user_id)
+        session.on_change()
+        self._enforce_limit(self.active_sessions, self.max_sessions, self.end_session)
+    
+    def _register_group_session(self, session: 'GroupQuizSession') -> None:
+        old = self.group_sessions.get(session.chat_id)
+        if old is not None and old is not session:
+            self._release_bank(old.quiz)
+        self.group_sessions[session.chat_id] = session
+        session.on_change = lambda: self._touch(self.group_sessions, KIND_GROUP, session.chat_id)
+        session.on_change()
+        self._enforce_limit(self.group_sessions, self.max_group_sessions, self.end_group_session)
+    
+    def _touch(self, sessions: OrderedDict, kind: str, owner_id: int) -> None:
+        """Sessiya faol - LRU tartibini yangilash va checkpoint'ga belgilash"""
+        if owner_id in sessions:
+            sessions.move_to_end(owner_id)
+        self.store.mark(kind, owner_id)
+        self._ensure_reaper()
+    
+    def _enforce_limit(self, sessions: OrderedDict, limit: int, end: Callable[[int], object]) -> None:
+        """Chegaradan oshsa eng uzoq harakatsiz sessiyalarni chiqarish"""
+        while len(sessions) > limit:
+            end(next(iter(sessions)))
+            self.counters["evicted"] += 1
+    
+    def _ensure_reaper(self) -> None:
+        if self._reaper is not None and not self._reaper.done():
+            return
+        try:
+            self._reaper = asyncio.get_running_loop().create_task(self._reap_loop())
+        except RuntimeError:
+            pass  # Event loop yo'q
+    
+    async def _reap_loop(self) -> None:
+        while self.active_sessions or self.group_sessions:
+            await asyncio.sleep(self.reap_interval)
+            reaped = self.reap_idle()
+            if reaped:
+                logger.info(f"{reaped} ta harakatsiz sessiya o'chirildi: {self.stats()}")
+
+
+# ==================== SAVOLLAR TARTIBI ====================
+
+class QuestionBank:
+    """Bir nechta sessiya foydalanadigan umumiy quiz (faqat o'qish uchun)"""
+    
+    __slots__ = ("quiz", "version", "refs")
+    
+    def __init__(self, quiz: Quiz):
+        self.quiz = quiz
+        self.version = self.version_of(quiz)
+        self.refs = 0
+    
+    @staticmethod
+    def version_of(quiz: Quiz) -> tuple:
+        """
+        Quiz versiyasi (savollarni solishtirmasdan). Savollar joyida tahrirlanmaydi:
+        har bir saqlash yangi Quiz (yangi created_at) bilan bo'ladi.
+        """
+        return quiz.created_at, quiz.title, quiz.time_per_question, quiz.shuffle_options, len(quiz.questions)
+
+
+class QuestionView:
+    """
+    Sessiyadagi savol: umumiy savol + shu sessiyadagi variantlar tartibi.
+    Variantlar ro'yxati faqat so'ralganda yig'iladi, umumiy savol o'zgartirilmaydi.
+    """
+    
+    __slots__ = ("question", "perm")
+    
+    def __init__(self, question: Question, perm: Optional[array] = None):
+        self.question = question
+        self.perm = perm  # None - asl tartib
+    
+    @property
+    def id(self) -> str:
+        return self.question.id
+    
+    @property
+    def text(self) -> str:
+        return self.question.text
+    
+    @property
+    def options(self) -> list[str]:
+        """Sessiya tartibidagi variantlar"""
+        if self.perm is None:
+            return self.question.options
+        return [self.question.options[i] for i in self.perm]
+    
+    @property
+    def correct_index(self) -> int:
+        """To'g'ri javobning sessiya tartibidagi indeksi"""
+        if self.perm is None:
+            return self.question.correct_index
+        return self.perm.index(self.question.correct_index)
+    
+    @property
+    def correct_answer(self) -> str:
+        return self.question.correct_answer
+    
+    def get_option_letter(self, index: int) -> str:
+        return self.question.get_option_letter(index)
+
+
+def build_question_order(total: int, settings: QuizSettings) -> array:
+    """Sozlamalar asosida savollar tartibini (asl indekslar) tuzish"""
+    # Oraliq test
+    if settings.quiz_mode == "range" and settings.end_question:
+        start_idx = max(0, settings.start_question - 1)
+        end_idx = min(settings.end_question, total)
+        return array("I", range(start_idx, end_idx))
+    
+    # Tasodifiy test
+    if settings.quiz_mode == "random" and settings.question_count:
+        return array("I", random.sample(range(total), min(settings.question_count, total)))
+    
+    return array("I", range(total))
+
+
+def option_offsets(questions: list[Question], order: array) -> array:
+    """Har bir savol variantlari tekis massivda qayerdan boshlanishi"""
+    offsets = array("I", [0])
+    for index in order:
+        offsets.append(offsets[-1] + len(questions[index].options))
+    return offsets
+
+
+def build_option_perms(questions: list[Question], order: array, shuffle: bool) -> array:
+    """Barcha savollar variantlari tartibi bitta tekis massivda. Aralashtirilmasa - bo'sh"""
+    perms = array("B" if all(len(questions[i].options) <= 256 for i in order) else "H")
+    if not shuffle:
+        return perms
+    for index in order:
+        perm = list(range(len(questions[index].options)))
+        random.shuffle(perm)
+        perms.extend(perm)
+    return perms
+
+
+def estimate_session_bytes(session) -> int:
+    """Sessiyaning o'zi egallagan xotira (umumiy savollar to'plamisiz)"""
+    size = sys.getsizeof(session)
+    size += sys.getsizeof(session.question_order) + sys.getsizeof(session.option_perms)
+    size += sys.getsizeof(session.option_offsets)
+    if isinstance(session, GroupQuizSession):
+        size += sys.getsizeof(session.option_counts)
+        size += sys.getsizeof(session.participants) + sys.getsizeof(session.answered_current)
+        size += sum(sys.getsizeof(p) + sys.getsizeof(p.answers) for p in session.participants.values())
+    else:
+        size += sys.getsizeof(session.answers) + sys.getsizeof(session.wrong_indices)
+    return size
+
+
+def estimate_bank_bytes(quiz: Quiz, seen: Optional[set] = None) -> int:
+    """
+    Umumiy savollar to'plami egallagan xotira. Pool orqali bo'lishilgan matnlar
+    bir marta hisoblanadi (seen - bir nechta quiz uchun umumiy id'lar to'plami).
+    """
+    seen = set() if seen is None else seen
+    size = sys.getsizeof(quiz.questions)
+    for question in quiz.questions:
+        size += sys.getsizeof(question)
+        for text in (question.text, *question.options):
+            if id(text) not in seen:
+                seen.add(id(text))
+                size += sys.getsizeof(text)
+    return size
+
+
+def prepare_order(session) -> None:
+    """Sessiya savollari va variantlar tartibini sozlamalardan tuzish"""
+    questions = session.quiz.questions
+    session.question_order = build_question_order(len(questions), session.settings)
+    shuffle = session.settings.shuffle and session.quiz.shuffle_options
+    session.option_perms = build_option_perms(questions, session.question_order, shuffle)
+    session.option_offsets = option_offsets(questions, session.question_order)
+
+
+def load_order(session, order: list[int], perms: list[int]) -> None:
+    """Snapshot'dagi tartibni tiklash"""
+    questions = session.quiz.questions
+    session.question_order = array("I", order)
+    if any(index >= len(questions) for index in session.question_order):
+        raise IndexError("Savol indeksi quizdan tashqarida")
+    session.option_perms = array("B" if all(p < 256 for p in perms) else "H", perms)
+    session.option_offsets = option_offsets(questions, session.question_order)
+    if perms and session.option_offsets[-1] != len(perms):
+        raise ValueError("Variantlar tartibi quizga mos emas")
+
+
+def session_question(session, index: int) -> Optional[QuestionView]:
+    """Sessiya tartibidagi savolni umumiy to'plamdan olish"""
+    if not 0 <= index < len(session.question_order):
+        return None
+    question = session.quiz.questions[session.question_order[index]]
+    if not session.option_perms:
+        return QuestionView(question)
+    start, end = session.option_offsets[index], session.option_offsets[index + 1]
+    return QuestionView(question, session.option_perms[start:end])
 
 
 class QuizSession:
     """Shaxsiy quiz sessiyasi"""
     
-    def __init__(self, user_id: int, quiz: Quiz, settings: Optional[QuizSettings] = None):
+    __slots__ = (
+        "user_id", "quiz", "settings", "question_order", "option_perms", "option_offsets",
+        "current_index", "answers", "correct_count", "wrong_indices", "started_at",
+        "is_completed", "message_id", "deadline", "last_activity", "on_change",
+    )
+    
+    def __init__(self, user_id: int, quiz: Quiz, settings: Optional[QuizSettings] = None,
+                 snapshot: Optional[dict] = None):
         self.user_id = user_id
-        self.quiz = quiz
+        self.quiz = quiz  # Umumiy quiz - o'zgartirilmaydi
         self.settings = settings or QuizSettings()
+        self.question_order = array("I")  # Sessiya savollari (asl indekslar)
+        self.option_perms = array("B")  # Variantlar tartibi (tekis massiv)
+        self.option_offsets = array("I")  # option_perms ichidagi boshlanish nuqtalari
         self.current_index = 0
         self.answers: dict[int, int] = {}  # savol_index -> tanlangan_variant_index
         self.correct_count = 0
         self.wrong_indices: list[int] = []
         self.started_at = datetime.now()
         self.is_completed = False
+        self.message_id: Optional[int] = None  # Joriy savol xabari
+        self.deadline: Optional[float] = None  # Joriy savol vaqti tugaydigan payt (unix time)
+        self.last_activity = time.time()  # Oxirgi holat o'zgarishi
+        self.on_change: Optional[Callable[[], None]] = None  # Checkpoint uchun
         
-        # Quizni sozlamalar asosida tayyorlash
-        self._prepare_quiz_with_settings()
+        if snapshot:
+            self._load_snapshot(snapshot)
+        else:
+            # Quizni sozlamalar asosida tayyorlash
+            self._prepare_quiz_with_settings()
+    
+    @property
+    def total_questions(self) -> int:
+        """Sessiyadagi savollar soni"""
+        return len(self.question_order)
+    
+    def question_at(self, index: int) -> Optional[QuestionView]:
+        """Sessiyadagi index-savol"""
+        return session_question(self, index)
     
     @property
-    def current_question(self) -> Optional[Question]:
+    def current_question(self) -> Optional[QuestionView]:
         """Joriy savolni olish"""
-        if 0 <= self.current_index < len(self.quiz.questions):
-            return self.quiz.questions[self.current_index]
-        return None
+        return self.question_at(self.current_index)
     
     @property
     def is_finished(self) -> bool:
         """Quiz tugaganmi"""
-        return self.current_index >= len(self.quiz.questions)
+        return self.current_index >= self.total_questions
     
     @property
     def progress(self) -> str:
         """Jarayon holati"""
-        return f"{self.current_index + 1}/{len(self.quiz.questions)}"
+        return f"{self.current_index + 1}/{self.total_questions}"
     
     @property
     def time_limit(self) -> int:
@@ -97,21 +469,20 @@ class QuizSession:
     
     def _prepare_quiz_with_settings(self) -> None:
         """Quizni sozlamalar asosida tayyorlash"""
-        # Oraliq test
-        if self.settings.quiz_mode == "range" and self.settings.end_question:
-            start_idx = max(0, self.settings.start_question - 1)
-            end_idx = min(self.settings.end_question, len(self.quiz.questions))
-            self.quiz.questions = self.quiz.questions[start_idx:end_idx]
-        
-        # Tasodifiy test
-        elif self.settings.quiz_mode == "random" and self.settings.question_count:
-            questions_copy = self.quiz.questions.copy()
-            random.shuffle(questions_copy)
-            self.quiz.questions = questions_copy[:self.settings.question_count]
-        
-        # Variantlarni aralashtirish
-        if self.settings.shuffle and self.quiz.shuffle_options:
-            self.quiz.prepare_quiz()
+        prepare_order(self)
+        self._changed()
+    
+    def _changed(self) -> None:
+        """Holat o'zgarganini bildirish (checkpoint va faollik)"""
+        self.last_activity = time.time()
+        if self.on_change:
+            self.on_change()
+    
+    def set_question_message(self, message_id: int, time_limit: int) -> None:
+        """Joriy savol xabari va vaqt tugash paytini belgilash"""
+        self.message_id = message_id
+        self.deadline = time.time() + time_limit if time_limit > 0 else None
+        self._changed()
     
     def answer_question(self, option_index: int) -> tuple[bool, str]:
         """
@@ -134,27 +505,34 @@ class QuizSession:
         
         # Keyingi savolga o'tish
         self.current_index += 1
+        self.message_id = None
+        self.deadline = None
         
         # Quiz tugadimi tekshirish
         if self.is_finished:
             self.is_completed = True
         
+        self._changed()
         return is_correct, correct_answer
     
     def skip_question(self) -> None:
         """Savolni o'tkazib yuborish (vaqt tugaganda)"""
         self.wrong_indices.append(self.current_index)
         self.current_index += 1
+        self.message_id = None
+        self.deadline = None
         
         if self.is_finished:
             self.is_completed = True
+        
+        self._changed()
     
     def get_result(self) -> QuizResult:
         """Natijani olish"""
         return QuizResult(
             quiz_id=self.quiz.id,
             user_id=self.user_id,
-            total_questions=len(self.quiz.questions),
+            total_questions=self.total_questions,
             correct_answers=self.correct_count,
             wrong_answers=self.wrong_indices,
             answers=self.answers,
@@ -162,60 +540,138 @@ class QuizSession:
             finished_at=datetime.now(),
             is_completed=self.is_completed
         )
+    
+    def to_snapshot(self) -> dict:
+        """Sessiyaning ixcham holati (savollar o'rniga indekslar)"""
+        return {
+            "quiz_id": self.quiz.id,
+            "order": self.question_order.tolist(),
+            "options": self.option_perms.tolist(),
+            "index": self.current_index,
+            "answers": self.answers,
+            "correct": self.correct_count,
+            "wrong": self.wrong_indices,
+            "completed": self.is_completed,
+            "started_at": self.started_at.timestamp(),
+            "message_id": self.message_id,
+            "deadline": self.deadline,
+        }
+    
+    def _load_snapshot(self, data: dict) -> None:
+        """Snapshot'dan holatni tiklash"""
+        load_order(self, data["order"], data["options"])
+        self.current_index = data["index"]
+        self.answers = {int(k): v for k, v in data["answers"].items()}
+        self.correct_count = data["correct"]
+        self.wrong_indices = data["wrong"]
+        self.is_completed = data["completed"]
+        self.started_at = datetime.fromtimestamp(data["started_at"])
+        self.message_id = data["message_id"]
+        self.deadline = data["deadline"]
 
 
 class GroupQuizSession:
     """Guruh quiz sessiyasi"""
     
-    def __init__(self, chat_id: int, quiz: Quiz, creator_id: int, settings: Optional[QuizSettings] = None):
+    __slots__ = (
+        "chat_id", "quiz", "creator_id", "settings", "question_order", "option_perms",
+        "option_offsets", "option_counts", "current_index", "participants", "leaderboard",
+        "started_at", "is_active",
+        "is_started", "answered_current", "waiting_mode", "message_id", "deadline",
+        "last_activity", "on_change",
+    )
+    
+    def __init__(self, chat_id: int, quiz: Quiz, creator_id: int, settings: Optional[QuizSettings] = None,
+                 snapshot: Optional[dict] = None):
         self.chat_id = chat_id
-        self.quiz = quiz
+        self.quiz = quiz  # Umumiy quiz - o'zgartirilmaydi
         self.creator_id = creator_id
         self.settings = settings or QuizSettings()
+        self.question_order = array("I")  # Sessiya savollari (asl indekslar)
+        self.option_perms = array("B")  # Variantlar tartibi (tekis massiv)
+        self.option_offsets = array("I")  # option_perms ichidagi boshlanish nuqtalari
+        self.option_counts = array("I")  # Har bir variantni tanlaganlar soni (option_offsets bo'yicha)
         self.current_index = 0
         self.participants: dict[int, ParticipantScore] = {}  # user_id -> ParticipantScore
+        self.leaderboard = Leaderboard(0)  # Ishtirokchilar reytingi (javob paytida yangilanadi)
         self.started_at = datetime.now()
         self.is_active = True
+        self.is_started = False  # Birinchi savol ko'rsatildimi
         self.answered_current: set[int] = set()  # Joriy savolga javob berganlar
         self.waiting_mode: Optional[str] = None  # "range" yoki "random" - input kutish rejimi
+        self.message_id: Optional[int] = None  # Joriy savol xabari
+        self.deadline: Optional[float] = None  # Keyingi hodisa payti (unix time)
+        self.last_activity = time.time()  # Oxirgi holat o'zgarishi
+        self.on_change: Optional[Callable[[], None]] = None  # Checkpoint uchun
         
-        # Quizni sozlamalar asosida tayyorlash
-        self._prepare_quiz_with_settings()
+        if snapshot:
+            self._load_snapshot(snapshot)
+        else:
+            # Quizni sozlamalar asosida tayyorlash
+            self._prepare_quiz_with_settings()
+    
+    @property
+    def total_questions(self) -> int:
+        """Sessiyadagi savollar soni"""
+        return len(self.question_order)
+    
+    def question_at(self, index: int) -> Optional[QuestionView]:
+        """Sessiyadagi index-savol"""
+        return session_question(self, index)
     
     @property
-    def current_question(self) -> Optional[Question]:
+    def current_question(self) -> Optional[QuestionView]:
         """Joriy savol"""
-        if 0 <= self.current_index < len(self.quiz.questions):
-            return self.quiz.questions[self.current_index]
-        return None
+        return self.question_at(self.current_index)
     
     @property
     def is_finished(self) -> bool:
         """Quiz tugaganmi"""
-        return self.current_index >= len(self.quiz.questions)
+        return self.current_index >= self.total_questions
+    
+    @property
+    def total_available(self) -> int:
+        """Testdagi barcha savollar soni (oraliq/tasodifiy tanlash uchun)"""
+        return len(self.quiz.questions)
     
     def _prepare_quiz_with_settings(self) -> None:
         """Quizni sozlamalar asosida tayyorlash"""
-        # Orqaliq test
-        if self.settings.quiz_mode == "range" and self.settings.end_question:
-            start_idx = max(0, self.settings.start_question - 1)
-            end_idx = min(self.settings.end_question, len(self.quiz.questions))
-            self.quiz.questions = self.quiz.questions[start_idx:end_idx]
-        
-        # Tasodifiy test
-        elif self.settings.quiz_mode == "random" and self.settings.question_count:
-            questions_copy = self.quiz.questions.copy()
-            random.shuffle(questions_copy)
-            self.quiz.questions = questions_copy[:self.settings.question_count]
-        
-        # Variantlarni aralashtirish
-        if self.settings.shuffle and self.quiz.shuffle_options:
-            self.quiz.prepare_quiz()
+        prepare_order(self)
+        # Barcha savollar uchun hisoblagichlar oldindan ajratiladi - javob paytida yangi obyekt yaratilmaydi
+        self.option_counts = array("I", bytes(4 * self.option_offsets[-1]))
+        self._rebuild_leaderboard()
+        self._changed()
+
+    def _changed(self) -> None:
+        """Holat o'zgarganini bildirish (checkpoint va faollik)"""
+        self.last_activity = time.time()
+        if self.on_change:
+            self.on_change()
+    
+    def set_waiting_mode(self, mode: Optional[str]) -> None:
+        """Admin kiritishini kutish rejimini belgilash"""
+        self.waiting_mode = mode
+        self._changed()
+    
+    def schedule_next(self, delay: float) -> None:
+        """Keyingi savol (yoki test boshlanishi) vaqtini belgilash"""
+        self.message_id = None
+        self.deadline = time.time() + delay
+        self._changed()
+    
+    def set_question_message(self, message_id: int, time_limit: int) -> None:
+        """Joriy savol xabari va vaqt tugash paytini belgilash"""
+        self.is_started = True
+        self.message_id = message_id
+        self.deadline = time.time() + time_limit
+        self._changed()
     
     def add_participant(self, user_id: int, username: str) -> None:
         """Yangi ishtirokchi qo'shish"""
         if user_id not in self.participants:
             self.participants[user_id] = ParticipantScore(user_id=user_id, username=username)
+            self.leaderboard.update(user_id, 0, 0)
+            self._changed()
     
     def has_answered(self, user_id: int) -> bool:
         """Foydalanuvchi joriy savolga javob berganmi"""
@@ -236,37 +692,141 @@ class GroupQuizSession:
         self.answered_current.add(user_id)
         is_correct = option_index == question.correct_index
         
+        # Variantlar bo'yicha hisoblagich (sessiyadagi tartib bo'yicha)
+        start, end = self.option_offsets[self.current_index], self.option_offsets[self.current_index + 1]
+        if 0 <= option_index < end - start:
+            self.option_counts[start + option_index] += 1
+        
         participant = self.participants[user_id]
         participant.total_answered += 1
+        participant.record_answer(self.current_index, option_index, self.total_questions)
         
         if is_correct:
             participant.correct_count += 1
+        self.leaderboard.update(user_id, participant.correct_count, participant.total_answered)
         
+        self._changed()
         return is_correct, question.correct_answer
     
+    def option_histogram(self, index: int) -> array:
+        """index-savol variantlarini tanlaganlar soni (A, B, C... tartibida)"""
+        if not 0 <= index < self.total_questions:
+            return array("I")
+        return self.option_counts[self.option_offsets[index]:self.option_offsets[index + 1]]
+    
     def next_question(self) -> bool:
         """Keyingi savolga o'tish. True qaytaradi agar yana savol bor bo'lsa"""
         self.current_index += 1
         self.answered_current.clear()
+        self.message_id = None
+        self.deadline = None
+        self._changed()
         return not self.is_finished
     
-    def get_leaderboard(self) -> list['ParticipantScore']:
-        """Natijalar reytingi"""
-        return sorted(
-            self.participants.values(),
-            key=lambda p: (p.correct_count, -p.total_answered),
-            reverse=True
-        )
+    def get_leaderboard(self, limit: Optional[int] = None) -> list['ParticipantScore']:
+        """Natijalar reytingi (limit berilsa - faqat eng yaxshilari)"""
+        return [self.participants[user_id] for user_id in self.leaderboard.top(limit)]
+    
+    def get_results(self) -> list[QuizResult]:
+        """Javob bergan har bir ishtirokchi uchun natija (bazaga saqlash uchun)"""
+        correct_indices = [self.question_at(i).correct_index for i in range(self.total_questions)]
+        finished_at = datetime.now()
+        results = []
+        
+        for participant in self.participants.values():
+            if not participant.total_answered:
+                continue  # Faqat "tayyor" bosgan, javob bermagan
+            answers = {
+                index: option for index, option in enumerate(participant.answers) if option >= 0
+            }
+            results.append(QuizResult(
+                quiz_id=self.quiz.id,
+                user_id=participant.user_id,
+                username=participant.username,
+                total_questions=self.total_questions,
+                correct_answers=participant.correct_count,
+                wrong_answers=[
+                    index for index, correct in enumerate(correct_indices)
+                    if answers.get(index) != correct
+                ],
+                answers=answers,
+                started_at=self.started_at,
+                finished_at=finished_at,
+                is_completed=self.is_finished
+            ))
+        
+        return results
+    
+    def get_rank(self, user_id: int) -> Optional[int]:
+        """Ishtirokchining joriy o'rni"""
+        return self.leaderboard.rank(user_id)
+    
+    def _rebuild_leaderboard(self) -> None:
+        self.leaderboard = Leaderboard(self.total_questions)
+        for participant in self.participants.values():
+            self.leaderboard.update(participant.user_id, participant.correct_count, participant.total_answered)
+    
+    def to_snapshot(self) -> dict:
+        """Sessiyaning ixcham holati (savollar o'rniga indekslar)"""
+        return {
+            "quiz_id": self.quiz.id,
+            "creator_id": self.creator_id,
+            "order": self.question_order.tolist(),
+            "options": self.option_perms.tolist(),
+            "index": self.current_index,
+            "participants": [
+                [p.user_id, p.username, p.correct_count, p.total_answered, p.answers.tolist()]
+                for p in self.participants.values()
+            ],
+            "answered": list(self.answered_current),
+            "counts": self.option_counts.tolist(),
+            "waiting_mode": self.waiting_mode,
+            "started": self.is_started,
+            "started_at": self.started_at.timestamp(),
+            "message_id": self.message_id,
+            "deadline": self.deadline,
+        }
+    
+    def _load_snapshot(self, data: dict) -> None:
+        """Snapshot'dan holatni tiklash"""
+        load_order(self, data["order"], data["options"])
+        self.current_index = data["index"]
+        for user_id, username, correct_count, total_answered, answers in data["participants"]:
+            participant = ParticipantScore(user_id=user_id, username=username)
+            participant.correct_count = correct_count
+            participant.total_answered = total_answered
+            participant.answers = array("b", answers)
+            self.participants[user_id] = participant
+        self._rebuild_leaderboard()
+        self.answered_current = set(data["answered"])
+        self.option_counts = array("I", data.get("counts") or bytes(4 * self.option_offsets[-1]))
+        if len(self.option_counts) != self.option_offsets[-1]:
+            raise ValueError("Variant hisoblagichlari quizga mos emas")
+        self.waiting_mode = data["waiting_mode"]
+        self.is_started = data["started"]
+        self.started_at = datetime.fromtimestamp(data["started_at"])
+        self.message_id = data["message_id"]
+        self.deadline = data["deadline"]
 
 
 class ParticipantScore:
     """Guruh ishtirokchisi natijasi"""
     
+    __slots__ = ("user_id", "username", "correct_count", "total_answered", "answers")
+    
     def __init__(self, user_id: int, username: str):
         self.user_id = user_id
         self.username = username
         self.correct_count = 0
         self.total_answered = 0
+        self.answers = array("b")  # savol_index -> tanlangan variant (-1 - javob berilmagan)
+    
+    def record_answer(self, index: int, option_index: int, total_questions: int) -> None:
+        """Javobni qayd qilish (massiv birinchi javobda bir marta ajratiladi)"""
+        if len(self.answers) != total_questions:
+            self.answers = array("b", [-1]) * total_questions
+        if 0 <= option_index <= 127:
+            self.answers[index] = option_index
     
     @property
     def accuracy(self) -> float:
@@ -277,4 +837,8 @@ class ParticipantScore:
 
 
 # Global quiz manager
-quiz_manager = QuizManager()
+quiz_manager = QuizManager(
+    idle_timeout=config.sessions.idle_timeout,
+    max_sessions=config.sessions.max_sessions,
+    max_group_sessions=config.sessions.max_group_sessions
+)
@@ -0,0 +1,117 @@
+"""
+Session Store Service
+Quiz sessiyalarini bazaga checkpoint qilish va restart'dan keyin tiklash
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Optional
+
+from bot.database import get_db
+
+if TYPE_CHECKING:
+    from bot.services.quiz_manager import QuizManager
+
+logger = logging.getLogger(__name__)
+
+KIND_PRIVATE = "private"
+KIND_GROUP = "group"
+
+SessionKey = tuple[str, int]  # (kind, user_id yoki chat_id)
+
+
+class SessionStore:
+    """
+    Sessiya snapshot'larini bazaga yozish (write-behind).
+
+    Har bir holat o'zgarishida sessiya faqat "dirty" deb belgilanadi (O(1)),
+    snapshot'lar esa checkpoint_interval oralig'ida bitta tranzaksiyada yoziladi.
+    Shu sababli javob berish jarayoniga database so'rovi qo'shilmaydi.
+    """
+
+    def __init__(self, manager: 'QuizManager', checkpoint_interval: float = 0.5):
+        self.manager = manager
+        self.checkpoint_interval = checkpoint_interval
+        self._dirty: set[SessionKey] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"marked": 0, "flushes": 0, "written": 0, "deleted": 0, "flush_seconds": 0.0}
+
+    def mark(self, kind: str, owner_id: int) -> None:
+        """Sessiya o'zgardi - keyingi checkpoint'da yoziladi"""
+        self.stats["marked"] += 1
+        self._dirty.add((kind, owner_id))
+        self._ensure_running()
+
+    async def flush(self) -> None:
+        """O'zgargan sessiyalarni bazaga yozish"""
+        if not self._dirty:
+            return
+
+        dirty, self._dirty = self._dirty, set()
+        started = time.perf_counter()
+        upserts: list[tuple[str, int, str]] = []
+        deletes: list[SessionKey] = []
+
+        for kind, owner_id in dirty:
+            session = self._get_session(kind, owner_id)
+            if session is None:
+                deletes.append((kind, owner_id))
+            else:
+                upserts.append((kind, owner_id, json.dumps(session.to_snapshot(), separators=(",", ":"))))
+
+        try:
+            db = await get_db()
+            await db.save_session_snapshots(upserts, deletes)
+        except Exception as e:
+            # Keyingi urinishda qayta yozish
+            self._dirty |= dirty
+            logger.warning(f"Sessiyalarni saqlashda xato: {e}")
+            return
+
+        self.stats["flushes"] += 1
+        self.stats["written"] += len(upserts)
+        self.stats["deleted"] += len(deletes)
+        self.stats["flush_seconds"] += time.perf_counter() - started
+
+    async def load(self) -> list[tuple[str, int, dict]]:
+        """Saqlangan barcha snapshot'larni o'qish"""
+        db = await get_db()
+        snapshots = []
+        for kind, owner_id, snapshot in await db.get_session_snapshots():
+            try:
+                snapshots.append((kind, owner_id, json.loads(snapshot)))
+            except ValueError:
+                self.mark(kind, owner_id)  # Buzilgan yozuv o'chiriladi
+        return snapshots
+
+    async def stop(self) -> None:
+        """Checkpoint siklini to'xtatish va qolganlarini yozish"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    # ==================== ICHKI METODLAR ====================
+
+    def _get_session(self, kind: str, owner_id: int):
+        if kind == KIND_PRIVATE:
+            return self.manager.active_sessions.get(owner_id)
+        return self.manager.group_sessions.get(owner_id)
+
+    def _ensure_running(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            self._task = asyncio.get_running_loop().create_task(self._checkpoint_loop())
+        except RuntimeError:
+            pass  # Event loop yo'q - keyingi flush() da yoziladi
+
+    async def _checkpoint_loop(self) -> None:
+        while self._dirty:
+            await asyncio.sleep(self.checkpoint_interval)
+            await self.flush()
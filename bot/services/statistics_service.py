@@ -5,6 +5,10 @@ Statistika hisoblash va taqdim etish
 from typing import Optional
 from bot.models import Quiz, QuizResult, UserStatistics
 from bot.database import get_db
+from bot.utils import escape_html
+
+# Telegram xabar matni chegarasi
+MAX_MESSAGE_LENGTH = 4096
 
 
 class StatisticsService:
@@ -150,21 +154,47 @@ class StatisticsService:
         )
     
     @staticmethod
-    def format_leaderboard(participants: list, quiz_title: str = "") -> str:
-        """Guruh natijalarini formatlash"""
+    def format_leaderboard(participants: list, quiz_title: str = "",
+                           total_participants: Optional[int] = None) -> str:
+        """Guruh natijalarini formatlash (Telegram xabar chegarasidan oshmaydi)"""
         if not participants:
             return "👥 Hech kim ishtirok etmadi."
         
+        total = total_participants or len(participants)
+        
         text = f"🏆 <b>Natijalar</b>\n"
         if quiz_title:
             text += f"📝 {quiz_title}\n"
+        text += f"👥 Ishtirokchilar: {total}\n"
         text += "━━━━━━━━━━━━━━━━━━━\n\n"
         
         medals = ["🥇", "🥈", "🥉"]
         
+        # Oxirida "yana N ta" qatori uchun joy qoldiriladi
+        limit = MAX_MESSAGE_LENGTH - 64
+        shown = 0
         for i, p in enumerate(participants):
             medal = medals[i] if i < 3 else f"{i+1}."
-            text += f"{medal} <b>{p.username}</b>\n"
-            text += f"    ✅ {p.correct_count}/{p.total_answered} ({p.accuracy}%)\n\n"
+            entry = (
+                f"{medal} <b>{escape_html(p.username)}</b>\n"
+                f"    ✅ {p.correct_count}/{p.total_answered} ({p.accuracy}%)\n\n"
+            )
+            if len(text) + len(entry) > limit:
+                break
+            text += entry
+            shown += 1
+        
+        if total > shown:
+            text += f"<i>... va yana {total - shown} ishtirokchi</i>"
         
         return text
+    
+    @staticmethod
+    def format_live_top(participants: list) -> str:
+        """Savollar orasida ko'rsatiladigan qisqa reyting"""
+        medals = ["🥇", "🥈", "🥉"]
+        lines = []
+        for i, p in enumerate(participants):
+            medal = medals[i] if i < 3 else f"{i+1}."
+            lines.append(f"{medal} {escape_html(p.username)} - {p.correct_count}")
+        return "\n".join(lines)
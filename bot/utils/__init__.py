@@ -1,3 +1,6 @@
-from .helpers import escape_html, truncate_text, format_time, generate_share_code
+from .helpers import escape_html, truncate_text, format_time, generate_share_code, make_message, format_option_histogram
+from .downloads import download_to_spool, FileTooLarge
+from .tasks import spawn
 
-__all__ = ["escape_html", "truncate_text", "format_time", "generate_share_code"]
+__all__ = ["escape_html", "truncate_text", "format_time", "generate_share_code", "make_message", "format_option_histogram",
+           "download_to_spool", "FileTooLarge", "spawn"]
@@ -0,0 +1,108 @@
+"""
+Fayllarni yuklab olish
+Telegram fayllarini hajm chegarasi bilan oqimli yuklash
+"""
+import asyncio
+import io
+import os
+import shutil
+import tempfile
+from typing import BinaryIO
+
+from aiogram import Bot
+
+# Shu hajmgacha fayl xotirada, undan kattasi vaqtinchalik faylda saqlanadi
+SPOOL_MEMORY_LIMIT = 1024 * 1024
+
+CHUNK_SIZE = 64 * 1024
+
+
+class TempUpload(io.BufferedRandom):
+    """
+    Diskdagi vaqtinchalik fayl (yopilganda o'chiriladi). name - fayl yo'li:
+    parse jarayonlari uni o'zlari ochadi, mazmuni jarayonlar orasida uzatilmaydi.
+    """
+
+    def __init__(self):
+        fd, path = tempfile.mkstemp(prefix="upload-")
+        os.close(fd)
+        super().__init__(io.FileIO(path, "w+b"))
+
+    def close(self) -> None:
+        path = self.name
+        try:
+            super().close()
+        finally:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+class FileTooLarge(Exception):
+    """Yuklanayotgan fayl ruxsat etilgan hajmdan oshdi"""
+
+    def __init__(self, limit: int):
+        super().__init__(f"Fayl hajmi {limit // (1024 * 1024)} MB dan oshdi")
+        self.limit = limit
+
+
+async def download_to_spool(bot: Bot, file_path: str, max_size: int,
+                            timeout: int = 60) -> BinaryIO:
+    """
+    Faylni oqim bilan yuklash: SPOOL_MEMORY_LIMIT gacha xotiraga (BytesIO),
+    undan kattasi diskka (TempUpload).
+
+    Hajm har bir bo'lak kelganda tekshiriladi - chegaradan oshsa yuklash
+    darhol to'xtatiladi (FileTooLarge). Qaytarilgan fayl boshiga o'tkazilgan,
+    uni chaqirgan kod yopadi.
+    """
+    spool: BinaryIO = io.BytesIO()
+    try:
+        if bot.session.api.is_local:
+            # Lokal Bot API server: fayl diskda turibdi
+            local_path = str(bot.session.api.wrap_local_file.to_local(file_path))
+            size = os.path.getsize(local_path)
+            if size > max_size:
+                raise FileTooLarge(max_size)
+            if size > SPOOL_MEMORY_LIMIT:
+                spool = TempUpload()
+            await asyncio.to_thread(_copy_file, local_path, spool)
+        else:
+            url = bot.session.api.file_url(bot.token, file_path)
+            received = 0
+            stream = bot.session.stream_content(url=url, timeout=timeout, chunk_size=CHUNK_SIZE)
+            try:
+                async for chunk in stream:
+                    received += len(chunk)
+                    if received > max_size:
+                        raise FileTooLarge(max_size)
+                    if received > SPOOL_MEMORY_LIMIT and isinstance(spool, io.BytesIO):
+                        spool = _spill(spool)
+                    spool.write(chunk)
+            finally:
+                # Ulanish darhol yopiladi (chegaradan oshganda ham)
+                await stream.aclose()
+        spool.flush()
+        spool.seek(0)
+        return spool
+    except BaseException:
+        spool.close()
+        raise
+
+
+def _copy_file(path: str, destination: BinaryIO) -> None:
+    with open(path, "rb") as source:
+        shutil.copyfileobj(source, destination, CHUNK_SIZE)
+
+
+def _spill(memory: io.BytesIO) -> TempUpload:
+    """Xotiradagi qismni diskka ko'chirish"""
+    disk = TempUpload()
+    try:
+        disk.write(memory.getbuffer())
+    except BaseException:
+        disk.close()
+        raise
+    memory.close()
+    return disk
@@ -4,8 +4,12 @@ Yordamchi funksiyalar
 import html
 import uuid
 import re
+from datetime import datetime
 from typing import Optional
 
+from aiogram import Bot
+from aiogram.types import Chat, Message
+
 
 def escape_html(text: str) -> str:
     """HTML belgilarini escape qilish"""
@@ -95,6 +99,16 @@ def letter_to_index(letter: str) -> int:
     return ord(letter.upper()) - 65
 
 
+def format_option_histogram(counts, bar_width: int = 8) -> str:
+    """Variantlar bo'yicha javoblar taqsimoti (A ▰▰▰▱▱ 3)"""
+    top = max(counts, default=0)
+    lines = []
+    for index, count in enumerate(counts):
+        filled = round(count / top * bar_width) if top else 0
+        lines.append(f"{get_option_letter(index)} {'▰' * filled}{'▱' * (bar_width - filled)} {count}")
+    return "\n".join(lines)
+
+
 def format_duration(start_time, end_time) -> str:
     """Davomiylikni formatlash"""
     if not start_time or not end_time:
@@ -104,3 +118,13 @@ def format_duration(start_time, end_time) -> str:
     total_seconds = int(duration.total_seconds())
     
     return format_time(total_seconds)
+
+
+def make_message(bot: Bot, chat_id: int, message_id: Optional[int] = None,
+                 chat_type: str = "private") -> Message:
+    """Mavjud xabar uchun Message obyekti (restart'dan keyin edit/answer qilish uchun)"""
+    return Message(
+        message_id=message_id or 0,
+        date=datetime.now(),
+        chat=Chat(id=chat_id, type=chat_type)
+    ).as_(bot)
@@ -0,0 +1,24 @@
+"""
+Fon vazifalari
+Taymerlar va natijalarni saqlash kabi handler'dan ajralgan vazifalar
+"""
+import asyncio
+import logging
+from typing import Coroutine
+
+# Havola saqlanmasa GC vazifani tugamasidan o'chirishi mumkin
+_background_tasks: set[asyncio.Task] = set()
+
+
+def spawn(coro: Coroutine, description: str) -> asyncio.Task:
+    """Fon vazifasini ishga tushirish; xatosi log'ga yoziladi"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    task.add_done_callback(lambda t: _log_failure(t, description))
+    return task
+
+
+def _log_failure(task: asyncio.Task, description: str) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logging.error(f"{description}: {task.exception()!r}", exc_info=task.exception())
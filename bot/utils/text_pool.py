@@ -0,0 +1,69 @@
+"""
+Matnlar pool'i
+Savol va variantlarni normallashtirish, teng matnlarni bitta nusxada saqlash
+"""
+import re
+import unicodedata
+from typing import Iterable
+
+from bot.config import config
+
+# Ko'rinmas belgilar (Word va brauzerdan nusxalashda qo'shiladi)
+_INVISIBLE_RE = re.compile("[\u00ad\u200b\u2060\ufeff]")
+# Qator ko'chirishdan boshqa bo'shliqlar (tab, NBSP, ingichka bo'shliq va h.k.)
+_SPACE_RE = re.compile(r"[^\S\n]+")
+_LINE_EDGE_RE = re.compile(r" ?\n ?")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Matnni normallashtirish: NFC, ko'rinmas belgilarsiz, bo'shliqlar bittadan,
+    qatorlar chetidagi bo'shliqlarsiz. Qator ko'chirishlar saqlanadi.
+    """
+    if not text.isascii():
+        text = _INVISIBLE_RE.sub("", unicodedata.normalize("NFC", text))
+    # isprintable() tab, NBSP va qator ko'chirishda False - odatiy matn tez o'tadi
+    if "  " in text or not text.isprintable():
+        text = _LINE_EDGE_RE.sub("\n", _SPACE_RE.sub(" ", text))
+    return text.strip()
+
+
+class TextPool:
+    """Teng matnlarning umumiy nusxalari (faqat quiz ichida takrorlangan qisqa matnlar)"""
+
+    def __init__(self, max_size: int = 50000, max_length: int = 128):
+        self.max_size = max_size
+        self.max_length = max_length
+        self._strings: dict[str, str] = {}
+        self.counters = {"hits": 0, "resets": 0}
+
+    def intern(self, text: str, seen: dict[str, str]) -> str:
+        """Matnning umumiy nusxasi (seen - bitta quiz uchun vaqtinchalik lug'at)"""
+        shared = self._strings.get(text)
+        if shared is not None:
+            self.counters["hits"] += 1
+            return shared
+        first = seen.get(text)
+        if first is None:
+            seen[text] = text
+            return text
+        if len(first) <= self.max_length and self.max_size > 0:
+            if len(self._strings) >= self.max_size:
+                self._strings.clear()
+                self.counters["resets"] += 1
+            self._strings[first] = first
+        return first
+
+    def intern_all(self, texts: Iterable[str], seen: dict[str, str]) -> list[str]:
+        """Variantlar ro'yxatining umumiy nusxalari"""
+        return [self.intern(text, seen) for text in texts]
+
+    def clear(self) -> None:
+        self._strings.clear()
+
+    def stats(self) -> dict:
+        return {"strings": len(self._strings), **self.counters}
+
+
+# Global instance
+text_pool = TextPool(max_size=config.text_pool.max_size, max_length=config.text_pool.max_length)
@@ -0,0 +1,134 @@
+"""
+Webhook rejimi
+Update'larni ichki aiohttp server orqali qabul qilish
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from bot.config import WebhookConfig
+
+logger = logging.getLogger(__name__)
+
+# Shutdown paytida ishlanayotgan update'larni kutish vaqti (soniya)
+DRAIN_TIMEOUT = 10.0
+
+
+class BoundedRequestHandler(SimpleRequestHandler):
+    """
+    Webhook so'rovlarini qabul qiluvchi handler.
+
+    Telegram'ga darhol 200 javob qaytariladi, update esa fonda ishlanadi.
+    Bir vaqtda ishlanadigan update'lar soni max_concurrency bilan
+    cheklanadi - qolganlari navbatda kutadi (backlog).
+    """
+
+    def __init__(self, dispatcher: Dispatcher, bot: Bot, max_concurrency: int = 100,
+                 secret_token: Optional[str] = None, **data: Any):
+        super().__init__(dispatcher, bot, handle_in_background=True,
+                         secret_token=secret_token, **data)
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._waiting = 0
+        self._in_flight = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+        # Hisoblagichlar
+        self.counters = {"received": 0, "processed": 0, "failed": 0}
+
+    async def _background_feed_update(self, bot: Bot, update: Dict[str, Any]) -> None:
+        started = time.monotonic()
+        self.counters["received"] += 1
+        self._waiting += 1
+
+        async with self._semaphore:
+            self._waiting -= 1
+            self._in_flight += 1
+            try:
+                await super()._background_feed_update(bot, update)
+                self.counters["processed"] += 1
+            except Exception as e:
+                self.counters["failed"] += 1
+                logger.exception(f"Update {update.get('update_id')} ni ishlashda xato: {e}")
+            finally:
+                self._in_flight -= 1
+                latency = time.monotonic() - started
+                self._latency_total += latency
+                self._latency_max = max(self._latency_max, latency)
+
+    async def close(self) -> None:
+        """
+        Fondagi update'lar tugashini kutish.
+
+        Bot sessiyasi bu yerda yopilmaydi - shutdown xabarlari uchun kerak,
+        uni ishga tushirgan kod yopadi.
+        """
+        pending = list(self._background_feed_update_tasks)
+        if pending:
+            logger.info(f"{len(pending)} ta update tugashi kutilmoqda...")
+            await asyncio.wait(pending, timeout=DRAIN_TIMEOUT)
+
+    def stats(self) -> dict:
+        """Webhook statistikasi"""
+        done = self.counters["processed"] + self.counters["failed"]
+        return {
+            **self.counters,
+            "in_flight": self._in_flight,
+            "backlog": self._waiting,
+            "avg_latency_ms": round(self._latency_total / done * 1000, 2) if done else 0.0,
+            "max_latency_ms": round(self._latency_max * 1000, 2)
+        }
+
+
+def create_webhook_app(dp: Dispatcher, bot: Bot,
+                       settings: WebhookConfig) -> tuple[web.Application, BoundedRequestHandler]:
+    """aiohttp ilovasini yaratish (dispatcher startup/shutdown bilan bog'langan)"""
+    app = web.Application()
+    handler = BoundedRequestHandler(
+        dp, bot,
+        max_concurrency=settings.max_concurrency,
+        secret_token=settings.secret_token or None
+    )
+    # Shutdown tartibi: avval fondagi update'lar tugaydi, keyin dispatcher shutdown
+    handler.register(app, path=settings.path)
+    setup_application(app, dp, bot=bot)
+    return app, handler
+
+
+async def register_webhook(dp: Dispatcher, bot: Bot, settings: WebhookConfig,
+                           drop_pending_updates: bool = False) -> None:
+    """Webhook manzilini Telegram'da ro'yxatdan o'tkazish"""
+    await bot.set_webhook(
+        url=settings.url.rstrip("/") + settings.path,
+        secret_token=settings.secret_token or None,
+        allowed_updates=dp.resolve_used_update_types(),
+        max_connections=min(settings.max_concurrency, 100),
+        drop_pending_updates=drop_pending_updates
+    )
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot, settings: WebhookConfig,
+                      drop_pending_updates: bool = False) -> None:
+    """Webhook serverini ishga tushirish va to'xtatilguncha kutish"""
+    app, handler = create_webhook_app(dp, bot, settings)
+    runner = web.AppRunner(app)
+    await runner.setup()
+
+    try:
+        site = web.TCPSite(runner, host=settings.host, port=settings.port)
+        await site.start()
+        logger.info(f"Webhook server: {settings.host}:{settings.port}{settings.path}")
+
+        await register_webhook(dp, bot, settings, drop_pending_updates)
+        logger.info(f"Webhook o'rnatildi: {settings.url.rstrip('/')}{settings.path}")
+
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        logger.info(f"Webhook statistika: {handler.stats()}")
@@ -0,0 +1,313 @@
+"""
+Ko'p jarayonli rejim
+Update'larni chat_id bo'yicha bir nechta worker jarayonlarga taqsimlash
+"""
+import asyncio
+import logging
+import multiprocessing as mp
+import queue as queue_module
+import signal
+import time
+from typing import Any, Callable, Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler
+from aiohttp import web
+
+from bot.config import config
+from bot.webhook import register_webhook
+
+logger = logging.getLogger(__name__)
+
+# Worker bir marta navbatdan oladigan update'lar soni
+BATCH_SIZE = 100
+
+# To'xtatishda worker'lar ishni tugatishini kutish vaqti (soniya)
+STOP_TIMEOUT = 30.0
+
+# Worker holati tekshiriladigan oraliq (soniya)
+HEALTH_INTERVAL = 5.0
+
+
+def update_chat_id(update: dict) -> int:
+    """
+    Update qaysi chat'ga tegishli ekanini aniqlash.
+
+    Chat bo'lmasa (inline so'rov, inline xabardagi callback) foydalanuvchi
+    id'si olinadi - u shaxsiy chat id'si bilan bir xil.
+    """
+    for key, payload in update.items():
+        if key == "update_id" or not isinstance(payload, dict):
+            continue
+        if "chat" in payload:
+            return payload["chat"]["id"]
+        message = payload.get("message")
+        if isinstance(message, dict) and "chat" in message:
+            return message["chat"]["id"]
+        user = payload.get("from") or payload.get("user")
+        if user:
+            return user["id"]
+    return 0
+
+
+def shard_for(chat_id: int, count: int) -> int:
+    """Chat qaysi worker'ga tegishli (barqaror, restart'dan keyin ham bir xil)"""
+    return chat_id % count
+
+
+def take_batch(updates: Any, limit: int = BATCH_SIZE) -> list:
+    """Navbatdan kamida bitta, ko'pi bilan limit ta element olish (bloklovchi)"""
+    batch = [updates.get()]
+    while len(batch) < limit and batch[-1] is not None:
+        try:
+            batch.append(updates.get_nowait())
+        except queue_module.Empty:
+            break
+    return batch
+
+
+class WorkerMetrics:
+    """Worker hisoblagichlari (jarayonlar orasida umumiy xotirada)"""
+
+    FIELDS = ("processed", "failed", "handler_seconds")
+
+    def __init__(self, ctx: Any, count: int):
+        self._values = ctx.Array("d", count * len(self.FIELDS), lock=False)
+
+    def record(self, index: int, ok: bool, seconds: float) -> None:
+        """Bitta update natijasini yozish (faqat o'sha worker yozadi)"""
+        base = index * len(self.FIELDS)
+        self._values[base + (0 if ok else 1)] += 1
+        self._values[base + 2] += seconds
+
+    def get(self, index: int) -> dict:
+        base = index * len(self.FIELDS)
+        return {name: self._values[base + i] for i, name in enumerate(self.FIELDS)}
+
+
+class WorkerSupervisor:
+    """
+    Worker jarayonlarini boshqaruvchi.
+
+    Har bir update chat_id xeshi bo'yicha doim bitta worker'ga yuboriladi,
+    shuning uchun chat'ning QuizManager sessiyasi va FSM state'i shu
+    worker xotirasida qoladi. To'xtab qolgan worker qayta ishga tushiriladi.
+    """
+
+    def __init__(self, count: int, target: Optional[Callable] = None,
+                 metrics_interval: float = 60.0):
+        self.count = count
+        self.metrics_interval = metrics_interval
+        self._target = target or worker_main
+        self._ctx = mp.get_context("spawn")
+        self._queues = [self._ctx.Queue() for _ in range(count)]
+        self._processes: list[Optional[mp.process.BaseProcess]] = [None] * count
+        self.metrics = WorkerMetrics(self._ctx, count)
+
+        # Hisoblagichlar
+        self.routed = [0] * count
+        self.restarts = 0
+        self._last_processed = [0.0] * count
+        self._last_report = time.monotonic()
+
+    # ==================== PUBLIC API ====================
+
+    def start(self) -> None:
+        """Barcha worker'larni ishga tushirish"""
+        for index in range(self.count):
+            self._spawn(index)
+
+    def route(self, update: dict) -> int:
+        """Update'ni tegishli worker navbatiga qo'yish"""
+        index = shard_for(update_chat_id(update), self.count)
+        self._queues[index].put(update)
+        self.routed[index] += 1
+        return index
+
+    def check_workers(self) -> None:
+        """To'xtab qolgan worker'larni qayta ishga tushirish"""
+        for index, process in enumerate(self._processes):
+            if process is not None and not process.is_alive():
+                logger.warning(f"Worker {index} to'xtadi (kod {process.exitcode}), qayta ishga tushirilmoqda")
+                self.restarts += 1
+                self._spawn(index)
+
+    def stats(self) -> list[dict]:
+        """Har bir worker statistikasi (throughput - oxirgi hisobotdan beri)"""
+        now = time.monotonic()
+        elapsed = max(now - self._last_report, 1e-9)
+        result = []
+        for index in range(self.count):
+            values = self.metrics.get(index)
+            done = values["processed"] + values["failed"]
+            result.append({
+                "worker": index,
+                "routed": self.routed[index],
+                "processed": int(values["processed"]),
+                "failed": int(values["failed"]),
+                "backlog": max(0, self.routed[index] - int(done)),
+                "per_second": round((values["processed"] - self._last_processed[index]) / elapsed, 1),
+                "avg_handler_ms": round(values["handler_seconds"] / done * 1000, 2) if done else 0.0,
+            })
+            self._last_processed[index] = values["processed"]
+        self._last_report = now
+        return result
+
+    async def monitor(self) -> None:
+        """Worker'lar holatini kuzatish va statistikani vaqti-vaqti bilan chiqarish"""
+        last_report = time.monotonic()
+        while True:
+            await asyncio.sleep(HEALTH_INTERVAL)
+            self.check_workers()
+            if time.monotonic() - last_report >= self.metrics_interval:
+                last_report = time.monotonic()
+                logger.info(f"Worker statistika: {self.stats()}")
+
+    async def poll(self, bot: Bot, allowed_updates: list[str], polling_timeout: int = 10) -> None:
+        """getUpdates orqali update'larni olish va worker'larga taqsimlash"""
+        offset = None
+        backoff = 1.0
+        while True:
+            try:
+                updates = await bot.get_updates(
+                    offset=offset, timeout=polling_timeout, allowed_updates=allowed_updates
+                )
+                backoff = 1.0
+            except Exception as e:
+                logger.warning(f"getUpdates xatosi: {e}, {backoff:.0f} s dan keyin qayta urinish")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+                continue
+
+            for update in updates:
+                offset = update.update_id + 1
+                self.route(update.model_dump(mode="json", exclude_unset=True, by_alias=True))
+
+    async def stop(self, timeout: float = STOP_TIMEOUT) -> None:
+        """Worker'larga to'xtash signalini yuborish va tugashini kutish"""
+        for updates in self._queues:
+            updates.put(None)
+
+        deadline = time.monotonic() + timeout
+        for index, process in enumerate(self._processes):
+            if process is None:
+                continue
+            await asyncio.to_thread(process.join, max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"Worker {index} o'z vaqtida to'xtamadi, majburan to'xtatilmoqda")
+                process.terminate()
+                process.join()
+        logger.info(f"Worker statistika: {self.stats()}")
+
+    # ==================== ICHKI METODLAR ====================
+
+    def _spawn(self, index: int) -> None:
+        process = self._ctx.Process(
+            target=self._target,
+            args=(index, self.count, self._queues[index], self.metrics),
+            name=f"quiz-worker-{index}"
+        )
+        process.start()
+        self._processes[index] = process
+
+
+class ShardingRequestHandler(SimpleRequestHandler):
+    """Webhook update'larini o'zida ishlamay, worker'larga taqsimlovchi handler"""
+
+    def __init__(self, dispatcher: Dispatcher, bot: Bot, supervisor: WorkerSupervisor,
+                 secret_token: Optional[str] = None):
+        super().__init__(dispatcher, bot, handle_in_background=True, secret_token=secret_token)
+        self.supervisor = supervisor
+
+    async def _handle_request_background(self, bot: Bot, request: web.Request) -> web.Response:
+        self.supervisor.route(await request.json(loads=bot.session.json_loads))
+        return web.json_response({}, dumps=bot.session.json_dumps)
+
+    async def close(self) -> None:
+        """Bot sessiyasini ishga tushirgan kod yopadi"""
+
+
+# ==================== WORKER JARAYONI ====================
+
+def worker_main(index: int, count: int, updates: Any, metrics: WorkerMetrics) -> None:
+    """Worker jarayoni kirish nuqtasi"""
+    # Ctrl+C supervisor'ga keladi, worker navbatdagi None orqali to'xtaydi
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_serve(index, count, updates, metrics))
+
+
+async def _serve(index: int, count: int, updates: Any, metrics: WorkerMetrics) -> None:
+    # bot.main supervisor'ni import qiladi - shu sababli bu yerda import qilinadi
+    from bot.main import create_bot, create_dispatcher, start_services, stop_services, stop_outbound
+    from bot.services.outbound_scheduler import outbound_scheduler
+
+    # Telegram limiti butun bot uchun - worker'lar orasida teng bo'linadi
+    outbound_scheduler.rate_limit = config.outbound.rate_limit / count
+
+    bot = create_bot()
+    dp = create_dispatcher()
+    await start_services(bot, shard=lambda chat_id: shard_for(chat_id, count) == index)
+    logger.info(f"Worker {index} tayyor")
+
+    loop = asyncio.get_running_loop()
+    tasks: set[asyncio.Task] = set()
+
+    async def process(update: dict) -> None:
+        started = time.perf_counter()
+        ok = False
+        try:
+            await dp.feed_raw_update(bot, update)
+            ok = True
+        except Exception as e:
+            logger.exception(f"Worker {index}: update {update.get('update_id')} ni ishlashda xato: {e}")
+        finally:
+            metrics.record(index, ok, time.perf_counter() - started)
+
+    try:
+        running = True
+        while running:
+            for update in await loop.run_in_executor(None, take_batch, updates):
+                if update is None:
+                    running = False
+                    break
+                task = asyncio.create_task(process(update))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+    finally:
+        if tasks:
+            await asyncio.wait(tasks, timeout=STOP_TIMEOUT)
+        await stop_services()
+        await stop_outbound()
+        await bot.session.close()
+
+
+# ==================== ISHGA TUSHIRISH ====================
+
+async def run_supervisor(bot: Bot, dp: Dispatcher) -> None:
+    """Worker'larni ishga tushirish va update'larni ularga taqsimlash"""
+    supervisor = WorkerSupervisor(config.workers.count, metrics_interval=config.workers.metrics_interval)
+    supervisor.start()
+    logger.info(f"{supervisor.count} ta worker ishga tushirildi")
+
+    monitor = asyncio.create_task(supervisor.monitor())
+    runner = None
+    try:
+        if config.bot.mode == "webhook":
+            app = web.Application()
+            ShardingRequestHandler(
+                dp, bot, supervisor, secret_token=config.webhook.secret_token or None
+            ).register(app, path=config.webhook.path)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            await web.TCPSite(runner, host=config.webhook.host, port=config.webhook.port).start()
+            await register_webhook(dp, bot, config.webhook, config.bot.drop_pending_updates)
+            logger.info(f"Webhook o'rnatildi: {config.webhook.url.rstrip('/')}{config.webhook.path}")
+            await asyncio.Event().wait()
+        else:
+            await bot.delete_webhook(drop_pending_updates=config.bot.drop_pending_updates)
+            await supervisor.poll(bot, dp.resolve_used_update_types())
+    finally:
+        monitor.cancel()
+        if runner:
+            await runner.cleanup()
+        await supervisor.stop()
@@ -0,0 +1,69 @@
+"""DocxParser: bo'laklab o'qish bitta o'tishdagi natija bilan bir xil"""
+import pytest
+
+from bot.services.docx_parser import DocxParser
+from benchmarks.corpus import FORMAT_CLASSIC, FORMAT_QUESTION_MARK, CorpusSpec, make_corpus_docx, make_docx
+
+
+def snapshot(result) -> tuple:
+    return result.success, result.error_message, [(q.text, q.options, q.correct_index) for q in result.questions]
+
+
+def parse_in_chunks(data: bytes, count: int, **params):
+    parser = DocxParser(**params)
+    return parser.merge_chunks([parser.parse_chunk(data, index, count) for index in range(count)])
+
+
+@pytest.mark.parametrize("file_format", [FORMAT_CLASSIC, FORMAT_QUESTION_MARK])
+@pytest.mark.parametrize("count", [1, 2, 3, 7])
+def test_merged_chunks_match_single_pass(file_format, count):
+    data = make_corpus_docx(CorpusSpec(questions=200, format=file_format, noise=0.2, long_options=0.1))
+    expected = snapshot(DocxParser().parse(data))
+    assert expected[0] and len(expected[2]) == 200
+    assert snapshot(parse_in_chunks(data, count)) == expected
+
+
+@pytest.mark.parametrize("count", [2, 3])
+def test_merged_chunks_report_same_errors(count):
+    paragraphs = []
+    for i in range(1, 61):
+        paragraphs += [f"{i}. Savol {i}?", "A) birinchi", "B) ikkinchi" if i % 10 else "B) yo'q"]
+        if i % 10:
+            paragraphs[-1] = "*" + paragraphs[-1]
+    data = make_docx(paragraphs)
+    expected = snapshot(DocxParser().parse(data))
+    assert not expected[0]
+    assert snapshot(parse_in_chunks(data, count)) == expected
+
+
+def test_missing_answer_reported_before_few_options():
+    # 1-savolda ham to'g'ri javob yo'q, ham bitta variant: faqat birinchi xato turi ko'rsatiladi
+    data = make_docx(["1. Savol?", "A) faqat bitta", "2. Savol?", "A) x", "*B) y", "3. Savol?", "*A) z"])
+    result = DocxParser().parse(data)
+    assert not result.success
+    assert "to'g'ri javob belgilanmagan:\nSavollar: 1\n" in result.error_message
+    assert "kamida 2 ta variant" not in result.error_message
+
+
+INTRO_THEN_QUESTION_MARK = [
+    line for i in range(1, 26) for line in (f"{i}. Mavzu", "A) izoh")
+] + ["?Birinchi savol", "+to'g'ri", "=noto'g'ri", "?Ikkinchi savol", "=noto'g'ri", "+to'g'ri"]
+
+
+@pytest.mark.parametrize("count", [1, 2, 3])
+def test_numbered_intro_before_question_mark_format(count):
+    # Eski parser: ? qatori bor - butun fayl yangi formatda, kirish qismi e'tiborsiz (2 savol)
+    data = make_docx(INTRO_THEN_QUESTION_MARK)
+    expected = (True, "", [("Birinchi savol", ("to'g'ri", "noto'g'ri"), 0),
+                           ("Ikkinchi savol", ("noto'g'ri", "to'g'ri"), 1)])
+    assert snapshot(DocxParser().parse(data)) == expected
+    assert snapshot(parse_in_chunks(data, count)) == expected
+
+
+@pytest.mark.parametrize("count", [2, 3])
+def test_classic_errors_over_budget_abort(count):
+    data = make_docx([line for i in range(1, 41) for line in (f"{i}. Savol {i}?", "A) x", "B) y")])
+    result = DocxParser(error_budget=5).parse(data)
+    assert not result.success
+    assert "6-savolda to'xtatildi" in result.error_message
+    assert snapshot(parse_in_chunks(data, count, error_budget=5)) == snapshot(result)
@@ -0,0 +1,110 @@
+"""EditCoalescer: edit'larni birlashtirish va o'zgarmagan matnni yubormaslik"""
+import asyncio
+from types import SimpleNamespace
+
+from bot.services.edit_coalescer import EditCoalescer
+
+
+class FakeMessage:
+    """edit_text chaqiruvlarini yozib boradi"""
+
+    def __init__(self, chat_id: int = 1, message_id: int = 10):
+        self.chat = SimpleNamespace(id=chat_id)
+        self.message_id = message_id
+        self.sent: list[str] = []
+
+    async def edit_text(self, text: str, **kwargs) -> None:
+        self.sent.append(text)
+
+
+def make_coalescer() -> EditCoalescer:
+    return EditCoalescer(flush_interval=0.01, min_edit_interval=0)
+
+
+async def settle(coalescer: EditCoalescer) -> None:
+    """Navbatdagi va yuborilayotgan edit'lar tugashini kutish"""
+    while coalescer.pending_count or coalescer._inflight:
+        await asyncio.sleep(0.01)
+
+
+def test_only_latest_pending_text_is_sent():
+    async def scenario():
+        coalescer, message = make_coalescer(), FakeMessage()
+        for second in (30, 29, 28, 27):
+            await coalescer.edit(message, f"⏱ {second}")
+        await settle(coalescer)
+        assert message.sent == ["⏱ 27"]
+        assert coalescer.stats["merged"] == 3
+
+    asyncio.run(scenario())
+
+
+def test_pending_edit_dropped_when_text_returns_to_last_sent():
+    async def scenario():
+        coalescer, message = make_coalescer(), FakeMessage()
+        await coalescer.edit(message, "A")
+        await settle(coalescer)
+
+        # B hali yuborilmagan, keyin yana A - xabar allaqachon A ko'rinishida
+        await coalescer.edit(message, "B")
+        await coalescer.edit(message, "A")
+        assert coalescer.pending_count == 0
+        await settle(coalescer)
+        await asyncio.sleep(0.05)
+        assert message.sent == ["A"]
+        assert coalescer.stats["skipped"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_edit_now_replaces_pending_edit():
+    async def scenario():
+        coalescer, message = make_coalescer(), FakeMessage()
+        await coalescer.edit(message, "⏱ 5")
+        assert await coalescer.edit_now(message, "✅ Javob qabul qilindi")
+        await settle(coalescer)
+        await asyncio.sleep(0.05)
+        assert message.sent == ["✅ Javob qabul qilindi"]
+
+    asyncio.run(scenario())
+
+
+def test_edits_during_and_after_edit_now_are_dropped():
+    async def scenario():
+        coalescer, message = make_coalescer(), FakeMessage()
+        release = asyncio.Event()
+        edit_text = message.edit_text
+
+        async def slow_edit_text(text: str, **kwargs) -> None:
+            await release.wait()
+            await edit_text(text, **kwargs)
+
+        message.edit_text = slow_edit_text
+        await coalescer.edit(message, "⏱ 10")
+        while not coalescer._inflight:
+            await asyncio.sleep(0.01)
+
+        # Kosmetik edit yuborilayotganda yakuniy edit va yana bir taymer "tick"i keladi
+        final = asyncio.create_task(coalescer.edit_now(message, "⏰ Vaqt tugadi!"))
+        await asyncio.sleep(0)
+        await coalescer.edit(message, "⏱ 9")
+        release.set()
+        assert await final
+
+        await coalescer.edit(message, "⏱ 8")
+        await settle(coalescer)
+        await asyncio.sleep(0.05)
+        assert message.sent == ["⏱ 10", "⏰ Vaqt tugadi!"]
+
+    asyncio.run(scenario())
+
+
+def test_edit_now_not_final_keeps_accepting_edits():
+    async def scenario():
+        coalescer, message = make_coalescer(), FakeMessage()
+        assert await coalescer.edit_now(message, "1-savol", final=False)
+        await coalescer.edit(message, "1-savol ⏱ 5")
+        await settle(coalescer)
+        assert message.sent == ["1-savol", "1-savol ⏱ 5"]
+
+    asyncio.run(scenario())
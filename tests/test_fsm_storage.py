@@ -0,0 +1,46 @@
+"""SQLiteStorage: JSON'ga aylanmagan state keshdan chiqarilmaydi"""
+import asyncio
+
+from aiogram.fsm.storage.base import StorageKey
+
+from bot.database.db import Database
+from bot.database.fsm_storage import SQLiteStorage
+
+
+def key(user_id: int) -> StorageKey:
+    return StorageKey(bot_id=1, chat_id=user_id, user_id=user_id)
+
+
+def test_unserializable_record_is_not_evicted(tmp_path):
+    async def scenario():
+        db = Database(str(tmp_path / "fsm.db"))
+        await db.init()
+        storage = SQLiteStorage(db, cache_size=1, flush_interval=3600)
+
+        await storage.set_data(key(1), {"step": 1})
+        await storage.flush()
+        marker = object()
+        await storage.set_data(key(1), {"step": 2, "marker": marker})
+        await storage.set_data(key(2), {"step": 1})
+        await storage.flush()
+
+        # Boshqa yozuvlar keshni to'ldiradi - saqlanmagan yozuv baribir qoladi
+        for user_id in range(3, 10):
+            await storage.get_data(key(user_id))
+        await storage.flush()
+
+        data = await storage.get_data(key(1))
+        assert data["step"] == 2 and data["marker"] is marker
+        assert await storage.get_data(key(2)) == {"step": 1}
+        assert storage.stats["unserializable"] == 1
+
+        # Keyingi yozuv saqlansa, oddiy yozuvlar kabi chiqariladi
+        await storage.set_data(key(1), {"step": 3})
+        await storage.flush()
+        for user_id in range(3, 10):
+            await storage.get_data(key(user_id))
+        assert storage.cached_count == 1
+        assert await storage.get_data(key(1)) == {"step": 3}
+        await storage.close()
+
+    asyncio.run(scenario())
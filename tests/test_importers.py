@@ -0,0 +1,97 @@
+"""Importerlar: CSV sarlavhasi va buzilgan JSON"""
+import io
+import json
+
+import pytest
+
+from bot.services.importers import JSON_CHUNK_SIZE, CsvImporter, JsonImporter, iter_json_values
+
+
+def questions(result) -> list[tuple]:
+    return [(q.text, q.options, q.correct_index) for q in result.questions]
+
+
+def test_csv_header_row_is_skipped():
+    result = CsvImporter().parse("Savol;A;B;Javob\nQ1?;x;y;B\n".encode())
+    assert result.success
+    assert questions(result) == [("Q1?", ("x", "y"), 1)]
+
+
+@pytest.mark.parametrize("answer, correct_index", [("A", 0), ("2", 1), ("x", 0)])
+def test_csv_first_row_with_answer_is_a_question(answer, correct_index):
+    result = CsvImporter().parse(f"Q0?;x;y;{answer}\nQ1?;x;y;B\n".encode())
+    assert result.success
+    assert questions(result) == [("Q0?", ("x", "y"), correct_index), ("Q1?", ("x", "y"), 1)]
+
+
+def test_csv_first_row_with_bad_answer_letter_is_an_error():
+    # Harfli javob - sarlavha emas: o'tkazib yuborilmaydi, xato ko'rsatiladi
+    result = CsvImporter().parse("Q0?;x;y;Z\nQ1?;x;y;B\n".encode())
+    assert not result.success
+    assert "Savollar: 1" in result.error_message
+
+
+def test_json_array_and_lines():
+    item = '{"question": "Q?", "options": ["a", "b"], "correct": 1}'
+    for data in (f"[{item}, {item}]", f"{item}\n{item}\n", f'{{"questions": [{item}, {item}]}}'):
+        result = JsonImporter().parse(data.encode())
+        assert result.success, data
+        assert questions(result) == [("Q?", ("a", "b"), 1)] * 2
+
+
+@pytest.mark.parametrize("data", [
+    '[{"question": "Q?", "options": ["a", "b"], "correct": 1},',
+    '[{"question": "Q?", "options": ["a", "b"], "correct": 1}',
+])
+def test_json_truncated_array(data):
+    result = JsonImporter().parse(data.encode())
+    assert not result.success
+    assert "JSON massivi yopilmagan" in result.error_message
+
+
+def test_json_error_text_is_escaped():
+    result = JsonImporter().parse('[{"question": "Q?", "options": ["a", "b"], "correct": 1} <'.encode())
+    assert not result.success
+    assert "&lt;" in result.error_message and "<" not in result.error_message
+
+
+class ReadSizes(io.StringIO):
+    """Fayldan bir marta o'qilgan eng katta bo'lakni eslab qoladi"""
+
+    largest = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.largest = max(self.largest, len(chunk))
+        return chunk
+
+
+def test_json_wrapped_bank_is_streamed():
+    items = [{"question": f"Savol {i}?", "options": ["a", "b", "c", "d"], "correct": i % 4} for i in range(40000)]
+    expected = [(f"Savol {i}?", ("a", "b", "c", "d"), i % 4) for i in range(40000)]
+    data = json.dumps({"questions": items, "title": "Bank"})
+    assert len(data) > 2 * 1024 * 1024
+
+    text = ReadSizes(data)
+    assert [(item["question"], item["correct"]) for item in iter_json_values(text)] == \
+           [(question, correct) for question, _, correct in expected]
+    assert text.largest <= JSON_CHUNK_SIZE
+
+    result = JsonImporter().parse(data.encode())
+    assert result.success
+    assert questions(result) == expected
+
+
+@pytest.mark.parametrize("data, values", [
+    ('{"questions": [1, 2]}\n{"questions": [3]}', [1, 2, {"questions": [3]}]),
+    ('{ "questions" : [1], "title": "x" } 5', [1, 5]),
+    ('{"title": "x", "questions": [1]}', [{"title": "x", "questions": [1]}]),
+])
+def test_json_wrapper_values(data, values):
+    assert list(iter_json_values(io.StringIO(data))) == values
+
+
+@pytest.mark.parametrize("data", ['{"questions": [1]', '{"questions": [1] 5', '{"questions": [1], }'])
+def test_json_wrapper_errors(data):
+    with pytest.raises(ValueError):
+        list(iter_json_values(io.StringIO(data)))
@@ -0,0 +1,68 @@
+"""Leaderboard: tartib va o'rinlar to'liq saralash bilan bir xil"""
+import random
+
+from bot.services.leaderboard import Leaderboard
+
+
+def sort_key(score: tuple[int, int]) -> tuple[int, int]:
+    """Avvalgi saralash kaliti: ko'proq to'g'ri javob, teng bo'lsa kamroq javob"""
+    correct, answered = score
+    return correct, -answered
+
+
+def test_top_and_rank_match_sort():
+    rng = random.Random(1)
+    questions = 20
+    board = Leaderboard(questions)
+    scores = {}
+    for _ in range(2000):
+        user_id = rng.randrange(300)
+        answered = rng.randint(0, questions)
+        scores[user_id] = (rng.randint(0, answered), answered)
+        board.update(user_id, *scores[user_id])
+        if rng.random() < 0.05:
+            removed = rng.choice(list(scores))
+            del scores[removed]
+            board.remove(removed)
+
+    ordered = sorted(scores, key=lambda u: sort_key(scores[u]), reverse=True)
+    assert len(board) == len(scores)
+    assert [sort_key(scores[u]) for u in board.top()] == [sort_key(scores[u]) for u in ordered]
+    assert [sort_key(scores[u]) for u in board.top(5)] == [sort_key(scores[u]) for u in ordered[:5]]
+
+    first_rank = {}
+    for position, user_id in enumerate(ordered, 1):
+        first_rank.setdefault(sort_key(scores[user_id]), position)
+    assert all(board.rank(u) == first_rank[sort_key(scores[u])] for u in scores)
+    assert board.rank(-1) is None
+
+
+def test_ties_keep_join_order():
+    board = Leaderboard(5)
+    for user_id in (3, 1, 2):
+        board.update(user_id, 2, 3)
+    board.update(4, 2, 2)
+    assert board.top() == [4, 3, 1, 2]
+    assert [board.rank(u) for u in (4, 3, 1, 2)] == [1, 2, 2, 2]
+
+
+def test_leaderboards_escape_names():
+    from bot.services.quiz_manager import ParticipantScore
+    from bot.services.statistics_service import MAX_MESSAGE_LENGTH, StatisticsService
+
+    first = ParticipantScore(1, "Tom & Jerry")
+    first.correct_count = 3
+    second = ParticipantScore(2, "<b>admin</b>")
+    second.correct_count = 1
+    text = StatisticsService.format_live_top([first, second])
+    assert text == "🥇 Tom &amp; Jerry - 3\n🥈 &lt;b&gt;admin&lt;/b&gt; - 1"
+
+    text = StatisticsService.format_leaderboard([first, second])
+    assert "🥇 <b>Tom &amp; Jerry</b>" in text
+    assert "🥈 <b>&lt;b&gt;admin&lt;/b&gt;</b>" in text
+
+    # Chegara escape qilingan matn bo'yicha o'lchanadi
+    crowd = [ParticipantScore(user_id, "&" * 60) for user_id in range(200)]
+    text = StatisticsService.format_leaderboard(crowd)
+    assert len(text) <= MAX_MESSAGE_LENGTH
+    assert "ishtirokchi</i>" in text
@@ -0,0 +1,95 @@
+"""OutboundScheduler: ustuvorlik tartibi va kosmetik so'rovlarni tashlash"""
+import asyncio
+
+import pytest
+
+from bot.services.outbound_scheduler import OutboundDropped, OutboundScheduler, Priority
+
+
+def make_scheduler(**params) -> OutboundScheduler:
+    return OutboundScheduler(**{"rate_limit": 1000.0, "max_in_flight": 1, **params})
+
+
+async def queued(scheduler: OutboundScheduler, priority: Priority, key=None) -> asyncio.Task:
+    """Navbatga qo'yilgan (hali ruxsat olmagan) acquire"""
+    task = asyncio.create_task(scheduler.acquire(priority, key))
+    await asyncio.sleep(0)
+    return task
+
+
+def test_priority_order():
+    async def scenario():
+        scheduler = make_scheduler()
+        busy = await scheduler.acquire(Priority.CRITICAL)  # Yagona joy band
+        tasks = {p: await queued(scheduler, p) for p in (Priority.COSMETIC, Priority.INTERACTIVE, Priority.CRITICAL)}
+
+        order = []
+        ticket = busy
+        while tasks:
+            scheduler.release(ticket)
+            done, _ = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_COMPLETED)
+            ticket = done.pop().result()
+            order.append(Priority(ticket.priority))
+            tasks.pop(order[-1])
+        scheduler.release(ticket)
+        await scheduler.stop()
+        assert order == [Priority.CRITICAL, Priority.INTERACTIVE, Priority.COSMETIC]
+
+    asyncio.run(scenario())
+
+
+def test_cosmetic_shed_when_queue_is_full():
+    async def scenario():
+        scheduler = make_scheduler(shed_threshold=3)
+        busy = await scheduler.acquire(Priority.CRITICAL)
+        waiting = [await queued(scheduler, Priority.CRITICAL) for _ in range(3)]
+
+        with pytest.raises(OutboundDropped):
+            await scheduler.acquire(Priority.COSMETIC)
+        # Muhim so'rovlar tashlanmaydi - navbatga turadi
+        interactive = await queued(scheduler, Priority.INTERACTIVE)
+        assert not interactive.done()
+        assert scheduler.stats()["classes"]["cosmetic"]["dropped"] == 1
+
+        for task in (*waiting, interactive):
+            task.cancel()
+        scheduler.release(busy)
+        await scheduler.stop()
+
+    asyncio.run(scenario())
+
+
+def test_cosmetic_requests_with_same_key_are_merged():
+    async def scenario():
+        scheduler = make_scheduler()
+        busy = await scheduler.acquire(Priority.CRITICAL)
+        old = await queued(scheduler, Priority.COSMETIC, key=("edit", 1, 10))
+        new = await queued(scheduler, Priority.COSMETIC, key=("edit", 1, 10))
+        other = await queued(scheduler, Priority.COSMETIC, key=("edit", 1, 11))
+
+        with pytest.raises(OutboundDropped):
+            await old
+        assert scheduler.queue_depth == 2
+
+        scheduler.release(busy)
+        scheduler.release(await new)
+        scheduler.release(await other)
+        assert scheduler.stats()["classes"]["cosmetic"]["merged"] == 1
+        await scheduler.stop()
+
+    asyncio.run(scenario())
+
+
+def test_stale_cosmetic_request_is_dropped():
+    async def scenario():
+        scheduler = make_scheduler(cosmetic_max_wait=0.05)
+        busy = await scheduler.acquire(Priority.CRITICAL)
+        stale = await queued(scheduler, Priority.COSMETIC)
+        await asyncio.sleep(0.1)
+
+        scheduler.release(busy)
+        with pytest.raises(OutboundDropped):
+            await stale
+        await scheduler.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,47 @@
+"""QuizSession: snapshot orqali saqlash va tiklash"""
+import json
+
+from bot.models import Question, Quiz, QuizSettings
+from bot.services.quiz_manager import QuizManager, QuizSession
+
+
+def make_quiz(questions: int = 10) -> Quiz:
+    return Quiz(questions=tuple(
+        Question(id=str(i), text=f"Savol {i}?", options=[f"{i}-a", f"{i}-b", f"{i}-c", f"{i}-d"],
+                 correct_index=i % 4)
+        for i in range(questions)
+    ))
+
+
+def test_snapshot_round_trip():
+    quiz = make_quiz()
+    session = QuizSession(1, quiz, QuizSettings(quiz_mode="random", question_count=6, shuffle=True))
+    session.answer_question(session.current_question.correct_index)
+    session.answer_question((session.current_question.correct_index + 1) % 4)
+    session.set_question_message(555, 30)
+
+    # Bazaga JSON ko'rinishida yoziladi
+    snapshot = json.loads(json.dumps(session.to_snapshot()))
+    restored = QuizSession(1, quiz, snapshot=snapshot)
+
+    assert restored.to_snapshot() == session.to_snapshot()
+    assert restored.correct_count == 1 and restored.wrong_indices == [1]
+    assert restored.answers == session.answers
+    assert restored.message_id == 555
+    for index in range(session.total_questions):
+        original, loaded = session.question_at(index), restored.question_at(index)
+        assert (loaded.id, loaded.options, loaded.correct_index) == \
+               (original.id, original.options, original.correct_index)
+
+
+def test_reloaded_quiz_reuses_bank():
+    quiz = make_quiz()
+    # Bazadan qayta yuklangan nusxa: teng, lekin boshqa obyekt
+    reloaded = Quiz(id=quiz.id, questions=tuple(quiz.questions), created_at=quiz.created_at)
+    resaved = Quiz(id=quiz.id, questions=make_quiz(4).questions)
+
+    manager = QuizManager()
+    assert manager.create_session(1, quiz).quiz is quiz
+    assert manager.create_session(2, reloaded).quiz is quiz
+    assert manager.create_session(3, resaved).quiz is resaved
+    assert manager.stats()["banks"] == 1
@@ -0,0 +1,113 @@
+"""RetryMiddleware: qaysi xatolardan keyin so'rov qayta yuboriladi"""
+import asyncio
+
+import pytest
+from aiohttp import ClientConnectorError, ServerDisconnectedError
+from aiohttp.client_reqrep import ConnectionKey
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.exceptions import TelegramNetworkError, TelegramServerError
+from aiogram.methods import EditMessageText, SendMessage
+
+from bot.middlewares.retry import BACKOFF_PRUNE_SIZE, RetryMiddleware
+
+TOKEN = "42:TEST"
+
+
+def connector_error() -> ClientConnectorError:
+    """Ulanish o'rnatilmagan - so'rov Telegram'ga yetmagan"""
+    key = ConnectionKey("api.telegram.org", 443, True, True, None, None, None)
+    return ClientConnectorError(key, OSError("connection refused"))
+
+
+class FakeSession(BaseSession):
+    """So'rovlarni yubormaydi: navbatdagi xatoni ko'taradi, xatolar tugasa True qaytaradi"""
+
+    def __init__(self, errors: list[Exception]):
+        super().__init__()
+        self.errors = errors
+        self.calls = 0
+
+    async def make_request(self, bot, method, timeout=None):
+        self.calls += 1
+        if not self.errors:
+            return True
+        error = self.errors.pop(0)
+        if isinstance(error, TelegramServerError):
+            raise error
+        # AiohttpSession kabi: aiohttp xatosi TelegramNetworkError ichida (__context__)
+        try:
+            raise error
+        except Exception:
+            raise TelegramNetworkError(method=method, message=f"{type(error).__name__}: {error}")
+
+    async def close(self):
+        pass
+
+    async def stream_content(self, *args, **kwargs):
+        yield b""
+
+
+def call(method, errors: list[Exception]) -> tuple[FakeSession, RetryMiddleware, object]:
+    session = FakeSession(errors)
+    retry = RetryMiddleware(max_retries=3, base_delay=0)
+    session.middleware(retry)
+
+    async def scenario():
+        try:
+            return await Bot(TOKEN, session=session)(method)
+        except Exception as e:
+            return e
+
+    return session, retry, asyncio.run(scenario())
+
+
+def send_message() -> SendMessage:
+    return SendMessage(chat_id=1, text="Salom")
+
+
+def server_error(method) -> TelegramServerError:
+    return TelegramServerError(method=method, message="Bad Gateway")
+
+
+def test_send_message_retried_when_connection_never_opened():
+    session, retry, result = call(send_message(), [connector_error(), connector_error()])
+    assert result is True
+    assert session.calls == 3
+    assert retry.recovered == 1
+
+
+@pytest.mark.parametrize("error", [
+    ServerDisconnectedError(),
+    asyncio.TimeoutError(),
+    server_error(send_message()),
+])
+def test_send_message_not_resent_after_it_may_have_reached_telegram(error):
+    session, retry, result = call(send_message(), [error])
+    assert isinstance(result, (TelegramNetworkError, TelegramServerError))
+    assert session.calls == 1
+    assert retry.error_counts["NotRetriedUnsafe"] == 1
+
+
+def test_edit_message_text_retried_on_server_error():
+    method = EditMessageText(chat_id=1, message_id=2, text="Yangi")
+    session, retry, result = call(method, [server_error(method), ServerDisconnectedError()])
+    assert result is True
+    assert session.calls == 3
+    assert retry.error_counts["NotRetriedUnsafe"] == 0
+
+
+def test_retries_are_bounded():
+    method = EditMessageText(chat_id=1, message_id=2, text="Yangi")
+    session, _, result = call(method, [server_error(method) for _ in range(10)])
+    assert isinstance(result, TelegramServerError)
+    assert session.calls == 4
+
+
+def test_expired_chat_backoffs_are_pruned():
+    retry = RetryMiddleware()
+    for chat_id in range(10 * BACKOFF_PRUNE_SIZE):
+        retry._set_chat_backoff(chat_id, 0)
+    retry._set_chat_backoff("flooded", 60)
+    assert len(retry._chat_resume_at) <= BACKOFF_PRUNE_SIZE + 1
+    assert retry.stats()["chats_in_backoff"] == 1